@@ -42,6 +42,8 @@ from .subject import Subject
 from .session import Session
 from .domain import Domain
 from .datafile import DataFile
+from .catalog import Catalog
+from .manifest import Manifest
 
 # aliases
 Root     = DataRoot
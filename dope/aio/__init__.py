@@ -0,0 +1,108 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+"""running the blocking file-system operations from asyncio.
+
+the directory listings (and the existence checks of the containers)
+are run in an executor, so that they do not block the event loop.
+`executor` may be any concurrent.futures.Executor; None selects the
+default executor of the event loop.
+"""
+
+import asyncio as _asyncio
+import itertools as _itertools
+import threading as _threading
+
+BATCH_SIZE = 64
+
+def take(iterator, count, lock=None):
+    """returns the list of (at most) `count` items from `iterator`,
+    holding `lock` (if any) in the meantime."""
+    if lock is None:
+        return list(_itertools.islice(iterator, count))
+    with lock:
+        return list(_itertools.islice(iterator, count))
+
+def close(iterator, lock=None):
+    """closes `iterator` if it can be closed (e.g. a generator), after
+    acquiring `lock` (if any), i.e. once no item is being taken from it."""
+    closer = getattr(iterator, "close", None)
+    if closer is None:
+        return
+    if lock is None:
+        closer()
+        return
+    with lock:
+        closer()
+
+async def aiterate(iterable, executor=None, batch=BATCH_SIZE):
+    """asynchronously generates the items of a (blocking) `iterable`.
+
+    the items are taken from the iterable in the executor, `batch` items at a time,
+    and are generated as soon as each batch arrives.
+
+    the iterator is closed in the executor as well when the generation ends,
+    including when the consumer stops early (e.g. by `break`, an exception
+    or a cancellation), so that it releases e.g. its scandir() handle."""
+    loop     = _asyncio.get_running_loop()
+    iterator = iter(iterable)
+    lock     = _threading.Lock() # a batch may still be taken after a cancellation
+    try:
+        while True:
+            items = await loop.run_in_executor(executor, take, iterator, batch, lock)
+            for item in items:
+                yield item
+            if len(items) < batch:
+                return
+    finally:
+        await loop.run_in_executor(executor, close, iterator, lock)
+
+async def atraverse(start, expand, executor=None, limit=16):
+    """asynchronously traverses a tree, expanding up to `limit` nodes concurrently.
+
+    start:  the root node.
+    expand: a (blocking) function that takes a node, and returns the tuple of
+            (results, subnodes): the items to be generated, and the nodes to be
+            expanded next. it is called in the executor.
+
+    the results are generated as soon as the expansion of each node
+    completes, i.e. in no particular order.
+    """
+    if limit < 1:
+        raise ValueError(f"'limit' must be positive, got {limit}")
+    loop    = _asyncio.get_running_loop()
+    pending = [start] # used as a stack to limit the number of pending expansions
+    running = set()
+    try:
+        while pending or running:
+            while pending and (len(running) < limit):
+                running.add(loop.run_in_executor(executor, expand, pending.pop()))
+            done, running = await _asyncio.wait(running, return_when=_asyncio.FIRST_COMPLETED)
+            for future in done:
+                results, subnodes = future.result()
+                pending.extend(subnodes)
+                for result in results:
+                    yield result
+    finally:
+        for future in running:
+            future.cancel()
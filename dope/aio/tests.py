@@ -0,0 +1,100 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""usage: python -m dope.aio.tests"""
+
+import asyncio
+import threading
+import unittest
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from . import *
+from .. import testing
+from ..dataroot import DataRoot
+
+class AsyncTests(unittest.TestCase):
+    def setUp(self):
+        self._root = testing.populate(testing.test_dataroot_path())
+
+    def test_aiterate(self):
+        async def collect():
+            return [item async for item in aiterate(range(10), batch=3)]
+        self.assertEqual(asyncio.run(collect()), list(range(10)))
+
+    def test_aiterate_close(self):
+        closed = []
+        def generate():
+            try:
+                yield from range(10)
+            finally:
+                closed.append(threading.current_thread())
+        async def stop_early():
+            items = aiterate(generate(), batch=3)
+            async for item in items:
+                if item == 4:
+                    break
+            await items.aclose()
+        asyncio.run(stop_early())
+        self.assertEqual(len(closed), 1)
+        self.assertIsNot(closed[0], threading.current_thread()) # in the executor
+
+        closed.clear()
+        async def fail():
+            async for item in aiterate(generate(), batch=3):
+                raise RuntimeError("stopped")
+        with self.assertRaises(RuntimeError):
+            asyncio.run(fail())
+        self.assertEqual(len(closed), 1)
+
+    def test_atraverse(self):
+        def expand(node):
+            return [node], ([node * 2, node * 2 + 1] if node < 8 else [])
+        async def collect():
+            return [item async for item in atraverse(1, expand, limit=2)]
+        self.assertEqual(sorted(asyncio.run(collect())), list(range(1, 16)))
+
+    def test_selector(self):
+        subject = DataRoot(self._root)["ds1"]["K1"]
+        async def collect():
+            return [sess.path.name async for sess in subject.sessions.aiter(sort=True)]
+        self.assertEqual(asyncio.run(collect()), [sess.path.name for sess in subject.sessions])
+
+    def test_aselect(self):
+        root = DataRoot(self._root)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for specs in (dict(), dict(subject="K1"), dict(session_type="training", domain="video")):
+                found = asyncio.run(root.aselect(executor=executor, level="file", **specs))
+                self.assertEqual([file.path for file in found],
+                                 [file.path for file in root.select(level="file", **specs)])
+        async def collect():
+            return [sess.path.name async for sess in root.select(session_type="training")]
+        self.assertEqual(sorted(asyncio.run(collect())),
+                         ["training2019-01-02-001", "training2019-01-03-001"])
+
+    def tearDown(self):
+        if self._root.exists():
+            shutil.rmtree(self._root)
+
+if __name__ == "__main__":
+    unittest.main()
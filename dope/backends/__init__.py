@@ -0,0 +1,343 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+"""file-system backends that the containers refer to.
+
+a backend provides the few file-system operations that the containers
+and the selectors require:
+
+- scandir(path): generates the entries of a directory. each entry has
+  `name` and `path` attributes as well as `is_dir()`, `is_file()` and
+  `stat()` methods, as os.DirEntry does.
+- stat(path):    returns the stat result (with `st_mode`, `st_size` and
+  `st_mtime` at least), or raises FileNotFoundError.
+- exists(path), is_dir(path): return a bool.
+- resolve(path): returns the absolute pathlib.Path.
+- mkdir(path):   creates a single directory, or raises FileExistsError
+  (if it exists) or FileNotFoundError (if its parent does not exist).
+- open(path):    opens a file for reading in binary mode.
+
+`LOCAL` (a LocalBackend) is used unless another backend is specified.
+the calls to LocalBackend and MemoryBackend are recorded by the instrumentation
+(see dope.instrumentation) as "fs.<name>".
+"""
+
+import io as _io
+import os as _os
+import stat as _stat
+import time as _time
+import pathlib as _pathlib
+import threading as _threading
+import collections as _collections
+
+from .. import instrumentation as _instrumentation
+
+class LocalBackend:
+    """the backend that refers to the local file system."""
+    __slots__ = ()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
+
+    @_instrumentation.timed("fs.scandir")
+    def scandir(self, path):
+        with _os.scandir(path) as entries:
+            yield from entries
+
+    @_instrumentation.timed("fs.stat")
+    def stat(self, path):
+        return _os.stat(path)
+
+    @_instrumentation.timed("fs.exists")
+    def exists(self, path):
+        return _os.path.exists(path)
+
+    @_instrumentation.timed("fs.is_dir")
+    def is_dir(self, path):
+        return _os.path.isdir(path)
+
+    @_instrumentation.timed("fs.resolve")
+    def resolve(self, path):
+        return _pathlib.Path(path).resolve()
+
+    @_instrumentation.timed("fs.mkdir")
+    def mkdir(self, path):
+        _os.mkdir(path)
+
+    @_instrumentation.timed("fs.open")
+    def open(self, path):
+        return open(path, "rb")
+
+LOCAL = LocalBackend()
+
+class CachedBackend:
+    """a backend that caches the stat results and the directory listings
+    of another backend for `ttl` seconds.
+
+    the failures (e.g. FileNotFoundError) are cached as well.
+    use `invalidate()` to discard the cached results before they expire."""
+
+    def __init__(self, backend=LOCAL, ttl=1.0, clock=_time.monotonic):
+        self._backend  = backend
+        self._ttl      = ttl
+        self._clock    = clock
+        self._lock     = _threading.Lock()
+        self._stats    = {}
+        self._listings = {}
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._backend!r}, ttl={self._ttl!r})"
+
+    @property
+    def backend(self):
+        """the backend whose results are cached."""
+        return self._backend
+
+    def invalidate(self, path=None):
+        """discards the cached results for `path`, or everything if `path` is None."""
+        with self._lock:
+            if path is None:
+                self._stats.clear()
+                self._listings.clear()
+            else:
+                key = _os.fspath(path)
+                self._stats.pop(key, None)
+                self._listings.pop(key, None)
+
+    def _cached(self, cache, path, compute):
+        key = _os.fspath(path)
+        now = self._clock()
+        with self._lock:
+            cached = cache.get(key)
+        if (cached is None) or (cached[0] <= now):
+            try:
+                cached = (now + self._ttl, compute(path), None)
+            except OSError as e:
+                cached = (now + self._ttl, None, e)
+            with self._lock:
+                cache[key] = cached
+        if cached[2] is not None:
+            raise cached[2]
+        return cached[1]
+
+    def scandir(self, path):
+        yield from self._cached(self._listings, path,
+                                lambda path: list(self._backend.scandir(path)))
+
+    def stat(self, path):
+        return self._cached(self._stats, path, self._backend.stat)
+
+    def exists(self, path):
+        try:
+            self.stat(path)
+            return True
+        except OSError:
+            return False
+
+    def is_dir(self, path):
+        try:
+            return _stat.S_ISDIR(self.stat(path).st_mode)
+        except OSError:
+            return False
+
+    def resolve(self, path):
+        return self._backend.resolve(path)
+
+    def mkdir(self, path):
+        try:
+            self._backend.mkdir(path)
+        finally:
+            self.invalidate(path)
+            self.invalidate(_os.path.dirname(_os.fspath(path)))
+
+    def open(self, path):
+        # the contents are not cached
+        return self._backend.open(path)
+
+class MemoryStat(_collections.namedtuple("_MemoryStat",
+                 ("st_mode", "st_size", "st_mtime"))):
+    """the stat result of an entry in a MemoryBackend."""
+    __slots__ = ()
+
+DIRECTORY_MODE = _stat.S_IFDIR | 0o755
+FILE_MODE      = _stat.S_IFREG | 0o644
+
+class MemoryEntry:
+    """an entry in a MemoryBackend, which behaves as os.DirEntry does."""
+    __slots__ = ("name", "path", "_stat")
+
+    def __init__(self, name, path, stat):
+        self.name  = name
+        self.path  = path
+        self._stat = stat
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.name!r}>"
+
+    def __fspath__(self):
+        return self.path
+
+    def is_dir(self, follow_symlinks=True):
+        return self._stat.st_mode == DIRECTORY_MODE
+
+    def is_file(self, follow_symlinks=True):
+        return self._stat.st_mode == FILE_MODE
+
+    def is_symlink(self):
+        return False
+
+    def stat(self, follow_symlinks=True):
+        return self._stat
+
+class MemoryBackend:
+    """a backend that holds a (e.g. synthetic) directory tree in memory,
+    so that large trees can be tested or benchmarked without touching the disk.
+
+    the paths are handled as absolute, normalized paths, and the entries
+    are listed in the order they were added. adding or removing an entry
+    updates the mtime of its parent directory, as a file system does."""
+
+    def __init__(self, clock=_time.time):
+        self._clock = clock
+        self._dirs  = {} # directory path -> {name: MemoryEntry}
+        self._root  = _os.path.abspath(_os.sep)
+        self._dirs[self._root] = {}
+        self._rootstat = MemoryStat(DIRECTORY_MODE, 0, clock())
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(directories={len(self._dirs)})"
+
+    def _key(self, path):
+        return _os.path.abspath(_os.fspath(path))
+
+    def _lookup(self, key):
+        if key == self._root:
+            return self._rootstat
+        parent, name = _os.path.split(key)
+        try:
+            return self._dirs[parent][name].stat()
+        except KeyError:
+            raise FileNotFoundError(f"no such file or directory: '{key}'") from None
+
+    def _touch_parent(self, key, mtime):
+        parent, name = _os.path.split(key)
+        if parent == self._root:
+            self._rootstat = self._rootstat._replace(st_mtime=mtime)
+        else:
+            grand, pname = _os.path.split(parent)
+            entry = self._dirs[grand][pname]
+            entry._stat = entry._stat._replace(st_mtime=mtime)
+
+    def _add(self, key, stat):
+        parent, name = _os.path.split(key)
+        if parent not in self._dirs:
+            self.add_directory(parent)
+        siblings = self._dirs[parent]
+        existing = siblings.get(name)
+        if existing is not None:
+            if existing.is_dir() and (stat.st_mode == DIRECTORY_MODE):
+                return existing
+            raise FileExistsError(f"entry already exists: '{key}'")
+        siblings[name] = MemoryEntry(name, key, stat)
+        if stat.st_mode == DIRECTORY_MODE:
+            self._dirs[key] = {}
+        self._touch_parent(key, stat.st_mtime)
+        return siblings[name]
+
+    def add_directory(self, path, mtime=None):
+        """adds a directory (and its missing parents), as `mkdir -p` does."""
+        key = self._key(path)
+        if key == self._root:
+            return
+        self._add(key, MemoryStat(DIRECTORY_MODE, 0, self._clock() if mtime is None else mtime))
+
+    def add_file(self, path, size=0, mtime=None):
+        """adds a file of `size` bytes (and its missing parent directories)."""
+        self._add(self._key(path),
+                  MemoryStat(FILE_MODE, size, self._clock() if mtime is None else mtime))
+
+    def add_files(self, root, names, size=0):
+        """adds the files at `names` (given relative to `root`)."""
+        for name in names:
+            self.add_file(_os.path.join(root, name), size=size)
+
+    def remove(self, path):
+        """removes the entry, and everything below it."""
+        key = self._key(path)
+        parent, name = _os.path.split(key)
+        try:
+            entry = self._dirs[parent].pop(name)
+        except KeyError:
+            raise FileNotFoundError(f"no such file or directory: '{key}'") from None
+        if entry.is_dir():
+            prefix = _os.path.join(key, "")
+            for subdir in [d for d in self._dirs if (d == key) or d.startswith(prefix)]:
+                del self._dirs[subdir]
+        self._touch_parent(key, self._clock())
+
+    @_instrumentation.timed("fs.scandir")
+    def scandir(self, path):
+        key = self._key(path)
+        if key not in self._dirs:
+            self._lookup(key) # raises FileNotFoundError if it does not exist
+            raise NotADirectoryError(f"not a directory: '{key}'")
+        yield from tuple(self._dirs[key].values())
+
+    @_instrumentation.timed("fs.stat")
+    def stat(self, path):
+        return self._lookup(self._key(path))
+
+    @_instrumentation.timed("fs.exists")
+    def exists(self, path):
+        try:
+            self._lookup(self._key(path))
+            return True
+        except FileNotFoundError:
+            return False
+
+    @_instrumentation.timed("fs.is_dir")
+    def is_dir(self, path):
+        return self._key(path) in self._dirs
+
+    @_instrumentation.timed("fs.resolve")
+    def resolve(self, path):
+        return _pathlib.Path(self._key(path))
+
+    @_instrumentation.timed("fs.mkdir")
+    def mkdir(self, path):
+        key = self._key(path)
+        if self.exists(key):
+            raise FileExistsError(f"entry already exists: '{key}'")
+        elif not self.is_dir(_os.path.dirname(key)):
+            raise FileNotFoundError(f"no such directory: '{_os.path.dirname(key)}'")
+        self._add(key, MemoryStat(DIRECTORY_MODE, 0, self._clock()))
+
+    @_instrumentation.timed("fs.open")
+    def open(self, path):
+        """returns a binary stream of as many zero bytes as the size of the file
+        (the files in a MemoryBackend do not hold any data)."""
+        key  = self._key(path)
+        stat = self._lookup(key)
+        if stat.st_mode != FILE_MODE:
+            raise IsADirectoryError(f"is a directory: '{key}'")
+        return _io.BytesIO(bytes(stat.st_size))
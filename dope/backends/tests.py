@@ -0,0 +1,91 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""usage: python -m dope.backends.tests"""
+
+import unittest
+import shutil
+from . import *
+from .. import testing
+from ..dataroot import DataRoot
+
+class BackendTests(unittest.TestCase):
+    def setUp(self):
+        self._root = testing.populate(testing.test_dataroot_path()).resolve()
+
+    def memory_tree(self):
+        backend = MemoryBackend()
+        backend.add_files(self._root, testing.SAMPLE_FILES)
+        for directory in testing.SAMPLE_DIRECTORIES:
+            backend.add_directory(self._root / directory)
+        return backend
+
+    def test_memory(self):
+        backend = self.memory_tree()
+        shutil.rmtree(self._root) # should not be referred to
+        root = DataRoot(self._root, backend=backend)
+        self.assertEqual([ds.path.name for ds in root.datasets], ["ds1", "ds2"])
+        sess = root["ds1"]["K1"]["session2019-01-01-001"]
+        self.assertIs(sess.backend, backend)
+        self.assertEqual([file.path.name for file in sess["img"].files],
+                         ["K1_session2019-01-01-001_img_run00001_Green.tif",
+                          "K1_session2019-01-01-001_img_run00002_Green.tif"])
+        self.assertEqual(len(tuple(root.walk())), 5)
+        self.assertEqual(len(tuple(root.scan(workers=2))), 5)
+        self.assertEqual(root.select(subject="K1", domain="video").count(), 2)
+        with self.assertRaises(FileNotFoundError):
+            root["ds1"]["K3"]
+        backend.remove(self._root / "ds1/K2")
+        self.assertEqual([sub.path.name for sub in root["ds1"].subjects], ["K1"])
+
+    def test_local(self):
+        root   = DataRoot(self._root)
+        memory = DataRoot(self._root, backend=self.memory_tree())
+        self.assertIs(root.backend, LOCAL)
+        self.assertEqual(tuple(root.walk()), tuple(memory.walk()))
+        for level in ("dataset", "subject", "session", "domain"):
+            self.assertEqual(tuple(root.walk(level)), tuple(memory.walk(level)))
+
+    def test_cached(self):
+        now     = [0.0]
+        backend = CachedBackend(LOCAL, ttl=10, clock=lambda: now[0])
+        root    = DataRoot(self._root, backend=backend)
+        names   = [ds.path.name for ds in root.datasets]
+        shutil.rmtree(self._root / "ds2")
+        self.assertEqual([ds.path.name for ds in root.datasets], names)
+        self.assertTrue(backend.exists(self._root / "ds2"))
+        now[0] = 11.0
+        self.assertEqual([ds.path.name for ds in root.datasets], ["ds1"])
+        self.assertFalse(backend.exists(self._root / "ds2"))
+        (self._root / "ds2").mkdir()
+        self.assertFalse(backend.exists(self._root / "ds2"))
+        backend.invalidate(self._root / "ds2")
+        self.assertTrue(backend.exists(self._root / "ds2"))
+
+    def tearDown(self):
+        if self._root.exists():
+            shutil.rmtree(self._root)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,246 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+"""benchmarks for the data-access layer.
+
+usage: python -m dope.benchmarks [--check | --save] [name ...]
+
+each benchmark is a function that takes no arguments and returns
+a dict of named measurements. they are registered in `BENCHMARKS`.
+all the measurements are costs (time or memory per item), i.e. lower is better.
+
+the baselines of the measurements are stored in `BASELINES` (a JSON file
+next to this module): `--save` updates them with the current results, and
+`--check` reports the measurements that exceed their baselines by more
+than `TOLERANCE` times. as they depend on the machine, the baselines
+should be saved again when the benchmarks are run on another machine.
+"""
+
+import gc as _gc
+import json as _json
+import pathlib as _pathlib
+import tempfile as _tempfile
+import timeit as _timeit
+import tracemalloc as _tracemalloc
+
+from .. import modes as _modes
+from ..predicate import Predicate as _Predicate
+from ..filespec import FileSpec as _FileSpec
+from ..domain import Domain as _Domain
+from ..datafile import DataFile as _DataFile
+from ..dataroot import DataRoot as _DataRoot
+from ..backends import MemoryBackend as _MemoryBackend
+from ..manifest import Manifest as _Manifest
+from .. import parsing as _parsing
+from .. import testing as _testing
+from ..datafile import parse_spec_from_name as _parse_spec_from_name
+
+BASELINES = _pathlib.Path(__file__).with_name("baselines.json")
+TOLERANCE = 1.5
+
+BENCHMARKS = {}
+
+def benchmark(fun):
+    """registers `fun` as a benchmark under its name."""
+    BENCHMARKS[fun.__name__] = fun
+    return fun
+
+def allocated_per_item(build, count):
+    """returns the number of bytes that stay allocated per item,
+    after `build(count)` returns a collection of `count` items."""
+    _gc.collect()
+    _tracemalloc.start()
+    try:
+        base  = _tracemalloc.get_traced_memory()[0]
+        items = build(count)
+        used  = _tracemalloc.get_traced_memory()[0] - base
+    finally:
+        _tracemalloc.stop()
+    del items
+    return used / count
+
+def microseconds_per_item(build, count, repeat=5):
+    """returns the best time (in microseconds) taken per item,
+    when `build(count)` builds a collection of `count` items."""
+    best = min(_timeit.repeat(lambda: build(count), number=1, repeat=repeat))
+    return best * 1e6 / count
+
+def synthetic_files(count, mode=_modes.WRITE):
+    """returns `count` DataFile containers in a single domain.
+    WRITE mode is used by default, so that nothing is read from the disk."""
+    domain = _Domain(_Predicate(mode=mode, root="/data/root", dataset="ds1", subject="K1",
+                                session="session2019-01-01-001", domain="img"))
+    spec   = domain._spec
+    return [_DataFile(spec.with_values(file=_FileSpec(suffix=".tif", run=i, channel=("Green",)))) \
+            for i in range(count)]
+
+def synthetic_tree(count, root="/data/root", trials=100, sessions=10):
+    """returns a MemoryBackend holding a data-root with (about) `count` data files
+    in a single dataset and domain (see testing.synthetic_paths())."""
+    backend = _MemoryBackend()
+    _testing.build_tree(root, backend, subjects=max(1, count // (trials * sessions)),
+                        sessions=sessions, domains=("img",), trials=trials)
+    return backend
+
+@benchmark
+def container_memory(count=20000):
+    """the memory held per DataFile container, including its Predicate and path."""
+    return {"bytes_per_file": allocated_per_item(synthetic_files, count)}
+
+@benchmark
+def child_derivation(counts=(1000, 10000)):
+    """the time taken per child Predicate (in microseconds),
+    using Predicate.child() in comparison to Predicate.with_values().
+
+    the per-child time of Predicate.child() is expected to stay
+    constant regardless of the number of children."""
+    parent = _Predicate(mode=_modes.WRITE, root="/data/root", dataset="ds1", subject="K1",
+                        session="session2019-01-01-001", domain="img")
+    specs  = [_FileSpec(suffix=".tif", run=i, channel=("Green",)) for i in range(max(counts))]
+    results = {}
+    for count in counts:
+        results[f"child_us_{count}"] = microseconds_per_item(
+            lambda n: [parent.child(parent.FILE, spec) for spec in specs[:n]], count)
+        results[f"with_values_us_{count}"] = microseconds_per_item(
+            lambda n: [parent.with_values(file=spec) for spec in specs[:n]], count)
+    return results
+
+@benchmark
+def from_parent(count=10000):
+    """the time taken per DataFile container (in microseconds),
+    when it is derived from its parent through from_parent()."""
+    domain = synthetic_files(1)[0].domain
+    spec, path = domain._spec, domain.path
+    names  = [f"K1_session2019-01-01-001_img_run{i:05d}_Green.tif" for i in range(count)]
+    return {"us_per_file": microseconds_per_item(
+            lambda n: [_DataFile.from_parent(spec, name, parentpath=path) for name in names[:n]],
+            count)}
+
+@benchmark
+def predicate_construction(count=20000):
+    """the time taken (in microseconds) to construct a file-level Predicate
+    from keywords, to compute its path, and to read the (memoized) path again."""
+    specs = [_Predicate(mode=_modes.WRITE, root="/data/root", dataset="ds1", subject="K1",
+                        session="session2019-01-01-001", domain="img",
+                        run=i, channel="Green", suffix=".tif") for i in range(count)]
+    return {"construct_us": microseconds_per_item(
+                lambda n: [_Predicate(mode=_modes.WRITE, root="/data/root", dataset="ds1",
+                                      subject="K1", session="session2019-01-01-001", domain="img",
+                                      run=i, channel="Green", suffix=".tif") for i in range(n)],
+                count),
+            "path_us": microseconds_per_item(lambda n: [spec.path for spec in specs[:n]], count),
+            "path_again_us": microseconds_per_item(lambda n: [specs[0].path for _ in range(n)], count)}
+
+@benchmark
+def parsing_throughput(count=20000):
+    """the time taken per name (in microseconds) to parse file names,
+    one by one and (if NumPy is available) in a batch."""
+    names = [_pathlib.PurePosixPath(path).name for path in \
+             _testing.synthetic_paths(subjects=count // 1000, sessions=10, domains=("img",),
+                                      trials=50, channels=("Green", "Red"))]
+    results = {"file_name_us": microseconds_per_item(
+                lambda n: [_parse_spec_from_name(name) for name in names], len(names))}
+    try:
+        results["batch_us"] = microseconds_per_item(lambda n: _parsing.parse_many(names), len(names))
+    except ImportError:
+        pass
+    return results
+
+@benchmark
+def selector_iteration(count=20000):
+    """the time taken per data file (in microseconds) to iterate over
+    the containers of an in-memory data-root, level by level."""
+    root = _DataRoot("/data/root", backend=synthetic_tree(count))
+    def _containers(n):
+        return [file for sub in root["dataset01"].subjects for sess in sub.sessions \
+                     for dom in sess.domains for file in dom.files]
+    return {"us_per_file": microseconds_per_item(_containers, count, repeat=3)}
+
+@benchmark
+def walk(count=20000):
+    """the time taken per data file (in microseconds) to walk through
+    a whole data-root, in memory and on disk."""
+    root    = _DataRoot("/data/root", backend=synthetic_tree(count))
+    results = {"memory_us_per_file": microseconds_per_item(lambda n: tuple(root.walk()),
+                                                           count, repeat=3)}
+    with _tempfile.TemporaryDirectory() as tmpdir:
+        ondisk = _testing.build_tree(tmpdir, subjects=max(1, count // 1000), sessions=10,
+                                     domains=("img",), trials=100)
+        root   = _DataRoot(tmpdir)
+        results["disk_us_per_file"]  = microseconds_per_item(lambda n: tuple(root.walk()),
+                                                             ondisk, repeat=3)
+    return results
+
+@benchmark
+def manifest(count=20000):
+    """the time taken per data file (in microseconds) to load the manifest
+    of an in-memory data-root, and to walk through the data-root from it."""
+    root = _DataRoot("/data/root", backend=synthetic_tree(count))
+    with _tempfile.TemporaryDirectory() as tmpdir:
+        path    = root.save_manifest(_pathlib.Path(tmpdir) / "root.manifest").path
+        results = {"load_us_per_file": microseconds_per_item(lambda n: _Manifest(path),
+                                                             count, repeat=3)}
+        loaded  = _DataRoot.from_manifest(path)
+        results["walk_us_per_file"] = microseconds_per_item(lambda n: tuple(loaded.walk()),
+                                                            count, repeat=3)
+    return results
+
+def run(names=None):
+    """runs the benchmarks specified by `names` (or all of them),
+    and returns the results as a dict."""
+    if not names:
+        names = tuple(BENCHMARKS.keys())
+    results = {}
+    for name in names:
+        if name not in BENCHMARKS.keys():
+            raise ValueError(f"unknown benchmark: '{name}'")
+        results[name] = BENCHMARKS[name]()
+    return results
+
+def load_baselines(path=BASELINES):
+    """returns the stored baselines as {benchmark: {measurement: value}}."""
+    path = _pathlib.Path(path)
+    if not path.exists():
+        return {}
+    with open(path, "r") as file:
+        return _json.load(file)
+
+def save_baselines(results, path=BASELINES):
+    """stores `results` (as returned by run()) as the baselines,
+    keeping the baselines of the other benchmarks."""
+    baselines = load_baselines(path)
+    baselines.update(results)
+    with open(path, "w") as file:
+        _json.dump(baselines, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+def regressions(results, baselines, tolerance=TOLERANCE):
+    """returns the list of (benchmark, measurement, value, baseline)
+    for the measurements that exceed `tolerance` times their baselines."""
+    found = []
+    for name, measurements in results.items():
+        for key, value in measurements.items():
+            baseline = baselines.get(name, {}).get(key)
+            if (baseline is not None) and (value > baseline * tolerance):
+                found.append((name, key, value, baseline))
+    return found
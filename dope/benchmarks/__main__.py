@@ -0,0 +1,56 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import sys
+import argparse
+from . import run, load_baselines, save_baselines, regressions, TOLERANCE
+
+parser = argparse.ArgumentParser(prog="python -m dope.benchmarks",
+                                 description="runs the benchmarks of the data-access layer.")
+parser.add_argument("names", nargs="*", help="the benchmarks to run (all by default)")
+group = parser.add_mutually_exclusive_group()
+group.add_argument("--check", action="store_true",
+                   help="compares the results with the stored baselines")
+group.add_argument("--save", action="store_true",
+                   help="stores the results as the baselines")
+parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                    help=f"the ratio to the baselines regarded as a regression (default: {TOLERANCE})")
+args = parser.parse_args()
+
+results   = run(args.names)
+baselines = load_baselines()
+for name, measurements in results.items():
+    for key, value in measurements.items():
+        baseline = baselines.get(name, {}).get(key)
+        compared = "" if baseline is None else f" (baseline: {baseline:.1f})"
+        print(f"{name}.{key}: {value:.1f}{compared}")
+
+if args.save:
+    save_baselines(results)
+elif args.check:
+    found = regressions(results, baselines, tolerance=args.tolerance)
+    for name, key, value, baseline in found:
+        print(f"REGRESSION {name}.{key}: {value:.1f} > {args.tolerance} x {baseline:.1f}",
+              file=sys.stderr)
+    sys.exit(1 if found else 0)
@@ -0,0 +1,57 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""usage: python -m dope.benchmarks.tests"""
+
+import unittest
+import tempfile
+from pathlib import Path
+from . import *
+from .. import testing
+from ..backends import MemoryBackend
+from ..dataroot import DataRoot
+
+class BenchmarkTests(unittest.TestCase):
+    def test_synthetic_tree(self):
+        backend = MemoryBackend()
+        count   = testing.build_tree("/data", backend, datasets=2, subjects=3, sessions=4,
+                                     domains=("img",), trials=5, channels=("Green", "Red"))
+        self.assertEqual(count, 2 * 3 * 4 * 5 * 2)
+        root = DataRoot("/data", backend=backend)
+        self.assertEqual(len(tuple(root.walk())), count)
+        self.assertEqual(len(root["dataset02"]["K0003"].sessions), 4)
+
+    def test_baselines(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "baselines.json"
+            self.assertEqual(load_baselines(path), {})
+            save_baselines({"a": {"x": 1.0, "y": 2.0}}, path)
+            save_baselines({"b": {"z": 3.0}}, path)
+            baselines = load_baselines(path)
+        self.assertEqual(sorted(baselines.keys()), ["a", "b"])
+        self.assertEqual(regressions({"a": {"x": 1.4, "y": 3.5}, "c": {"w": 1.0}}, baselines),
+                         [("a", "y", 3.5, 2.0)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,474 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+"""an on-disk SQLite catalog of a data-root.
+
+a catalog is built by scanning the data-root once, and is then used
+to answer queries (or to list the children of containers) without
+walking the file system again.
+
+the data-root is read through a file-system backend (backends.LOCAL
+by default), whereas the database file itself is always stored on
+the local file system.
+"""
+
+import os as _os
+import collections as _collections
+import pathlib as _pathlib
+import sqlite3 as _sqlite3
+import threading as _threading
+import datetime as _datetime
+
+from .. import modes as _modes
+from .. import parsing as _parsing
+from ..core import DataLevels as _DataLevels
+from ..sessionspec import SessionSpec as _SessionSpec
+from ..filespec import FileSpec as _FileSpec
+from ..predicate import Predicate as _Predicate
+from .. import scanning as _scanning
+from ..backends import LOCAL as _LOCAL
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE entries (
+    level         TEXT NOT NULL,
+    parent        TEXT NOT NULL,
+    name          TEXT NOT NULL,
+    dataset       TEXT,
+    subject       TEXT,
+    session_type  TEXT,
+    session_date  TEXT,
+    session_index INTEGER,
+    domain        TEXT,
+    trial         INTEGER,
+    run           INTEGER,
+    channel       TEXT,
+    suffix        TEXT,
+    size          INTEGER,
+    mtime         REAL,
+    PRIMARY KEY (parent, name)
+);
+CREATE INDEX entries_by_level ON entries
+    (level, dataset, subject, session_type, session_date, session_index, domain);
+"""
+
+COLUMNS = ("level", "parent", "name",
+           "dataset", "subject",
+           "session_type", "session_date", "session_index",
+           "domain", "trial", "run", "channel", "suffix",
+           "size", "mtime")
+
+# the columns that identify an entry at each level, in the order of the hierarchy
+LEVEL_COLUMNS = (
+    (_DataLevels.DATASET, ("dataset",)),
+    (_DataLevels.SUBJECT, ("subject",)),
+    (_DataLevels.SESSION, ("session_type", "session_date", "session_index")),
+    (_DataLevels.DOMAIN,  ("domain",)),
+    (_DataLevels.FILE,    ("trial", "run", "channel", "suffix")),
+)
+
+CHILD_LEVELS = {
+    _DataLevels.ROOT:    _DataLevels.DATASET,
+    _DataLevels.DATASET: _DataLevels.SUBJECT,
+    _DataLevels.SUBJECT: _DataLevels.SESSION,
+    _DataLevels.SESSION: _DataLevels.DOMAIN,
+    _DataLevels.DOMAIN:  _DataLevels.FILE,
+}
+
+def format_date(date):
+    """formats a session date in the way it is stored in the catalog."""
+    if date is None:
+        return None
+    elif isinstance(date, (_datetime.date, _datetime.datetime)):
+        return date.strftime(_parsing.session.DATE_FORMAT)
+    else:
+        return str(date)
+
+def format_channel(channel):
+    """formats a (possibly multiple) channel in the way it is stored in the catalog."""
+    if channel is None or isinstance(channel, str):
+        return channel
+    return "-".join(channel)
+
+def make_row(entry, parent, st):
+    """returns the catalog row (ordered as in `COLUMNS`) of `entry`
+    found in the directory `parent` (relative to the data-root),
+    with `st` being its stat result."""
+    session, file = entry.session, entry.file
+    return (entry.level, parent, entry.direntry.name,
+            entry.dataset, entry.subject,
+            session.type, format_date(session.date), session.index,
+            entry.domain,
+            file.trial, file.run, format_channel(file.channel), file.suffix,
+            st.st_size if entry.level == _DataLevels.FILE else None,
+            st.st_mtime)
+
+def relative_parent(root, path):
+    """returns the parent directory of `path`, relative to `root`
+    and separated with '/', as it is stored in the catalog."""
+    parent = _os.path.dirname(path[len(_os.path.join(str(root), "")):])
+    if _os.sep != "/":
+        parent = parent.replace(_os.sep, "/")
+    return parent
+
+def scan(root, entry=None, path=None, backend=None):
+    """walks the data-root and generates catalog rows (ordered as in `COLUMNS`).
+
+    `entry` and `path` may be given to walk only below the directory `path`
+    that corresponds to the scanning.Entry `entry`."""
+    path = str(root) if path is None else path
+    for found in _scanning.iter_entries(path, entry=entry, backend=backend):
+        yield make_row(found, relative_parent(root, found.direntry.path), found.direntry.stat())
+
+class RefreshStats(_collections.namedtuple("_RefreshStats",
+                   ("checked", "listed", "added", "removed", "updated"))):
+    """the statistics of Catalog.refresh():
+
+    - checked: the number of directories whose mtime was checked,
+    - listed:  the number of directories that were listed again,
+    - added, removed, updated: the number of catalog entries that were
+      added, removed or updated (including the entries below the
+      directories that were added or removed)."""
+    __slots__ = ()
+
+class Catalog(_DataLevels):
+    """an on-disk SQLite catalog of a data-root.
+
+    use `Catalog.build()` (or `DataRoot.build_index()`) to create one,
+    and `Catalog(path)` to open an existing one. `backend` is the file-system
+    backend that the data-root is read through (on refresh()).
+    """
+    FILENAME = ".dope-catalog.sqlite3"
+
+    @classmethod
+    def build(cls, root, path=None, backend=None):
+        """scans `root` and writes its catalog to `path`.
+
+        path:    defaults to `Catalog.FILENAME` under `root`.
+                 any existing catalog at `path` is replaced.
+        backend: the file-system backend to read `root` through
+                 (backends.LOCAL by default). note that `path` is always
+                 on the local file system, and has to be given explicitly
+                 for the other backends.
+        """
+        backend = _LOCAL if backend is None else backend
+        root    = backend.resolve(root)
+        if not backend.is_dir(root):
+            raise FileNotFoundError(f"data-root does not exist: {root}")
+        path = root / cls.FILENAME if path is None else _pathlib.Path(path)
+        tmppath = path.with_name(path.name + ".tmp")
+        if tmppath.exists():
+            tmppath.unlink()
+        conn = _sqlite3.connect(str(tmppath))
+        try:
+            with conn:
+                conn.executescript(SCHEMA)
+                conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)",
+                                 (("version", str(SCHEMA_VERSION)),
+                                  ("root",    str(root)),
+                                  ("mtime",   repr(backend.stat(root).st_mtime))))
+                placeholders = ", ".join("?" for _ in COLUMNS)
+                conn.executemany(f"INSERT INTO entries ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                                 scan(root, backend=backend))
+        finally:
+            conn.close()
+        _os.replace(tmppath, path)
+        return cls(path, backend=backend)
+
+    def __init__(self, path, backend=None):
+        path = _pathlib.Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"catalog does not exist: {path}")
+        self._path = path
+        self._lock = _threading.Lock()
+        self._conn = _sqlite3.connect(str(path), check_same_thread=False)
+        try:
+            version = self._fetchone("SELECT value FROM meta WHERE key = 'version'")
+            root    = self._fetchone("SELECT value FROM meta WHERE key = 'root'")
+        except _sqlite3.DatabaseError:
+            version = root = None
+        if (version is None) or (root is None):
+            self._conn.close()
+            raise ValueError(f"not a catalog file: {path}")
+        if int(version[0]) != SCHEMA_VERSION:
+            self._conn.close()
+            raise ValueError(f"unsupported catalog version: {version[0]}")
+        self._root    = _pathlib.Path(root[0])
+        self._backend = _LOCAL if backend is None else backend
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({str(self._path)!r})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._conn.close()
+
+    @property
+    def path(self):
+        """the path to the database file."""
+        return self._path
+
+    @property
+    def root(self):
+        """the (resolved) path to the data-root that was scanned."""
+        return self._root
+
+    @property
+    def backend(self):
+        """the file-system backend that the data-root is read through."""
+        return self._backend
+
+    def refresh(self):
+        """updates the catalog with the changes in the data-root since the last
+        build (or refresh), and returns the RefreshStats.
+
+        the mtime of every directory (from the data-root down to the domains)
+        is compared with the one stored in the catalog, and only the directories
+        whose mtime changed are listed again. refreshing an unchanged
+        data-root therefore costs a single stat call per directory,
+        regardless of the number of files.
+
+        note that the size and mtime of a file are only updated when
+        its domain directory is listed again. if the catalog is stored under
+        the data-root (as by default), writing to it changes the mtime of
+        the data-root, and the list of datasets is therefore always read again.
+        """
+        with self._lock:
+            with self._conn:
+                stored = self._conn.execute("SELECT value FROM meta WHERE key = 'mtime'").fetchone()
+                counts = dict((key, 0) for key in RefreshStats._fields)
+                mtime  = self._refresh_directory(_scanning.ROOT_ENTRY, "", str(self._root),
+                                                 None if stored is None else float(stored[0]),
+                                                 counts)
+                if mtime is None:
+                    raise FileNotFoundError(f"data-root does not exist: {self._root}")
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('mtime', ?)",
+                                   (repr(mtime),))
+        return RefreshStats(**counts)
+
+    def _refresh_directory(self, entry, relpath, path, stored, counts):
+        """refreshes the entries below the directory `path` (`relpath` relative
+        to the data-root) that corresponds to the scanning.Entry `entry`.
+        `stored` is the mtime of the directory in the catalog.
+
+        returns the current mtime of the directory, or None if it does not exist."""
+        try:
+            mtime = self._backend.stat(path).st_mtime
+        except FileNotFoundError:
+            return None
+        counts["checked"] += 1
+        if mtime == stored:
+            # no entry was added to or removed from this directory:
+            # only the subdirectories need to be checked
+            rows = self._conn.execute("SELECT name, mtime FROM entries WHERE parent = ? AND level != ?",
+                                      (relpath, self.FILE)).fetchall()
+            children = ((_scanning.make_child(entry, name), name, mtime) for name, mtime in rows)
+        else:
+            counts["listed"] += 1
+            children = self._refresh_listing(entry, relpath, path, counts)
+        for child, name, childmtime in children:
+            childrel = f"{relpath}/{name}" if relpath else name
+            current  = self._refresh_directory(child, childrel,
+                                               _os.path.join(path, name),
+                                               childmtime, counts)
+            if current is None:
+                self._remove(relpath, name, counts)
+            elif current != childmtime:
+                self._conn.execute("UPDATE entries SET mtime = ? WHERE parent = ? AND name = ?",
+                                   (current, relpath, name))
+        return mtime
+
+    def _refresh_listing(self, entry, relpath, path, counts):
+        """lists the directory again, and updates its direct children.
+
+        the new subdirectories are scanned as a whole, and the files are
+        updated in place. returns the (entry, name, stored mtime) of the
+        existing subdirectories, which have yet to be refreshed."""
+        stored = dict((name, mtime) for name, mtime in self._conn.execute(
+                      "SELECT name, mtime FROM entries WHERE parent = ?", (relpath,)))
+        found  = _scanning.list_children(entry, path, backend=self._backend)
+        for name in set(stored.keys()).difference(child.direntry.name for child in found):
+            self._remove(relpath, name, counts)
+
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        insert       = f"INSERT OR REPLACE INTO entries ({', '.join(COLUMNS)}) VALUES ({placeholders})"
+        existing     = []
+        for child in found:
+            name = child.direntry.name
+            if child.level == self.FILE:
+                self._conn.execute(insert, make_row(child, relpath, child.direntry.stat()))
+                counts["updated" if name in stored.keys() else "added"] += 1
+            elif name in stored.keys():
+                existing.append((child, name, stored[name]))
+            else:
+                self._conn.execute(insert, make_row(child, relpath, child.direntry.stat()))
+                added = self._conn.executemany(insert, scan(self._root, child, child.direntry.path,
+                                                            backend=self._backend))
+                counts["added"] += 1 + max(added.rowcount, 0)
+        return existing
+
+    def _remove(self, parent, name, counts):
+        """removes the entry, and everything below it, from the catalog."""
+        relpath = f"{parent}/{name}" if parent else name
+        cursor  = self._conn.execute("DELETE FROM entries WHERE (parent = ? AND name = ?) "
+                                     "OR parent = ? OR substr(parent, 1, ?) = ?",
+                                     (parent, name, relpath, len(relpath) + 1, relpath + "/"))
+        counts["removed"] += cursor.rowcount
+
+    def _fetchone(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def _fetchall(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def children(self, spec):
+        """returns the sorted names of the entries directly under
+        the container specified by the Predicate `spec`."""
+        level = spec.level
+        if level not in CHILD_LEVELS.keys():
+            raise ValueError(f"cannot list children at the predicate level: '{level}'")
+        where, params = self._identify(spec)
+        rows = self._fetchall(f"SELECT name FROM entries WHERE {where} ORDER BY name",
+                              (CHILD_LEVELS[level],) + params)
+        return [row[0] for row in rows]
+
+    def contains(self, spec):
+        """returns if the catalog has an entry corresponding to the Predicate `spec`."""
+        level = spec.level
+        if level == self.ROOT:
+            return True
+        elif level == self.NA:
+            return False
+        where, params = self._identify(spec)
+        return self._fetchone(f"SELECT 1 FROM entries WHERE {where} LIMIT 1",
+                              (level,) + params) is not None
+
+    def count(self, level=_DataLevels.FILE, **conditions):
+        """returns the number of entries at `level` that match `conditions`
+        (see `query()` for the format)."""
+        where, params = self._conditions(conditions)
+        return self._fetchone(f"SELECT COUNT(*) FROM entries WHERE {where}",
+                              (level,) + params)[0]
+
+    def query(self, level=_DataLevels.FILE, mode=_modes.READ, paths=False, **conditions):
+        """generates Predicates for the entries at `level` that match `conditions`.
+
+        each condition is given as a keyword argument named after a column
+        (e.g. `subject`, `session_type`, `session_date`, `domain`, `suffix`),
+        and its value may be a single value or a list of values.
+        with `paths=True`, (Predicate, path) is generated instead, where `path`
+        is the path of the entry as it was found under `root`.
+        """
+        where, params = self._conditions(conditions)
+        columns = ", ".join(("parent", "name") + tuple(col for _, cols in LEVEL_COLUMNS for col in cols))
+        rows    = self._fetchall(f"SELECT {columns} FROM entries WHERE {where} ORDER BY parent, name",
+                                 (level,) + params)
+        for row in rows:
+            spec = self._predicate(row[2:], mode)
+            if paths:
+                yield spec, self._root.joinpath(*row[0].split("/"), row[1]) if row[0] \
+                            else self._root / row[1]
+            else:
+                yield spec
+
+    def rows(self, columns=COLUMNS, level=_DataLevels.FILE, **conditions):
+        """returns the list of the rows (tuples of `columns`) for the entries at
+        `level` that match `conditions` (see `query()`), in the order of paths."""
+        for col in columns:
+            if col not in COLUMNS:
+                raise ValueError(f"unknown catalog column: '{col}'")
+        where, params = self._conditions(conditions)
+        return self._fetchall(f"SELECT {', '.join(columns)} FROM entries WHERE {where} ORDER BY parent, name",
+                              (level,) + params)
+
+    def _predicate(self, row, mode):
+        dataset, subject, stype, sdate, sindex, domain, trial, run, channel, suffix = row
+        if stype is None:
+            session = _SessionSpec()
+        else:
+            session = _SessionSpec(type=stype, date=sdate, index=sindex)
+        if channel is not None:
+            channel = tuple(channel.split("-"))
+        return _Predicate(mode=mode, root=self._root,
+                          dataset=dataset, subject=subject,
+                          session=session, domain=domain,
+                          file=_FileSpec(suffix=suffix, trial=trial, run=run, channel=channel))
+
+    def _identify(self, spec):
+        """returns the WHERE clause (including the placeholder for `level`)
+        and its parameters to identify the entry of `spec`."""
+        values = dict(dataset=spec.dataset,
+                      subject=spec.subject,
+                      session_type=spec.session.type,
+                      session_date=format_date(spec.session.date),
+                      session_index=spec.session.index,
+                      domain=spec.domain,
+                      trial=spec.file.trial,
+                      run=spec.file.run,
+                      channel=format_channel(spec.file.channel),
+                      suffix=spec.file.suffix)
+        clauses = ["level = ?"]
+        params  = []
+        level   = spec.level
+        if level != self.ROOT:
+            for lev, cols in LEVEL_COLUMNS:
+                for col in cols:
+                    clauses.append(f"{col} IS ?")
+                    params.append(values[col])
+                if lev == level:
+                    break
+        return " AND ".join(clauses), tuple(params)
+
+    def _conditions(self, conditions):
+        """returns the WHERE clause (including the placeholder for `level`)
+        and its parameters from the query conditions."""
+        clauses = ["level = ?"]
+        params  = []
+        for col, value in conditions.items():
+            if col not in COLUMNS[3:]:
+                raise ValueError(f"unknown catalog column: '{col}'")
+            if col == "session_date":
+                value = [format_date(v) for v in value] \
+                        if isinstance(value, (list, tuple, set)) else format_date(value)
+            elif col == "channel":
+                value = format_channel(value)
+            if isinstance(value, (list, tuple, set)):
+                value = tuple(value)
+                clauses.append(f"{col} IN ({', '.join('?' for _ in value)})")
+                params.extend(value)
+            else:
+                clauses.append(f"{col} IS ?")
+                params.append(value)
+        return " AND ".join(clauses), tuple(params)
@@ -0,0 +1,125 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""usage: python -m dope.catalog.tests"""
+
+import unittest
+import shutil
+from . import *
+from .. import testing
+from ..backends import MemoryBackend
+from ..dataroot import DataRoot
+
+class CatalogTests(unittest.TestCase):
+    def setUp(self):
+        self._root   = testing.populate(testing.test_dataroot_path())
+        self._dbpath = self._root.with_name(self._root.name + ".sqlite3")
+
+    def test_build(self):
+        root = DataRoot(self._root).build_index()
+        self.assertEqual(root.catalog.path, (self._root / Catalog.FILENAME).resolve())
+        self.assertEqual(root.catalog.count(Catalog.DATASET), 2)
+        self.assertEqual(root.catalog.count(Catalog.SESSION), 3)
+        self.assertEqual(root.catalog.count(Catalog.FILE), 5)
+        root.catalog.close()
+
+    def test_selectors(self):
+        Catalog.build(self._root, self._dbpath).close()
+        shutil.rmtree(self._root) # should not be referred to any more
+        root = DataRoot(self._root, catalog=self._dbpath)
+        self.assertEqual([ds.path.name for ds in root.datasets], ["ds1", "ds2"])
+        self.assertEqual([sub.path.name for sub in root["ds1"].subjects], ["K1", "K2"])
+        sub = root["ds1"]["K1"]
+        self.assertEqual([sess.path.name for sess in sub.sessions],
+                         ["session2019-01-01-001", "training2019-01-02-001"])
+        sess = sub["session2019-01-01-001"]
+        self.assertEqual([dom.path.name for dom in sess.domains], ["img", "video"])
+        self.assertEqual([file.path.name for file in sess["img"].files],
+                         ["K1_session2019-01-01-001_img_run00001_Green.tif",
+                          "K1_session2019-01-01-001_img_run00002_Green.tif"])
+        with self.assertRaises(FileNotFoundError):
+            root["ds1"]["K3"]
+        with self.assertRaises(FileNotFoundError):
+            sub["session2019-01-01-002"]
+        root.catalog.close()
+
+    def test_query(self):
+        with Catalog.build(self._root, self._dbpath) as catalog:
+            found = tuple(catalog.query(session_type="training", domain="video"))
+            self.assertEqual(len(found), 2)
+            self.assertEqual(set(spec.subject for spec in found), set(("K1", "K2")))
+            self.assertEqual(found[0].level, found[0].FILE)
+            self.assertEqual(catalog.count(subject=["K1", "K2"], run=2), 1)
+            self.assertEqual(catalog.count(Catalog.SESSION, session_date="2019-01-01"), 1)
+            with self.assertRaises(ValueError):
+                catalog.count(unknown=1)
+
+    def test_refresh(self):
+        root  = DataRoot(self._root).build_index(self._dbpath)
+        stats = root.refresh_index()
+        self.assertEqual(stats.checked, 12) # the data-root and 11 directories below
+        self.assertEqual((stats.listed, stats.added, stats.removed), (0, 0, 0))
+
+        newfile = "ds1/K2/session2019-01-04-001/img/K2_session2019-01-04-001_img_run00001_Green.tif"
+        testing.populate(self._root, files=(newfile,), directories=())
+        (self._root / testing.SAMPLE_FILES[1]).unlink()
+        shutil.rmtree(self._root / "ds1/K1/training2019-01-02-001")
+        stats = root.refresh_index()
+        self.assertEqual(stats.listed, 3) # K1, K2 and the 'img' domain of K1
+        self.assertEqual(stats.added, 3) # the session, the domain and the file
+        self.assertEqual(stats.removed, 4)
+
+        with Catalog.build(self._root, self._dbpath.with_suffix(".rebuilt")) as rebuilt:
+            for level in (Catalog.SESSION, Catalog.DOMAIN, Catalog.FILE):
+                self.assertEqual(list(root.catalog.query(level)), list(rebuilt.query(level)))
+            rebuilt.path.unlink()
+        self.assertEqual([sess.path.name for sess in root["ds1"]["K2"].sessions],
+                         ["session2019-01-04-001", "training2019-01-03-001"])
+        root.catalog.close()
+
+    def test_backend(self):
+        backend = MemoryBackend()
+        backend.add_files("/mem", testing.SAMPLE_FILES)
+        root    = DataRoot("/mem", backend=backend).build_index(self._dbpath)
+        try:
+            self.assertIs(root.catalog.backend, backend)
+            self.assertEqual(root.catalog.count(Catalog.FILE), 5)
+            self.assertEqual(root.to_table(format="dict"),
+                             DataRoot("/mem", backend=backend).to_table(format="dict"))
+            backend.add_file("/mem/ds1/K1/session2019-01-01-001/img/"
+                             "K1_session2019-01-01-001_img_run00003_Green.tif")
+            stats = root.refresh_index()
+            self.assertEqual((stats.listed, stats.added), (1, 1))
+            self.assertEqual(root.catalog.count(Catalog.FILE), 6)
+        finally:
+            root.catalog.close()
+
+    def tearDown(self):
+        if self._root.exists():
+            shutil.rmtree(self._root)
+        if self._dbpath.exists():
+            self._dbpath.unlink()
+
+if __name__ == "__main__":
+    unittest.main()
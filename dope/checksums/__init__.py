@@ -0,0 +1,235 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+"""content checksums of the data files, kept in a sidecar file per dataset.
+
+    report = root.select(dataset="ds1", level="file").checksum(workers=8)
+    report.digests  # {path: hexdigest}
+    report.hashed   # the number of the files that were (re-)hashed
+
+the files are hashed in parallel, reading them in chunks of `BUFFER_SIZE`
+bytes. the digests are stored in the sidecar file (`FILENAME`) in the
+directory of each dataset, together with the size and the mtime of
+the files; a file whose size and mtime are unchanged since then is not
+hashed again, but its stored digest is reused.
+
+the sidecar file is a text file with a header line followed by
+one line per file:
+
+    # dope-checksums sha256
+    <digest>\\t<size>\\t<mtime in ns>\\t<path relative to the dataset>
+"""
+
+import os as _os
+import hashlib as _hashlib
+import pathlib as _pathlib
+import collections as _collections
+import concurrent.futures as _futures
+
+FILENAME    = ".dope-checksums"
+HEADER      = "# dope-checksums"
+ALGORITHM   = "sha256"
+BUFFER_SIZE = 8 * 1024 * 1024 # bytes
+
+def hash_file(path, algorithm=ALGORITHM, buffer_size=BUFFER_SIZE):
+    """returns the hex digest of the contents of the file at `path`,
+    reading it in chunks of `buffer_size` bytes into a single buffer."""
+    digest = _hashlib.new(algorithm)
+    buffer = bytearray(buffer_size)
+    view   = memoryview(buffer)
+    with open(path, "rb", buffering=0) as file:
+        while True:
+            size = file.readinto(buffer)
+            if not size:
+                break
+            digest.update(view[:size])
+    return digest.hexdigest()
+
+class Sidecar:
+    """the stored checksums of the data files in a dataset."""
+
+    def __init__(self, path, algorithm=ALGORITHM):
+        """loads the sidecar file at `path` if it exists. the entries stored
+        with another algorithm are discarded (and are not reused)."""
+        self._path      = _pathlib.Path(path)
+        self._algorithm = algorithm
+        self._entries   = {} # {relative path: (size, mtime_ns, digest)}
+        self._modified  = False
+        if self._path.exists():
+            with open(self._path, "r", encoding="utf-8") as file:
+                header = file.readline().split()
+                if header[-1:] == [algorithm]:
+                    for line in file:
+                        digest, size, mtime, relpath = line.rstrip("\n").split("\t", 3)
+                        self._entries[relpath] = (int(size), int(mtime), digest)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({str(self._path)!r})"
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def algorithm(self):
+        return self._algorithm
+
+    def lookup(self, relpath, size, mtime_ns):
+        """returns the stored digest if the file has the same size
+        and mtime as when it was hashed, or None otherwise."""
+        stored = self._entries.get(relpath)
+        if (stored is not None) and (stored[:2] == (size, mtime_ns)):
+            return stored[2]
+        return None
+
+    def digest(self, relpath):
+        """returns the stored digest of the file regardless of its size and mtime."""
+        stored = self._entries.get(relpath)
+        return None if stored is None else stored[2]
+
+    def store(self, relpath, size, mtime_ns, digest):
+        self._entries[relpath] = (size, mtime_ns, digest)
+        self._modified = True
+
+    def save(self):
+        """writes the entries back to the sidecar file, if they have been modified."""
+        if not self._modified:
+            return
+        tmppath = self._path.with_name(self._path.name + ".tmp")
+        with open(tmppath, "w", encoding="utf-8") as file:
+            file.write(f"{HEADER} {self._algorithm}\n")
+            for relpath in sorted(self._entries.keys()):
+                size, mtime, digest = self._entries[relpath]
+                file.write(f"{digest}\t{size}\t{mtime}\t{relpath}\n")
+        _os.replace(tmppath, self._path)
+        self._modified = False
+
+class ChecksumReport(_collections.namedtuple("_ChecksumReport",
+                     ("digests", "hashed", "reused", "hashed_bytes"))):
+    """the result of update():
+
+    - digests:      {path: hex digest} of all the files,
+    - hashed:       the number of the files that were hashed,
+    - reused:       the number of the files whose stored digests were reused,
+    - hashed_bytes: the total size of the files that were hashed."""
+    __slots__ = ()
+
+def sidecar_of(file):
+    """returns the path to the sidecar file for a DataFile, and the path
+    of the DataFile relative to the directory of its dataset."""
+    dataset = file._spec.dataset_path
+    return dataset / FILENAME, _pathlib.PurePath(file.path).relative_to(dataset).as_posix()
+
+def hash_files(jobs, workers=None, processes=False, algorithm=ALGORITHM,
+               buffer_size=BUFFER_SIZE):
+    """generates (key, digest) for each (key, path) in `jobs`, in the same order,
+    hashing the files in a pool of `workers` threads (or processes).
+
+    `jobs` is consumed lazily, and at most four times `workers` files
+    are submitted in advance."""
+    workers  = (_os.cpu_count() or 1) if workers is None else workers
+    pool     = _futures.ProcessPoolExecutor if processes else _futures.ThreadPoolExecutor
+    pending  = _collections.deque() # (key, future) in the order of `jobs`
+    executor = pool(max_workers=workers)
+    try:
+        for key, path in jobs:
+            pending.append((key, executor.submit(hash_file, path, algorithm, buffer_size)))
+            while len(pending) > 4 * workers:
+                key, future = pending.popleft()
+                yield key, future.result()
+        while pending:
+            key, future = pending.popleft()
+            yield key, future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+class Sidecars(dict):
+    """{sidecar path: Sidecar}, loaded on demand."""
+
+    def __init__(self, algorithm=ALGORITHM):
+        super().__init__()
+        self._algorithm = algorithm
+
+    def __missing__(self, path):
+        sidecar = self[path] = Sidecar(path, algorithm=self._algorithm)
+        return sidecar
+
+def update(files, workers=None, processes=False, algorithm=ALGORITHM,
+           buffer_size=BUFFER_SIZE, force=False):
+    """computes the checksums of the DataFiles in `files` (e.g. a Selection),
+    stores them in the sidecar files of their datasets, and returns the ChecksumReport.
+
+    workers:   the number of the files hashed in parallel (the number of CPUs by default).
+    processes: uses a pool of processes instead of threads. the threads are
+               usually enough, as hashlib releases the GIL while hashing.
+    force:     hashes all the files again, ignoring the stored digests.
+
+    `files` is consumed lazily (see hash_files()). in case hashing fails,
+    the error is raised after the digests computed so far are stored,
+    and the remaining files are hashed on the next update."""
+    sidecars = Sidecars(algorithm)
+    digests  = {}
+    counts   = dict(hashed=0, reused=0, hashed_bytes=0)
+
+    def _jobs():
+        for file in files:
+            sidecarpath, relpath = sidecar_of(file)
+            sidecar = sidecars[sidecarpath]
+            st      = file.backend.stat(file.path)
+            digest  = None if force else sidecar.lookup(relpath, st.st_size, st.st_mtime_ns)
+            if digest is not None:
+                digests[file.path] = digest
+                counts["reused"] += 1
+            else:
+                counts["hashed"] += 1
+                counts["hashed_bytes"] += st.st_size
+                yield (sidecar, relpath, st.st_size, st.st_mtime_ns, file.path), file.path
+
+    try:
+        for (sidecar, relpath, size, mtime, path), digest in \
+                hash_files(_jobs(), workers=workers, processes=processes,
+                           algorithm=algorithm, buffer_size=buffer_size):
+            sidecar.store(relpath, size, mtime, digest)
+            digests[path] = digest
+    finally:
+        # keeps the digests computed so far, even if hashing failed halfway
+        for sidecar in sidecars.values():
+            sidecar.save()
+    return ChecksumReport(digests, **counts)
+
+def verify(files, workers=None, processes=False, algorithm=ALGORITHM, buffer_size=BUFFER_SIZE):
+    """hashes all the DataFiles in `files` again, and returns the list of
+    the paths whose digests differ from the stored ones, or that have
+    not been stored at all. the sidecar files are not modified."""
+    sidecars = Sidecars(algorithm)
+    def _jobs():
+        for file in files:
+            sidecarpath, relpath = sidecar_of(file)
+            yield (file.path, sidecars[sidecarpath].digest(relpath)), file.path
+    return [path for (path, stored), digest in \
+            hash_files(_jobs(), workers=workers, processes=processes,
+                       algorithm=algorithm, buffer_size=buffer_size) \
+            if digest != stored]
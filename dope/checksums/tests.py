@@ -0,0 +1,115 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""usage: python -m dope.checksums.tests"""
+
+import unittest
+import shutil
+import hashlib
+import os
+from unittest import mock
+from . import *
+from .. import testing
+from ..dataroot import DataRoot
+
+class ChecksumTests(unittest.TestCase):
+    def setUp(self):
+        self._root = testing.populate(testing.test_dataroot_path()).resolve()
+        for index, name in enumerate(testing.SAMPLE_FILES):
+            (self._root / name).write_bytes(bytes(range(index + 1)) * 1000)
+
+    def files(self):
+        return DataRoot(self._root).select(dataset="ds1", level="file")
+
+    def test_hash_file(self):
+        path = self._root / testing.SAMPLE_FILES[1]
+        self.assertEqual(hash_file(path, buffer_size=7), hashlib.sha256(path.read_bytes()).hexdigest())
+        self.assertEqual(hash_file(path, algorithm="md5"), hashlib.md5(path.read_bytes()).hexdigest())
+
+    def test_update(self):
+        report = self.files().checksum(workers=2)
+        self.assertEqual((report.hashed, report.reused), (5, 0))
+        self.assertEqual(report.digests[self._root / testing.SAMPLE_FILES[0]],
+                         hashlib.sha256(b"\0" * 1000).hexdigest())
+        sidecar = Sidecar(self._root / "ds1" / FILENAME)
+        self.assertEqual(len(sidecar), 5)
+        self.assertEqual(sidecar.digest(testing.SAMPLE_FILES[0][len("ds1/"):]),
+                         hashlib.sha256(b"\0" * 1000).hexdigest())
+
+        # only the modified file is hashed again
+        modified = self._root / testing.SAMPLE_FILES[3]
+        modified.write_bytes(b"modified")
+        report = self.files().checksum(workers=2)
+        self.assertEqual((report.hashed, report.reused, report.hashed_bytes), (1, 4, 8))
+        self.assertEqual(report.digests[modified], hashlib.sha256(b"modified").hexdigest())
+        self.assertEqual(self.files().checksum(force=True).hashed, 5)
+        self.assertEqual(self.files().checksum(algorithm="md5").hashed, 5) # not reusable
+        # the sidecar file does not appear in the data-root
+        self.assertEqual([ds.path.name for ds in DataRoot(self._root).datasets], ["ds1", "ds2"])
+
+    def test_verify(self):
+        self.files().checksum(processes=True, workers=2)
+        self.assertEqual(self.files().verify(), [])
+        corrupt = self._root / testing.SAMPLE_FILES[0]
+        st      = corrupt.stat()
+        corrupt.write_bytes(b"\1" * 1000) # the same size ...
+        os.utime(corrupt, ns=(st.st_atime_ns, st.st_mtime_ns)) # ... and mtime
+        self.assertEqual(self.files().checksum().hashed, 0)
+        self.assertEqual(self.files().verify(), [corrupt])
+        with self.assertRaises(ValueError):
+            DataRoot(self._root).select(dataset="ds1").checksum()
+
+    def test_unpadded(self):
+        # the session index and the run are not zero-padded on the disk
+        name = "ds1/K1/session2019-01-05-1/img/K1_session2019-01-05-1_img_run1_Green.tif"
+        testing.populate(self._root, files=(name,), directories=())
+        (self._root / name).write_bytes(b"unpadded")
+        report = self.files().checksum(workers=2)
+        self.assertEqual((report.hashed, report.reused), (6, 0))
+        self.assertEqual(report.digests[self._root / name], hashlib.sha256(b"unpadded").hexdigest())
+        self.assertEqual(Sidecar(self._root / "ds1" / FILENAME).digest(name[len("ds1/"):]),
+                         hashlib.sha256(b"unpadded").hexdigest())
+        self.assertEqual(self.files().checksum().reused, 6)
+        self.assertEqual(self.files().verify(), [])
+
+    def test_failure(self):
+        failing = self._root / testing.SAMPLE_FILES[1]
+        def _hash_file(path, *args):
+            if path == failing:
+                raise OSError("cannot read")
+            return hashlib.sha256(path.read_bytes()).hexdigest()
+        with mock.patch(f"{__package__}.hash_file", side_effect=_hash_file):
+            with self.assertRaises(OSError): # the failure is not hidden ...
+                self.files().checksum(workers=1)
+        # ... but the digests computed before it are kept
+        self.assertEqual(len(Sidecar(self._root / "ds1" / FILENAME)), 1)
+        report = self.files().checksum(workers=2)
+        self.assertEqual((report.hashed, report.reused), (4, 1))
+
+    def tearDown(self):
+        if self._root.exists():
+            shutil.rmtree(self._root)
+
+if __name__ == "__main__":
+    unittest.main()
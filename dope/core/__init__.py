@@ -22,11 +22,22 @@
 # SOFTWARE.
 #
 
-from .. import modes as _modes
+from ..backends import LOCAL as _LOCAL
+from .. import aio as _aio
+from .. import instrumentation as _instrumentation
+
+def iterable(obj):
+    """returns if `obj` can be iterated over."""
+    try:
+        iter(obj)
+        return True
+    except TypeError:
+        return False
 
 class Container: # TODO: better renamed as `Context`?
     """a reference to data based on a specific Predicate."""
-    _spec = None
+    __slots__ = ("_spec", "_path", "_catalog", "_backend")
+    LEVEL     = None # the DataLevels value of the container
 
     @classmethod
     def is_valid_path(cls, path):
@@ -41,43 +52,115 @@ class Container: # TODO: better renamed as `Context`?
         raise NotImplementedError(f"not implemented: {cls}.compute_child_path()")
 
     @classmethod
-    def from_parent(cls, parentspec, key):
+    def from_parent(cls, parentspec, key, catalog=None, parentpath=None, backend=None):
         """creates a container from the parent spec and `key`.
-        `key` is typically a string, but may be e.g. SessionSpec."""
+        `key` is typically a string, but may be e.g. SessionSpec.
+        if `parentpath` is given, the path of the container is derived from it."""
         raise NotImplementedError(f"not implemented: {cls}.from_path()")
 
+    @property
+    def catalog(self):
+        """the catalog this container answers from, or None
+        if it refers to the file system directly."""
+        return self._catalog
+
+    @property
+    def backend(self):
+        """the file-system backend this container refers to."""
+        return self._backend
+
     def with_mode(self, mode):
         """changes the I/O mode of this container."""
-        return self.__class__(self._spec.with_values(mode=mode))
+        return self.__class__(self._spec.with_values(mode=mode), catalog=self._catalog,
+                              backend=self._backend)
+
+    def _exists(self):
+        """returns if the data referred to by this container exists."""
+        if self._catalog is not None:
+            return self._catalog.contains(self._spec)
+        return self._backend.exists(self._path)
 
 class Selector:
-    """an adaptor class used to select from subdirectories."""
-    def __init__(self, spec, delegate):
+    """an adaptor class used to select from subdirectories.
+
+    the names of the children are listed once, on the first call
+    that needs all of them (e.g. sorted iteration or len()), and
+    are reused afterwards until refresh() is called."""
+    __slots__ = ("_spec", "_path", "_delegate", "_catalog", "_backend", "_names")
+
+    def __init__(self, spec, delegate, catalog=None, path=None, backend=None):
         self._spec     = spec
-        self._path     = spec.path
+        self._path     = spec.path if path is None else path
         self._delegate = delegate
+        self._catalog  = catalog
+        self._backend  = _LOCAL if backend is None else backend
+        self._names    = None
+
+    def refresh(self):
+        """discards the names listed so far."""
+        self._names = None
+
+    def names(self):
+        """returns the sorted names of the valid child entries."""
+        if self._names is None:
+            self._names = sorted(self.iter_names())
+        return self._names
+
+    @_instrumentation.timed("list", level=lambda selector: selector._delegate.LEVEL)
+    def iter_names(self):
+        """generates the names of the valid child entries,
+        in the order they are discovered."""
+        if self._names is not None:
+            yield from self._names
+        elif self._catalog is not None:
+            yield from self._catalog.children(self._spec)
+        else:
+            # the entries have `name` and `is_dir()` as Path does, but
+            # the latter does not require a stat call on most platforms
+            for entry in self._backend.scandir(self._path):
+                if self._delegate.is_valid_path(entry):
+                    yield entry.name
+
+    def stream(self, sort=False):
+        """generates child containers as soon as they are discovered.
+        with `sort=True`, they are generated in the order of their names,
+        after the whole directory is listed."""
+        names = self.names() if sort else self.iter_names()
+        for name in names:
+            yield self._delegate.from_parent(self._spec, name, catalog=self._catalog,
+                                             parentpath=self._path, backend=self._backend)
+
+    def aiter(self, executor=None, sort=False):
+        """asynchronously generates child containers (see stream()), listing
+        the directory and creating the containers in `executor`, so that
+        the event loop is not blocked, e.g.:
+
+            async for session in subject.sessions.aiter():
+                ...
+        """
+        return _aio.aiterate(self.stream(sort=sort), executor=executor)
+
+    def count(self):
+        """counts the valid child entries without creating containers."""
+        return len(self.names())
+
+    def __len__(self):
+        return self.count()
 
     def __iter__(self):
-        if not self._path.exists():
-            raise FileNotFoundError(f"path does not exist: {parent}")
-        return tuple(sorted(self._delegate.from_parent(self._spec, path.name) \
-                            for path in self._path.iterdir() \
-                            if self._delegate.is_valid_path(path)))
+        return self.stream(sort=True)
 
     def __getitem__(self, key):
-        child = self._delegate.compute_path(self._path, key)
-        if self._spec.mode == _modes.READ:
-            if not self._path.exists():
-                raise FileNotFoundError(f"container path does not exist: {parent}")
-            if not child.exists():
-                raise FileNotFoundError(f"item does not exist: {child}")
-        return self._delegate.from_parent(self._spec, key)
+        # in READ mode, the child container checks its own existence
+        return self._delegate.from_parent(self._spec, key, catalog=self._catalog,
+                                          parentpath=self._path, backend=self._backend)
 
     @property
     def path(self):
         return self._path
 
 class SelectionStatus:
+    __slots__   = ()
     NONE        = "none"
     UNSPECIFIED = "unspecified"
     SINGLE      = "single"
@@ -85,10 +168,11 @@ class SelectionStatus:
     DYNAMIC     = "dynamic"
 
 class DataLevels:
-    NA      = "na"
-    ROOT    = "root"
-    DATASET = "dataset"
-    SUBJECT = "subject"
-    SESSION = "session"
-    DOMAIN  = "domain"
-    FILE    = "file"
+    __slots__ = ()
+    NA        = "na"
+    ROOT      = "root"
+    DATASET   = "dataset"
+    SUBJECT   = "subject"
+    SESSION   = "session"
+    DOMAIN    = "domain"
+    FILE      = "file"
@@ -0,0 +1,84 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""usage: python -m dope.core.tests"""
+
+import unittest
+import shutil
+from .. import testing
+from ..dataroot import DataRoot
+
+class SelectorTests(unittest.TestCase):
+    def setUp(self):
+        self._root = testing.populate(testing.test_dataroot_path())
+
+    def test_iterate(self):
+        sessions = DataRoot(self._root)["ds1"]["K1"].sessions
+        self.assertEqual([sess.path.name for sess in sessions],
+                         ["session2019-01-01-001", "training2019-01-02-001"])
+        self.assertEqual(sorted(sess.path.name for sess in sessions.stream()),
+                         sessions.names())
+        first = next(sessions.stream())
+        self.assertIn(first.path.name, sessions.names())
+
+    def test_child_paths(self):
+        sub = DataRoot(self._root)["ds1"]["K1"]
+        (self._root / "ds1/K1/session2019-01-05-1").mkdir() # not zero-filled
+        self.assertEqual([sess.path for sess in sub.sessions],
+                         [self._root / "ds1/K1" / name for name in
+                          ("session2019-01-01-001", "session2019-01-05-1", "training2019-01-02-001")])
+        self.assertEqual(sub["session2019-01-05-1"].path, self._root / "ds1/K1/session2019-01-05-1")
+        # the keys that do not specify a single child are rejected
+        domain = sub["session2019-01-01-001"]["img"]
+        for selector, key in ((sub.sessions, "not-a-session"),
+                              (sub.sessions, ("session", ["2019-01-01", "2019-01-02"], 1)),
+                              (DataRoot(self._root).datasets, ["ds1"]),
+                              (sub["session2019-01-01-001"].domains, ["img", "video"]),
+                              (domain.files, domain.files["K1_session2019-01-01-001_img_run00001_Green.tif"]
+                                             ._spec.file.with_values(channel=None))):
+            with self.assertRaises(ValueError):
+                selector[key]
+
+    def test_slots(self):
+        sessions = DataRoot(self._root)["ds1"]["K1"].sessions
+        self.assertFalse(hasattr(sessions, "__dict__"))
+        for sess in sessions:
+            self.assertFalse(hasattr(sess, "__dict__"))
+
+    def test_count(self):
+        root = DataRoot(self._root)
+        self.assertEqual(len(root.datasets), 2)
+        sessions = root["ds1"]["K1"].sessions
+        self.assertEqual(sessions.count(), 2)
+        (self._root / "ds1/K1/session2019-01-05-001").mkdir()
+        self.assertEqual(len(sessions), 2) # the names have been listed already
+        sessions.refresh()
+        self.assertEqual(len(sessions), 3)
+
+    def tearDown(self):
+        if self._root.exists():
+            shutil.rmtree(self._root)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+"""creating the directories of containers in WRITE/APPEND modes.
+
+a DirectoryCreator remembers the directories that are known to exist,
+so that the same parent directories are not checked (or created) again.
+a directory is created by a single mkdir call when its parent exists,
+and its parents are only looked into when that fails.
+"""
+
+import os as _os
+import threading as _threading
+
+from .. import modes as _modes
+from ..core import DataLevels as _DataLevels
+from ..backends import LOCAL as _LOCAL
+
+def directory_of(spec):
+    """returns the directory that has to exist for the Predicate `spec`
+    (i.e. the domain directory for a file, and its own path otherwise)."""
+    if spec.mode == _modes.READ:
+        raise ValueError(f"cannot create directories in the READ mode: {spec}")
+    level = spec.level
+    if level == _DataLevels.FILE:
+        return spec.domain_path
+    elif level == _DataLevels.NA:
+        raise ValueError("cannot create a directory from an empty predicate")
+    return spec.path
+
+def leaf_directories(paths):
+    """returns the unique directories in `paths`, leaving out the ones
+    that are the parents of others (they are created along with the latter)."""
+    parts  = sorted(set(tuple(_os.fspath(path).split(_os.sep)) for path in paths))
+    leaves = []
+    for i, path in enumerate(parts):
+        if (i + 1 < len(parts)) and (parts[i + 1][:len(path)] == path):
+            continue # the next one is below this directory
+        leaves.append(_os.sep.join(path) or _os.sep)
+    return leaves
+
+class DirectoryCreator:
+    """creates directories through a backend, remembering the ones that exist."""
+
+    def __init__(self, backend=None):
+        self._backend = _LOCAL if backend is None else backend
+        self._known   = set()
+        self._lock    = _threading.Lock()
+
+    @property
+    def backend(self):
+        return self._backend
+
+    def forget(self):
+        """discards the directories that are remembered to exist."""
+        with self._lock:
+            self._known.clear()
+
+    def _remember(self, path):
+        # the parents of an existing directory exist as well
+        with self._lock:
+            while path not in self._known:
+                self._known.add(path)
+                parent = _os.path.dirname(path)
+                if parent == path:
+                    break
+                path = parent
+
+    def ensure(self, path):
+        """makes sure the directory at `path` exists (as `mkdir -p` does),
+        and returns the number of the directories that were created."""
+        path = _os.fspath(path)
+        if path in self._known:
+            return 0
+        try:
+            self._backend.mkdir(path)
+            created = 1
+        except FileExistsError:
+            if not self._backend.is_dir(path):
+                raise NotADirectoryError(f"not a directory: '{path}'") from None
+            created = 0
+        except FileNotFoundError:
+            parent = _os.path.dirname(path)
+            if (parent == path) or (parent == ""):
+                raise
+            created = self.ensure(parent)
+            try:
+                self._backend.mkdir(path)
+                created += 1
+            except FileExistsError: # created concurrently
+                pass
+        self._remember(path)
+        return created
+
+    def ensure_many(self, paths):
+        """makes sure all the directories at `paths` exist, and returns
+        the number of the directories that were created."""
+        return sum(self.ensure(path) for path in leaf_directories(paths))
@@ -0,0 +1,91 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""usage: python -m dope.creation.tests"""
+
+import unittest
+import shutil
+from . import *
+from .. import modes, testing
+from ..backends import MemoryBackend
+from ..predicate import Predicate
+from ..dataroot import DataRoot
+
+class CountingBackend(MemoryBackend):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def mkdir(self, path):
+        self.calls += 1
+        return super().mkdir(path)
+
+class CreationTests(unittest.TestCase):
+    def setUp(self):
+        self._root = testing.test_dataroot_path().resolve()
+
+    def test_leaves(self):
+        self.assertEqual(leaf_directories(["/a/b", "/a", "/a/b/c", "/a/b-d", "/a/b/c"]),
+                         ["/a/b/c", "/a/b-d"])
+
+    def test_create_many(self):
+        backend = CountingBackend()
+        backend.add_directory(self._root)
+        root    = DataRoot(self._root, mode=modes.WRITE, backend=backend)
+        session = Predicate(mode=modes.WRITE, dataset="ds1", subject="K1",
+                            session="session2019-01-01-001")
+        files   = [session.with_values(domain=domain, run=run, channel="Green", suffix=".tif") \
+                   for domain in ("img", "video") for run in range(100)]
+        self.assertEqual(root.create_many(files), 5)
+        self.assertEqual(backend.calls, 3 + 5) # three calls fail on the missing parents
+        self.assertTrue(backend.is_dir(self._root / "ds1/K1/session2019-01-01-001/video"))
+        backend.calls = 0
+        self.assertEqual(root.create_many(files), 0)
+        self.assertEqual(root.ensure(session.with_values(domain="img")), 0)
+        self.assertEqual(backend.calls, 0)
+        self.assertEqual(root.ensure(session.with_values(domain="behavior")), 1)
+        self.assertEqual(backend.calls, 1)
+
+        backend.add_file(self._root / "ds2")
+        with self.assertRaises(NotADirectoryError):
+            root.ensure(Predicate(mode=modes.WRITE, dataset="ds2"))
+        with self.assertRaises(ValueError):
+            root.ensure(session.with_values(mode=modes.READ))
+
+    def test_local(self):
+        root = DataRoot(self._root, mode=modes.WRITE)
+        self.assertEqual(root.ensure(), 1)
+        spec = Predicate(mode=modes.APPEND, dataset="ds1", subject="K1",
+                         session="session2019-01-01-001", domain="img")
+        self.assertEqual(root.create_many([spec, spec.as_session()]), 4)
+        self.assertTrue((self._root / "ds1/K1/session2019-01-01-001/img").is_dir())
+        root.forget_directories()
+        self.assertEqual(root.ensure(root["ds1"]["K1"]), 0)
+
+    def tearDown(self):
+        if self._root.exists():
+            shutil.rmtree(self._root)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -22,45 +22,109 @@
 # SOFTWARE.
 #
 
+import mmap as _mmap
 import pathlib as _pathlib
 
 from .. import modes as _modes
 from ..predicate import Predicate as _Predicate
+from ..sessionspec import SessionSpec as _SessionSpec
+from ..filespec import FileSpec as _FileSpec
+from .. import parsing as _parsing
 from ..core import Container as _Container
 from ..core import Selector as _Selector
+from ..backends import LOCAL as _LOCAL
+from .. import instrumentation as _instrumentation
 
-def parse_spec_from_path(path):
-    raise NotImplementedError("dope.datafile.parse_spec_from_path()")
+@_instrumentation.timed("parse")
+def parse_spec_from_name(name):
+    """parses a file name into a dict(subject, session, domain, file),
+    where `session` and `file` are SessionSpec and FileSpec, respectively.
+
+    a valid name specifies a single file, i.e. a run or a trial, the channels
+    and the suffix (see dope.parsing.filename); the names that lack any of them
+    (e.g. `K1_session2019-01-01-001_img.tif`) are not regarded as data files.
+
+    raises ValueError in case `name` is not a valid name for a data file."""
+    parsed = _parsing.filename.parse(name).result
+    return dict(subject=parsed["subject"],
+                session=_SessionSpec(**parsed["session"]),
+                domain=parsed["domain"],
+                file=_FileSpec(**parsed["filespec"]))
+
+def parse_spec_from_path(path, mode=None):
+    """parses the path to a data file into a Predicate.
+
+    the file name is parsed with a single regular expression, and
+    the subject, session and domain it specifies must agree with
+    the names of the parent directories.
+    raises ValueError in case `path` is not a valid path for a data file.
+    """
+    path    = _pathlib.Path(path)
+    spec    = parse_spec_from_name(path.name)
+    domdir  = path.parent
+    sessdir = domdir.parent
+    subdir  = sessdir.parent
+    dsdir   = subdir.parent
+    if (spec["domain"] != domdir.name) or \
+       (spec["session"] != _SessionSpec(sessdir.name)) or \
+       (spec["subject"] != subdir.name):
+        raise _parsing.ParseError(f"file name does not agree with its directories: {path}")
+    return _Predicate(mode=mode if mode is not None else _modes.READ,
+                      root=dsdir.parent,
+                      dataset=dsdir.name,
+                      **spec)
 
 class DataFile(_Container):
     """a container class representing a data file."""
+    __slots__ = ()
+    LEVEL     = _Predicate.FILE
+
     @classmethod
     def is_valid_path(cls, path):
-        """returns if the specified file path
-        represents a valid session."""
+        """returns if the specified file path (or os.DirEntry)
+        represents a valid data file.
+
+        only the file name is examined, on the assumption that
+        the file resides in the corresponding domain directory."""
         if path.name.startswith(".") or path.is_dir():
             return False
         try:
-            parsed = parse_spec_from_path(path)
+            parse_spec_from_name(path.name)
             return True
         except ValueError:
             return False
 
     @classmethod
-    def from_parent(cls, parentspec, key):
-        raise NotImplementedError("dope.datafile.DataFile.from_parent()")
+    @_instrumentation.timed("derive", level=_Predicate.FILE)
+    def from_parent(cls, parentspec, key, catalog=None, parentpath=None, backend=None):
+        """`key` may be either a file name or a FileSpec."""
+        path = None
+        if isinstance(key, str):
+            if parentpath is not None:
+                path = parentpath / key
+            key = parse_spec_from_name(key)["file"]
+        elif not isinstance(key, _FileSpec):
+            raise ValueError(f"unexpected key type: {key.__class__}")
+        elif key.status != key.SINGLE:
+            raise ValueError(f"cannot specify a file: not specifying a single condition (status: '{key.status}')")
+        return cls(parentspec.child(parentspec.FILE, key),
+                   catalog=catalog, path=path, backend=backend)
 
-    def __init__(self, spec, mode=None):
+    @_instrumentation.timed("init", level=_Predicate.FILE)
+    def __init__(self, spec, mode=None, catalog=None, path=None, backend=None):
         """`spec` may be a path-like object or a Predicate.
-        by default, dope.modes.READ is selected for `mode`."""
+        by default, dope.modes.READ is selected for `mode`.
+        `path` may be given if the path of `spec` is already known
+        (e.g. when derived from the path of the parent).
+        `backend` is the file-system backend (backends.LOCAL by default)."""
+        backend = _LOCAL if backend is None else backend
         if not isinstance(spec, _Predicate):
             # assumes path-like object
             try:
-                path = _pathlib.Path(spec).resolve()
+                path = backend.resolve(spec)
             except TypeError:
-                raise ValueError(f"Subject can only be initialized by a path-like object or a Predicate, not {spec.__class__}")
-            spec = _Predicate(mode=mode if mode is not None else _modes.READ,
-                              **parse_spec_from_path(path))
+                raise ValueError(f"DataFile can only be initialized by a path-like object or a Predicate, not {spec.__class__}")
+            spec = parse_spec_from_path(path, mode=mode)
         else:
             # validate and (if needed) modify the Predicate
             level = spec.level
@@ -71,30 +135,76 @@ class DataFile(_Container):
                 spec = spec.with_values(mode=mode)
 
         self._spec = spec
-        self._path = spec.path
-        if (self._spec.mode == _modes.READ) and (not self._path.exists()):
+        self._path = spec.path if path is None else path
+        self._catalog = catalog
+        self._backend = backend
+        if (self._spec.mode == _modes.READ) and (not self._exists()):
             raise FileNotFoundError(f"data file does not exist: {self._path}")
 
     @property
     def path(self):
         return self._path
 
+    @property
+    def writable(self):
+        """returns if the contents of the file may be modified,
+        i.e. if this file is in the WRITE mode."""
+        return self._spec.mode == _modes.WRITE
+
+    def open_mmap(self, offset=0, length=0):
+        """maps the contents of the file into memory without reading them,
+        and returns the mmap.mmap object.
+
+        the file is mapped read-only unless it is in the WRITE mode.
+        `length` of 0 maps the file from `offset` to its end, and `offset`
+        must be a multiple of mmap.ALLOCATIONGRANULARITY."""
+        access = _mmap.ACCESS_WRITE if self.writable else _mmap.ACCESS_READ
+        with open(self._path, "r+b" if self.writable else "rb") as file:
+            return _mmap.mmap(file.fileno(), length, access=access, offset=offset)
+
+    def as_array(self, dtype, shape=None, offset=0, order="C"):
+        """returns a numpy.memmap view of the contents of the file,
+        so that they can be sliced without being read as a whole.
+
+        dtype, shape, offset, order: as in numpy.memmap.
+
+        the array is read-only unless the file is in the WRITE mode. in
+        the WRITE mode, a file that does not exist yet is created with `shape`
+        (its domain directory must exist; see DataRoot.ensure()).
+
+        requires NumPy.
+        """
+        try:
+            import numpy as _np
+        except ImportError:
+            raise ImportError("dope.datafile.DataFile.as_array() requires NumPy")
+        if not self.writable:
+            mode = "r"
+        elif self._backend.exists(self._path):
+            mode = "r+"
+        elif shape is None:
+            raise ValueError(f"'shape' is required to create a data file: {self._path}")
+        else:
+            mode = "w+"
+        return _np.memmap(self._path, dtype=dtype, mode=mode,
+                          shape=shape, offset=offset, order=order)
+
     @property
     def dataset(self):
         from ..dataset import Dataset
-        return Dataset(self._spec.as_dataset())
+        return Dataset(self._spec.as_dataset(), catalog=self._catalog, backend=self._backend)
 
     @property
-    def subject(path):
+    def subject(self):
         from ..subject import Subject
-        return Subject(self._spec.as_subject())
+        return Subject(self._spec.as_subject(), catalog=self._catalog, backend=self._backend)
 
     @property
-    def session(path):
+    def session(self):
         from ..session import Session
-        return Session(self._spec.as_session())
+        return Session(self._spec.as_session(), catalog=self._catalog, backend=self._backend)
 
     @property
-    def domain(path):
+    def domain(self):
         from ..domain import Domain
-        return Domain(self._spec.as_domain())
+        return Domain(self._spec.as_domain(), catalog=self._catalog, backend=self._backend)
@@ -0,0 +1,115 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""usage: python -m dope.datafile.tests"""
+
+import unittest
+import shutil
+try:
+    import numpy
+except ImportError:
+    numpy = None
+from . import *
+from .. import modes, testing
+from ..dataroot import DataRoot
+
+class DataFileTests(unittest.TestCase):
+    def setUp(self):
+        self._root = testing.populate(testing.test_dataroot_path())
+
+    def test_parse_spec_from_path(self):
+        path = self._root / testing.SAMPLE_FILES[0]
+        spec = parse_spec_from_path(path)
+        self.assertEqual(spec.level, spec.FILE)
+        self.assertEqual(spec.dataset, "ds1")
+        self.assertEqual(spec.session_name, "session2019-01-01-001")
+        self.assertEqual(spec.run, 1)
+        self.assertEqual(spec.channel, ("Green",))
+        self.assertEqual(spec.path, path)
+        with self.assertRaises(ValueError):
+            parse_spec_from_path(self._root / testing.SAMPLE_FILES[2])
+        with self.assertRaises(ValueError): # not in the corresponding directory
+            parse_spec_from_path(self._root / "ds1/K2" / testing.SAMPLE_FILES[0][7:])
+
+    def test_files(self):
+        domain = DataRoot(self._root)["ds1"]["K1"]["session2019-01-01-001"]["img"]
+        self.assertEqual([file.path for file in domain.files],
+                         [self._root / file for file in testing.SAMPLE_FILES[:2]])
+        self.assertEqual(DataFile(self._root / testing.SAMPLE_FILES[1]).path,
+                         (self._root / testing.SAMPLE_FILES[1]).resolve())
+
+    def test_partial_names(self):
+        # the names that do not specify a single file are not data files
+        session = "ds1/K1/session2019-01-01-001"
+        names   = ("K1_session2019-01-01-001_img_run00003.tif",
+                   "K1_session2019-01-01-001_img_Green.tif",
+                   "K1_session2019-01-01-001_img.tif",
+                   "K1_session2019-01-01-001_img_run00003_Green")
+        testing.populate(self._root, files=[f"{session}/img/{name}" for name in names],
+                         directories=())
+        for name in names:
+            with self.assertRaises(ValueError):
+                parse_spec_from_name(name)
+            self.assertFalse(DataFile.is_valid_path(self._root / session / "img" / name))
+        root = DataRoot(self._root)
+        domain  = root["ds1"]["K1"]["session2019-01-01-001"]["img"]
+        self.assertEqual([file.path for file in domain.files],
+                         [self._root / file for file in testing.SAMPLE_FILES[:2]])
+        self.assertEqual(len(tuple(root.walk())), 5)
+        self.assertEqual(root.select(domain="img", level="file").count(), 2)
+
+    def test_mmap(self):
+        path = self._root / testing.SAMPLE_FILES[0]
+        path.write_bytes(bytes(range(16)))
+        with DataFile(path).open_mmap() as view:
+            self.assertEqual(view[4:8], bytes(range(4, 8)))
+            with self.assertRaises(TypeError):
+                view[0] = 1
+        with DataFile(path, mode=modes.WRITE).open_mmap() as view:
+            view[0] = 255
+        self.assertEqual(path.read_bytes()[0], 255)
+
+    @unittest.skipIf(numpy is None, "requires NumPy")
+    def test_as_array(self):
+        path = self._root / testing.SAMPLE_FILES[1]
+        file = DataFile(path, mode=modes.WRITE)
+        path.unlink()
+        data = file.as_array("uint16", shape=(4, 8))
+        data[:] = numpy.arange(32).reshape((4, 8))
+        data.flush()
+        del data
+        view = DataFile(path).as_array("uint16", shape=(4, 8))
+        self.assertEqual(view[2, 3], 19)
+        self.assertFalse(view.flags.writeable)
+        self.assertEqual(DataFile(path).as_array("uint16", offset=16).shape, (24,))
+        path.unlink()
+        with self.assertRaises(ValueError):
+            file.as_array("uint16")
+
+    def tearDown(self):
+        if self._root.exists():
+            shutil.rmtree(self._root)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -28,9 +28,22 @@ from .. import modes as _modes
 from ..predicate import Predicate as _Predicate
 from ..core import Container as _Container
 from ..core import Selector as _Selector
+from ..backends import LOCAL as _LOCAL
+from .. import instrumentation as _instrumentation
+from ..catalog import Catalog as _Catalog
+from ..manifest import Manifest as _Manifest
+from .. import scanning as _scanning
+from ..selection import Selection as _Selection
+from .. import creation as _creation
+from ..creation import DirectoryCreator as _DirectoryCreator
+from .. import tables as _tables
+from .. import summary as _summary
+from .. import diff as _diff
 
 class DataRoot(_Container):
     """a container class representing the data root directory."""
+    __slots__ = ("_creator",)
+    LEVEL     = _Predicate.ROOT
 
     @classmethod
     def is_valid_path(cls, path):
@@ -43,11 +56,15 @@ class DataRoot(_Container):
         raise NotImplementedError(f"cannot use compute_path() for DataRoot")
 
     @classmethod
-    def from_parent(cls, parentspec, name):
+    def from_parent(cls, parentspec, name, catalog=None):
         raise NotImplementedError(f"cannot use from_parent() for DataRoot")
 
-    def __init__(self, spec, mode=_modes.READ):
-        """spec: pathlike or Predicate"""
+    @_instrumentation.timed("init", level=_Predicate.ROOT)
+    def __init__(self, spec, mode=_modes.READ, catalog=None, backend=None):
+        """spec: pathlike or Predicate
+        catalog: None, or a Catalog (or a path to its database file)
+                 or a Manifest to answer queries from, instead of the file system.
+        backend: the file-system backend (backends.LOCAL by default)."""
         if not isinstance(spec, _Predicate):
             # assumes path-like object
             try:
@@ -57,7 +74,13 @@ class DataRoot(_Container):
             spec = _Predicate(mode=mode, root=root)
         # isinstance(spec, Predicate) == True
         self._spec = spec
-        if (self._spec.mode == _modes.READ) and (not self._spec.root.exists()):
+        self._path = spec.root
+        self._backend = _LOCAL if backend is None else backend
+        if (catalog is not None) and (not isinstance(catalog, (_Catalog, _Manifest))):
+            catalog = _Catalog(catalog, backend=self._backend)
+        self._catalog = catalog
+        self._creator = _DirectoryCreator(self._backend)
+        if (self._spec.mode == _modes.READ) and (not self._exists()):
             raise FileNotFoundError(f"data-root does not exist: {self._spec.root}")
 
     @property
@@ -67,7 +90,161 @@ class DataRoot(_Container):
     @property
     def datasets(self):
         from ..dataset import Dataset
-        return _Selector(self._spec, Dataset)
+        return _Selector(self._spec, Dataset, catalog=self._catalog, path=self._path,
+                         backend=self._backend)
 
     def __getitem__(self, key):
         return self.datasets[key]
+
+    def walk(self, level=_Predicate.FILE, paths=False):
+        """generates a Predicate for every valid entry at `level`
+        (i.e. one per data file by default) in a single pass.
+
+        the directories are read with os.scandir(), and no
+        additional stat calls are made per entry. if this data-root
+        answers from a catalog, the catalog is queried instead.
+
+        with `paths=True`, (Predicate, path) is generated instead, where `path`
+        is the path of the entry as it was found. it may differ from the path
+        of the Predicate, which is formatted from its fields
+        (e.g. 'session2019-01-05-1' vs 'session2019-01-05-001').
+        """
+        if self._catalog is not None:
+            return self._catalog.query(level, mode=self._spec.mode, paths=paths)
+        return _scanning.walk(self._spec.root, level=level, mode=self._spec.mode,
+                              backend=self._backend, paths=paths)
+
+    def scan(self, level=_Predicate.FILE, workers=8, ordered=False, paths=False):
+        """generates a Predicate for every valid entry at `level`
+        (i.e. one per data file by default), listing directories
+        concurrently in a pool of `workers` threads.
+
+        the Predicates are generated as the listings complete, unless
+        `ordered` is True; in the latter case, they are generated in the
+        same order as walk() once the scan completes. `paths` works as in walk().
+        if this data-root answers from a catalog, the catalog is queried instead.
+        """
+        if self._catalog is not None:
+            return self._catalog.query(level, mode=self._spec.mode, paths=paths)
+        return _scanning.scan(self._spec.root, level=level, mode=self._spec.mode,
+                              workers=workers, ordered=ordered, backend=self._backend,
+                              paths=paths)
+
+    def select(self, predicate=None, level=None, **specs):
+        """returns a lazily evaluated Selection of the containers
+        that match `predicate` (or a Predicate made of `specs`), e.g.:
+
+            root.select(subject=["M1", "M2"], session_type="training", domain="video")
+
+        each field may be a single value, a collection of values, or a callable.
+        `level` defaults to the most specific level of the predicate.
+        """
+        if predicate is None:
+            predicate = _Predicate(mode=self._spec.mode, **specs)
+        elif len(specs) > 0:
+            predicate = predicate.with_values(**specs)
+        return _Selection(self._spec.root, predicate, level=level,
+                          mode=self._spec.mode, catalog=self._catalog, backend=self._backend)
+
+    async def aselect(self, predicate=None, level=None, executor=None, limit=16, **specs):
+        """the asynchronous counterpart of select(): returns the list of
+        the matching containers, sorted by their paths.
+
+        up to `limit` directories are listed concurrently in `executor`
+        (the default executor of the event loop if None).
+        to process the containers as soon as they are found, use
+        `async for container in root.select(...)` instead."""
+        selection = self.select(predicate, level=level, **specs)
+        found     = [container async for container in selection.aiter(executor=executor, limit=limit)]
+        return sorted(found, key=lambda container: container.path)
+
+    def ensure(self, target=None):
+        """creates the directory of `target` (and its parents) if it does not
+        exist, and returns the number of the directories that were created.
+
+        target: a Predicate or a container, or None for the data-root itself.
+                for a data file, its domain directory is created.
+
+        the directories that are known to exist are remembered, so that
+        they are not checked again (use `forget_directories()` if they
+        may have been removed since). raises ValueError in the READ mode."""
+        return self.create_many((self._spec,) if target is None else (target,))
+
+    def create_many(self, targets):
+        """creates the directories of all the `targets` (Predicates or containers)
+        at once, and returns the number of the directories that were created.
+
+        each directory is created only once, and the parent directories
+        are created along with the deepest ones (see `ensure()`)."""
+        paths = []
+        for target in targets:
+            spec = target if isinstance(target, _Predicate) else target._spec
+            if spec.root is None:
+                spec = spec.with_values(root=self._spec.root)
+            paths.append(_creation.directory_of(spec))
+        return self._creator.ensure_many(paths)
+
+    def forget_directories(self):
+        """discards the directories that ensure() remembers to exist."""
+        self._creator.forget()
+
+    def build_index(self, path=None):
+        """scans the whole data-root once into an on-disk catalog.
+
+        path: the database file to write to; defaults to
+              `Catalog.FILENAME` under the data-root. the file is always
+              written to the local file system, so that it has to be given
+              if the data-root is read through another backend.
+
+        returns another DataRoot that answers from the new catalog.
+        """
+        catalog = _Catalog.build(self._spec.root, path, backend=self._backend)
+        return self.__class__(self._spec, catalog=catalog, backend=self._backend)
+
+    def save_manifest(self, path):
+        """scans the whole data-root once into a compact binary manifest
+        at `path` (see dope.manifest), and returns the Manifest.
+
+        the manifest can be loaded quickly afterwards through `from_manifest()`."""
+        return _Manifest.build(self._spec.root, path, backend=self._backend)
+
+    @classmethod
+    def from_manifest(cls, path, mode=_modes.READ, backend=None):
+        """returns a DataRoot that answers from the manifest at `path`
+        (saved by `save_manifest()`), without scanning the data-root again.
+
+        the manifest is read-only: the changes in the data-root after it
+        was saved are not reflected until a new one is saved."""
+        manifest = _Manifest(path)
+        return cls(manifest.root, mode=mode, catalog=manifest, backend=backend)
+
+    def diff(self, since):
+        """generates the Changes (see dope.diff) from the snapshot `since`
+        (a Manifest, a Catalog, another DataRoot, or a path to a manifest
+        file or a data-root) to this data-root, e.g.:
+
+            for change in root.diff("yesterday.manifest"):
+                if change.kind != change.REMOVED:
+                    replicate(change.path)
+
+        this data-root is compared through its catalog (or manifest) if any,
+        and is scanned otherwise."""
+        return _diff.compare(since, self, backend=self._backend)
+
+    def refresh_index(self):
+        """updates the catalog that this data-root answers from,
+        listing again only the directories that changed since the catalog
+        was built (see `Catalog.refresh()`).
+
+        returns the RefreshStats of the update."""
+        if self._catalog is None:
+            raise ValueError("this data-root does not have a catalog: use build_index() first")
+        return self._catalog.refresh()
+
+    def to_table(self, format="numpy"):
+        """returns the table of the data files in this data-root (see dope.tables.table_of())."""
+        return _tables.table_of(self, format=format)
+
+    def summarize(self, by=("subject", "session_type"), path=None):
+        """returns the Summary of this data-root (see dope.summary.summarize())."""
+        return _summary.summarize(self, by, path=path)
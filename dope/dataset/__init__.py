@@ -21,16 +21,22 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 #
-import pathlib as _pathlib
 
 from .. import modes as _modes
 from ..predicate import Predicate as _Predicate
 from ..core import Container as _Container
 from ..core import Selector as _Selector
+from ..backends import LOCAL as _LOCAL
+from .. import instrumentation as _instrumentation
 from ..subject import Subject as _Subject
+from .. import tables as _tables
+from .. import summary as _summary
 
 class Dataset(_Container):
     """a container class representing a dataset directory."""
+    __slots__ = ()
+    LEVEL     = _Predicate.DATASET
+
     @classmethod
     def is_valid_path(cls, path):
         """returns if the specified file path
@@ -42,16 +48,26 @@ class Dataset(_Container):
         return parentpath / key
 
     @classmethod
-    def from_parent(cls, parentspec, name):
-        return cls(parentspec.with_values(dataset=name))
+    @_instrumentation.timed("derive", level=_Predicate.DATASET)
+    def from_parent(cls, parentspec, name, catalog=None, parentpath=None, backend=None):
+        if not isinstance(name, str):
+            raise ValueError(f"unexpected key type: {name.__class__}")
+        path = None if parentpath is None else parentpath / name
+        return cls(parentspec.child(parentspec.DATASET, name),
+                   catalog=catalog, path=path, backend=backend)
 
-    def __init__(self, spec, mode=None):
+    @_instrumentation.timed("init", level=_Predicate.DATASET)
+    def __init__(self, spec, mode=None, catalog=None, path=None, backend=None):
         """`spec` may be a path-like object or a Predicate.
-        by default, dope.modes.READ is selected for `mode`."""
+        by default, dope.modes.READ is selected for `mode`.
+        `path` may be given if the path of `spec` is already known
+        (e.g. when derived from the path of the parent).
+        `backend` is the file-system backend (backends.LOCAL by default)."""
+        backend = _LOCAL if backend is None else backend
         if not isinstance(spec, _Predicate):
             # assumes path-like object
             try:
-                path = _pathlib.Path(spec).resolve()
+                path = backend.resolve(spec)
             except TypeError:
                 raise ValueError(f"Dataset can only be initialized by a path-like object or a Predicate, not {spec.__class__}")
             if mode is None:
@@ -64,14 +80,17 @@ class Dataset(_Container):
             if level in (spec.NA, spec.ROOT):
                 raise ValueError(f"cannot specify a dataset from the predicate level: '{level}'")
             elif level != spec.DATASET:
+                path = None
                 spec = spec.with_values(mode=mode, root=spec.root,
                                         dataset=spec.dataset, clear=True)
             elif spec.mode != mode:
                 spec = spec.with_values(mode=mode)
 
         self._spec = spec
-        self._path = spec.path
-        if (self._spec.mode == _modes.READ) and (not self._path.exists()):
+        self._path = spec.path if path is None else path
+        self._catalog = catalog
+        self._backend = backend
+        if (self._spec.mode == _modes.READ) and (not self._exists()):
             raise FileNotFoundError(f"dataset directory does not exist: {self._path}")
 
     @property
@@ -80,7 +99,16 @@ class Dataset(_Container):
 
     @property
     def subjects(self):
-        return _Selector(self._spec, _Subject)
+        return _Selector(self._spec, _Subject, catalog=self._catalog, path=self._path,
+                         backend=self._backend)
 
     def __getitem__(self, key):
         return self.subjects[key]
+
+    def to_table(self, format="numpy"):
+        """returns the table of the data files in this dataset (see dope.tables.table_of())."""
+        return _tables.table_of(self, format=format)
+
+    def summarize(self, by=("subject", "session_type"), path=None):
+        """returns the Summary of this dataset (see dope.summary.summarize())."""
+        return _summary.summarize(self, by, path=path)
@@ -0,0 +1,132 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+"""differences between two snapshots of a data-root.
+
+    for change in compare("yesterday.manifest", "path/to/root"):
+        print(change.kind, change.level, change.path)
+
+a snapshot may be a Manifest, a Catalog, a DataRoot, or a path to a manifest
+file or to a data-root directory (which is scanned then). every snapshot is
+read as a stream of records in the depth-first order sorted by names, and
+the two streams are merged in a single pass, so that the comparison takes
+linear time and constant memory (except for a Catalog, whose rows are
+sorted in memory first).
+
+the datasets, subjects, sessions, domains and data files are reported
+when they are added or removed (i.e. the entries below an added or removed
+directory are reported as well), and the data files are reported as modified
+when their size or mtime has changed.
+"""
+
+import collections as _collections
+import pathlib as _pathlib
+
+from ..core import DataLevels as _DataLevels
+from .. import scanning as _scanning
+from .. import catalog as _catalog
+from ..catalog import Catalog as _Catalog
+from ..manifest import Manifest as _Manifest
+from ..backends import LOCAL as _LOCAL
+
+class Change(_collections.namedtuple("_Change", ("kind", "level", "path", "old", "new"))):
+    """a change of an entry between two snapshots.
+
+    `path` is relative to the data-root and separated with '/', and
+    `old` and `new` are the (size, mtime) of the data file in the snapshots
+    (None if it is absent, and always None for the directories)."""
+    __slots__ = ()
+    ADDED     = "added"
+    REMOVED   = "removed"
+    MODIFIED  = "modified"
+
+def scan_records(root, backend=None):
+    """generates (parts, level, size, mtime) by scanning the data-root `root`.
+    the directories are not stat'ed, and their size and mtime are None."""
+    root = str(root)
+    for found in _scanning.iter_entries(root, backend=backend):
+        parent = _catalog.relative_parent(root, found.direntry.path)
+        parts  = (tuple(parent.split("/")) if parent else ()) + (found.direntry.name,)
+        if found.level == _DataLevels.FILE:
+            st = found.direntry.stat()
+            yield parts, found.level, st.st_size, st.st_mtime
+        else:
+            yield parts, found.level, None, None
+
+def catalog_records(catalog):
+    """returns the list of (parts, level, size, mtime) of the entries in `catalog`."""
+    records = []
+    for level in _scanning.LEVELS:
+        for parent, name, size, mtime in catalog.rows(("parent", "name", "size", "mtime"), level=level):
+            parts = (tuple(parent.split("/")) if parent else ()) + (name,)
+            records.append((parts, level, size, mtime))
+    records.sort(key=lambda record: record[0])
+    return records
+
+def records_of(snapshot, backend=None):
+    """returns the records of `snapshot` (see the module documentation)
+    in the depth-first order sorted by names."""
+    from ..dataroot import DataRoot
+    if isinstance(snapshot, _Manifest):
+        return snapshot.records()
+    elif isinstance(snapshot, _Catalog):
+        return catalog_records(snapshot)
+    elif isinstance(snapshot, DataRoot):
+        if snapshot.catalog is not None:
+            return records_of(snapshot.catalog)
+        return scan_records(snapshot.path, backend=snapshot.backend)
+    path = _pathlib.Path(snapshot)
+    if (_LOCAL if backend is None else backend).is_dir(path):
+        return scan_records(path, backend=backend)
+    return _Manifest(path).records()
+
+def state_of(record):
+    """returns the (size, mtime) of a data file, or None for a directory."""
+    return record[2:] if record[1] == _DataLevels.FILE else None
+
+def compare(old, new, backend=None):
+    """generates the Changes from the snapshot `old` to the snapshot `new`,
+    in the order of their paths. `backend` is used to scan
+    the snapshots that are given as paths to data-roots."""
+    olds = iter(records_of(old, backend=backend))
+    news = iter(records_of(new, backend=backend))
+    before, after = next(olds, None), next(news, None)
+    while (before is not None) or (after is not None):
+        if (after is None) or ((before is not None) and (before[0] < after[0])):
+            yield Change(Change.REMOVED, before[1], "/".join(before[0]), state_of(before), None)
+            before = next(olds, None)
+        elif (before is None) or (after[0] < before[0]):
+            yield Change(Change.ADDED, after[1], "/".join(after[0]), None, state_of(after))
+            after = next(news, None)
+        else:
+            if state_of(before) != state_of(after):
+                yield Change(Change.MODIFIED, after[1], "/".join(after[0]),
+                             state_of(before), state_of(after))
+            before, after = next(olds, None), next(news, None)
+
+def tally(changes):
+    """returns the number of `changes` as {kind: {level: count}}."""
+    counts = _collections.defaultdict(_collections.Counter)
+    for change in changes:
+        counts[change.kind][change.level] += 1
+    return dict((kind, dict(levels)) for kind, levels in counts.items())
@@ -0,0 +1,98 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""usage: python -m dope.diff.tests"""
+
+import unittest
+import shutil
+from . import *
+from .. import testing
+from ..catalog import Catalog
+from ..manifest import Manifest
+from ..backends import MemoryBackend
+from ..dataroot import DataRoot
+
+NEWFILE = "ds1/K2/session2019-01-04-001/img/K2_session2019-01-04-001_img_run00001_Green.tif"
+
+class DiffTests(unittest.TestCase):
+    def setUp(self):
+        self._root     = testing.populate(testing.test_dataroot_path()).resolve()
+        self._manifest = self._root.with_name(self._root.name + ".manifest")
+        self._dbpath   = self._root.with_name(self._root.name + ".sqlite3")
+
+    def modify(self):
+        testing.populate(self._root, files=(NEWFILE,), directories=())
+        shutil.rmtree(self._root / "ds1/K1/training2019-01-02-001")
+        (self._root / testing.SAMPLE_FILES[0]).write_bytes(b"0123")
+
+    def test_compare(self):
+        root = DataRoot(self._root)
+        root.save_manifest(self._manifest)
+        self.assertEqual(list(root.diff(self._manifest)), [])
+        self.modify()
+        changes = list(root.diff(self._manifest))
+        self.assertEqual([(change.kind, change.path) for change in changes], [
+            (Change.MODIFIED, testing.SAMPLE_FILES[0]),
+            (Change.REMOVED,  "ds1/K1/training2019-01-02-001"),
+            (Change.REMOVED,  "ds1/K1/training2019-01-02-001/video"),
+            (Change.REMOVED,  testing.SAMPLE_FILES[4]),
+            (Change.ADDED,    "ds1/K2/session2019-01-04-001"),
+            (Change.ADDED,    "ds1/K2/session2019-01-04-001/img"),
+            (Change.ADDED,    NEWFILE),
+        ])
+        self.assertEqual(changes[0].old[0], 0)
+        self.assertEqual(changes[0].new[0], 4)
+        self.assertEqual(changes[-1].old, None)
+        self.assertEqual(tally(changes), {
+            Change.MODIFIED: {"file": 1},
+            Change.REMOVED:  {"session": 1, "domain": 1, "file": 1},
+            Change.ADDED:    {"session": 1, "domain": 1, "file": 1},
+        })
+        # the snapshots of the same tree give the same result
+        with Catalog.build(self._root, self._dbpath) as catalog:
+            self.assertEqual(list(compare(self._manifest, catalog)), changes)
+        self.assertEqual(list(compare(self._manifest, self._root)), changes)
+        reverse = list(compare(self._root, self._manifest))
+        self.assertEqual([change.kind for change in reverse if change.kind != Change.MODIFIED],
+                         [Change.ADDED] * 3 + [Change.REMOVED] * 3)
+
+    def test_memory(self):
+        backend = MemoryBackend()
+        testing.build_tree("/data", backend=backend, subjects=2, sessions=2, trials=3)
+        root = DataRoot("/data", backend=backend)
+        root.save_manifest(self._manifest)
+        backend.remove("/data/dataset01/K0002")
+        changes = list(root.diff(Manifest(self._manifest)))
+        self.assertEqual(tally(changes), {Change.REMOVED: {"subject": 1, "session": 2,
+                                                           "domain": 4, "file": 12}})
+
+    def tearDown(self):
+        if self._root.exists():
+            shutil.rmtree(self._root)
+        for path in (self._manifest, self._dbpath):
+            if path.exists():
+                path.unlink()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -22,16 +22,20 @@
 # SOFTWARE.
 #
 
-import pathlib as _pathlib
-
 from .. import modes as _modes
 from ..predicate import Predicate as _Predicate
 from ..core import Container as _Container
 from ..core import Selector as _Selector
+from ..backends import LOCAL as _LOCAL
+from .. import instrumentation as _instrumentation
+from ..sessionspec import SessionSpec as _SessionSpec
 from ..datafile import DataFile as _DataFile
 
 class Domain(_Container):
     """a container class representing a domain directory."""
+    __slots__ = ()
+    LEVEL     = _Predicate.DOMAIN
+
     @classmethod
     def is_valid_path(cls, path):
         """returns if the specified file path
@@ -39,16 +43,26 @@ class Domain(_Container):
         return (not path.name.startswith(".")) and (path.is_dir())
 
     @classmethod
-    def from_parent(cls, parentspec, key):
-        return cls(parentspec.with_values(domain=key))
+    @_instrumentation.timed("derive", level=_Predicate.DOMAIN)
+    def from_parent(cls, parentspec, key, catalog=None, parentpath=None, backend=None):
+        if not isinstance(key, str):
+            raise ValueError(f"unexpected key type: {key.__class__}")
+        path = None if parentpath is None else parentpath / key
+        return cls(parentspec.child(parentspec.DOMAIN, key),
+                   catalog=catalog, path=path, backend=backend)
 
-    def __init__(self, spec, mode=None):
+    @_instrumentation.timed("init", level=_Predicate.DOMAIN)
+    def __init__(self, spec, mode=None, catalog=None, path=None, backend=None):
         """`spec` may be a path-like object or a Predicate.
-        by default, dope.modes.READ is selected for `mode`."""
+        by default, dope.modes.READ is selected for `mode`.
+        `path` may be given if the path of `spec` is already known
+        (e.g. when derived from the path of the parent).
+        `backend` is the file-system backend (backends.LOCAL by default)."""
+        backend = _LOCAL if backend is None else backend
         if not isinstance(spec, _Predicate):
             # assumes path-like object
             try:
-                path = _pathlib.Path(spec).resolve()
+                path = backend.resolve(spec)
             except TypeError:
                 raise ValueError(f"Subject can only be initialized by a path-like object or a Predicate, not {spec.__class__}")
             sessdir = path.parent
@@ -59,7 +73,7 @@ class Domain(_Container):
                               root=rootdir,
                               dataset=dsdir.name,
                               subject=subdir.name,
-                              sessionspec=_SessionSpec(sessdir.name),
+                              session=_SessionSpec(sessdir.name),
                               domain=path.name)
         else:
             # validate and (if needed) modify the Predicate
@@ -68,19 +82,22 @@ class Domain(_Container):
             if level in (spec.NA, spec.ROOT, spec.DATASET, spec.SUBJECT, spec.SESSION):
                 raise ValueError(f"cannot specify a session from the predicate level: '{level}'")
             elif level != spec.DOMAIN:
+                path = None
                 spec = spec.with_values(mode=mode,
                                         root=spec.root,
                                         dataset=spec.dataset,
                                         subject=spec.subject,
-                                        sessionspec=spec.sessionspec,
+                                        session=spec.session,
                                         domain=spec.domain,
                                         clear=True)
             elif spec.mode != mode:
                 spec = spec.with_values(mode=mode)
 
         self._spec = spec
-        self._path = spec.path
-        if (self._spec.mode == _modes.READ) and (not self._path.exists()):
+        self._path = spec.path if path is None else path
+        self._catalog = catalog
+        self._backend = backend
+        if (self._spec.mode == _modes.READ) and (not self._exists()):
             raise FileNotFoundError(f"domain directory does not exist: {self._path}")
 
     @property
@@ -90,21 +107,22 @@ class Domain(_Container):
     @property
     def dataset(self):
         from ..dataset import Dataset
-        return Dataset(self._spec.as_dataset())
+        return Dataset(self._spec.as_dataset(), catalog=self._catalog, backend=self._backend)
 
     @property
-    def subject(path):
+    def subject(self):
         from ..subject import Subject
-        return Subject(self._spec.as_subject())
+        return Subject(self._spec.as_subject(), catalog=self._catalog, backend=self._backend)
 
     @property
-    def session(path):
+    def session(self):
         from ..session import Session
-        return Session(self._spec.as_session())
+        return Session(self._spec.as_session(), catalog=self._catalog, backend=self._backend)
 
     @property
     def files(self):
-        return _Selector(self._spec, _DataFile)
+        return _Selector(self._spec, _DataFile, catalog=self._catalog, path=self._path,
+                         backend=self._backend)
 
     def __getitem__(self, key):
         return self.files[key]
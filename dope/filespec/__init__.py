@@ -23,10 +23,12 @@
 #
 import collections as _collections
 from ..core import SelectionStatus as _SelectionStatus
+from ..core import iterable as _iterable
 
 class FileSpec(_collections.namedtuple("_FileSpec",
                 ("suffix", "trial", "run", "channel")), _SelectionStatus):
-    DIGITS = 5
+    __slots__ = ()
+    DIGITS    = 5
 
     def __new__(cls, suffix=None, trial=None, run=None, channel=None):
         return super(cls, FileSpec).__new__(cls, suffix=suffix, trial=trial, run=run, channel=channel)
@@ -40,25 +42,38 @@ class FileSpec(_collections.namedtuple("_FileSpec",
         return self.compute_status(None)
 
     def compute_status(self, context=None):
-        # TODO
-        if context is None:
-            unspecified = (((self.trial is None) and (self.run is None)),
-                           self.channel is None,
-                           self.suffix is None)
-            if all(unspecified):
-                return self.UNSPECIFIED
-            elif any(callable(fld) for fld in self):
-                return self.DYNAMIC
-            elif any(unspecified):
-                return self.MULTIPLE
-            else:
-                return self.SINGLE
+        # TODO: take `context` (Predicate) into account
+        unspecified = (((self.trial is None) and (self.run is None)),
+                       self.channel is None,
+                       self.suffix is None)
+        if all(unspecified):
+            return self.UNSPECIFIED
+        elif any(map(callable, self)):
+            return self.DYNAMIC
+        elif any(unspecified) or any(self.is_choice(fld) for fld in self._fields):
+            return self.MULTIPLE
         else:
-            raise NotImplementedError("FileSpec.compute_status()")
+            return self.SINGLE
+
+    def is_choice(self, field):
+        """returns if `field` specifies a collection of alternative values.
+        note that a tuple of `channel` names represents a single
+        multi-channel file (use a list or a set for alternatives)."""
+        value = getattr(self, field)
+        if field == "channel":
+            return isinstance(value, (list, set, frozenset))
+        return isinstance(value, (list, tuple, set, frozenset))
+
+    def is_empty(self):
+        """returns if no field is specified
+        (i.e. a cheaper equivalent of `status == UNSPECIFIED`)."""
+        return (self.suffix is None) and (self.trial is None) and \
+               (self.run is None) and (self.channel is None)
 
     def compute_path(self, context):
         """context: Predicate"""
-        return context.compute_domain_path() / self.format_name(context)
+        return context.root.joinpath(context.dataset, context.subject, context.session.name,
+                                     context.domain, self.format_name(context))
 
     def format_name(self, context, digits=None):
         """context: Predicate"""
@@ -74,16 +89,16 @@ class FileSpec(_collections.namedtuple("_FileSpec",
             if self.run is None:
                 return ""
             else:
-                return "_" + str(self.run).zfill(digits)
+                return "_run" + str(self.run).zfill(digits)
         else:
-            return "_" + str(self.trial).zfill(digits)
+            return "_trial" + str(self.trial).zfill(digits)
 
     def format_channel(self, context):
         if self.channel is None:
             return ""
         elif isinstance(self.channel, str):
             return f"_{self.channel}"
-        elif iterable(self.channel):
+        elif _iterable(self.channel):
             return "_" + "-".join(self.channel)
         else:
             raise ValueError(f"cannot compute channel from: {self.channel}")
@@ -0,0 +1,236 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+"""opt-in instrumentation of the data-access layer.
+
+    with instrumentation.recording() as recorder:
+        sessions = list(subject.sessions)
+    metrics = recorder.as_dict() # e.g. {"session.init": {"count": 3, ...}, ...}
+
+while a Recorder is active, the operations below are counted, and
+their latencies are recorded in a Histogram per container level and per operation:
+
+- "init": the initialization of a container (including its existence check),
+- "derive": the derivation of a container from its parent (including "init"),
+- "list": the listing of the children by a Selector,
+- "parse": the parsing of a file name,
+- "predicate": the construction of a Predicate,
+- "fs.<name>": the file-system calls of a backend (e.g. "fs.scandir", "fs.exists").
+
+the level of an operation is that of the container (or the selector)
+that is being processed when it is called, or "na" if there is none.
+the latencies are inclusive, i.e. the "init" of a container includes its
+"fs.exists" call. the instrumented functions are replaced by their timed
+wrappers only while a Recorder is active, so that they cost nothing otherwise.
+"""
+
+import sys as _sys
+import bisect as _bisect
+import threading as _threading
+import functools as _functools
+import inspect as _inspect
+import contextlib as _contextlib
+from time import perf_counter as _perf_counter
+
+NO_LEVEL = "na" # i.e. DataLevels.NA
+
+ACTIVE = None # the Recorder in use, if any
+
+_registry  = [] # (function, wrapper) for each function decorated by timed()
+_installed = [] # (owner, name, original) for each wrapper in place
+
+_context = _threading.local() # holds the level being processed in each thread
+
+class Histogram:
+    """a histogram of latencies, with the bins bounded by powers of 2 in microseconds."""
+    BOUNDS = tuple(2 ** i for i in range(21)) # 1 us to ~1 s
+
+    __slots__ = ("count", "total", "min", "max", "bins")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min   = None
+        self.max   = None
+        self.bins  = [0] * (len(self.BOUNDS) + 1)
+
+    def add(self, seconds):
+        micros = seconds * 1e6
+        self.count += 1
+        self.total += micros
+        self.min    = micros if (self.min is None) or (micros < self.min) else self.min
+        self.max    = micros if (self.max is None) or (micros > self.max) else self.max
+        self.bins[_bisect.bisect_left(self.BOUNDS, micros)] += 1
+
+    def as_dict(self):
+        """returns the statistics (in microseconds) and the non-empty bins,
+        the latter keyed by their upper bounds (e.g. "le_16us", or "inf")."""
+        bins = {}
+        for i, count in enumerate(self.bins):
+            if count > 0:
+                bins[f"le_{self.BOUNDS[i]}us" if i < len(self.BOUNDS) else "inf"] = count
+        return dict(count=self.count, total_us=self.total,
+                    mean_us=self.total / self.count if self.count > 0 else None,
+                    min_us=self.min, max_us=self.max, bins=bins)
+
+class Recorder:
+    """records the latencies of the operations per (level, operation)."""
+
+    def __init__(self):
+        self._lock       = _threading.Lock()
+        self._histograms = {}
+
+    def record(self, level, operation, seconds):
+        key = (NO_LEVEL if level is None else level, operation)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.add(seconds)
+
+    def count(self, operation, level=None):
+        """returns the number of calls of `operation` (at `level`, or at any level)."""
+        with self._lock:
+            return sum(hist.count for (lev, op), hist in self._histograms.items() \
+                       if (op == operation) and ((level is None) or (lev == level)))
+
+    def as_dict(self):
+        """returns the histograms as a dict keyed by "<level>.<operation>"."""
+        with self._lock:
+            return dict((f"{level}.{operation}", hist.as_dict()) \
+                        for (level, operation), hist in sorted(self._histograms.items()))
+
+@_contextlib.contextmanager
+def recording(recorder=None):
+    """activates `recorder` (a new Recorder by default) during the `with` block,
+    and yields it. the recorder is shared by all the threads."""
+    global ACTIVE
+    previous = ACTIVE
+    ACTIVE   = Recorder() if recorder is None else recorder
+    if previous is None:
+        install()
+    try:
+        yield ACTIVE
+    finally:
+        ACTIVE = previous
+        if previous is None:
+            uninstall()
+
+def install():
+    """replaces the functions decorated by timed() with their timed wrappers,
+    in the modules or the classes where they are defined."""
+    for fun, wrapper in _registry:
+        owner = _sys.modules[fun.__module__]
+        *path, name = fun.__qualname__.split(".")
+        for attr in path:
+            owner = getattr(owner, attr)
+        original = vars(owner)[name]
+        if isinstance(original, (staticmethod, classmethod)):
+            replaced, defined = original.__class__(wrapper), original.__func__
+        else:
+            replaced, defined = wrapper, original
+        if defined is not fun:
+            raise RuntimeError(f"cannot instrument '{fun.__module__}.{fun.__qualname__}': "
+                               "timed() must be the innermost decorator")
+        setattr(owner, name, replaced)
+        _installed.append((owner, name, original))
+
+def uninstall():
+    """puts the original functions back in place of the timed wrappers."""
+    while _installed:
+        owner, name, original = _installed.pop()
+        setattr(owner, name, original)
+
+def current_level():
+    """returns the level being processed in this thread, or None."""
+    return getattr(_context, "level", None)
+
+def timed(operation, level=None):
+    """decorates a function so that its calls are recorded as `operation`
+    while a Recorder is active.
+
+    level: the level of the operation, or a function that returns it from
+           the first argument (e.g. `self`). by default, the operation is
+           recorded at the level that is being processed.
+
+    a generator function is timed over the whole iteration (excluding
+    the time spent by its consumer).
+
+    the function itself is returned as it is, and is replaced by its
+    wrapper only while a Recorder is active (see install()). the functions
+    that cannot be replaced (i.e. the ones defined in other functions)
+    are wrapped at once instead, and check for a Recorder on every call."""
+    def decorator(fun):
+        if _inspect.isgeneratorfunction(fun):
+            @_functools.wraps(fun)
+            def wrapper(*args, **kwargs):
+                recorder = ACTIVE
+                if recorder is None:
+                    return fun(*args, **kwargs)
+                return _timed_iteration(recorder, operation, _level_of(level, args),
+                                        fun(*args, **kwargs))
+        else:
+            @_functools.wraps(fun)
+            def wrapper(*args, **kwargs):
+                recorder = ACTIVE
+                if recorder is None:
+                    return fun(*args, **kwargs)
+                previous = current_level()
+                current  = _level_of(level, args, previous)
+                _context.level = current
+                start = _perf_counter()
+                try:
+                    return fun(*args, **kwargs)
+                finally:
+                    recorder.record(current, operation, _perf_counter() - start)
+                    _context.level = previous
+        if "<locals>" in fun.__qualname__:
+            return wrapper
+        _registry.append((fun, wrapper))
+        return fun
+    return decorator
+
+def _level_of(level, args, default=None):
+    if level is None:
+        return current_level() if default is None else default
+    elif callable(level):
+        return level(args[0])
+    return level
+
+def _timed_iteration(recorder, operation, level, iterator):
+    elapsed = 0.0
+    try:
+        while True:
+            previous, _context.level = current_level(), level
+            start = _perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += _perf_counter() - start
+                _context.level = previous
+            yield item
+    finally:
+        iterator.close()
+        recorder.record(level, operation, elapsed)
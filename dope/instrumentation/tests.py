@@ -0,0 +1,91 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""usage: python -m dope.instrumentation.tests"""
+
+import unittest
+import shutil
+from . import *
+from .. import instrumentation, testing, datafile, scanning
+from ..predicate import Predicate
+from ..datafile import DataFile
+from ..dataroot import DataRoot
+
+class InstrumentationTests(unittest.TestCase):
+    def setUp(self):
+        self._root = testing.populate(testing.test_dataroot_path())
+
+    def test_histogram(self):
+        hist = Histogram()
+        for seconds in (0.5e-6, 3e-6, 3.5e-6, 10):
+            hist.add(seconds)
+        stats = hist.as_dict()
+        self.assertEqual(stats["count"], 4)
+        self.assertEqual(stats["bins"], {"le_1us": 1, "le_4us": 2, "inf": 1})
+        self.assertAlmostEqual(stats["max_us"], 1e7)
+
+    def test_recording(self):
+        root = DataRoot(self._root)
+        with recording() as recorder:
+            self.assertIs(instrumentation.ACTIVE, recorder)
+            files = [file for sess in root["ds1"]["K1"].sessions \
+                          for dom in sess.domains for file in dom.files]
+        self.assertIsNone(instrumentation.ACTIVE)
+        self.assertEqual(len(files), 4)
+        self.assertEqual(recorder.count("init", level="file"), 4)
+        self.assertEqual(recorder.count("parse", level="file"), 5 + 4) # when listed and derived
+        self.assertEqual(recorder.count("fs.exists", level="file"), 4)
+        self.assertEqual(recorder.count("fs.scandir", level="file"), 3) # one per domain
+        self.assertEqual(recorder.count("list", level="session"), 1)
+        metrics = recorder.as_dict()
+        self.assertEqual(metrics["domain.init"]["count"], 3)
+        self.assertEqual(sum(metrics["domain.init"]["bins"].values()), 3)
+
+        self.assertEqual(recorder.count("init", level="dataset"), 1)
+        root["ds1"] # not recorded any more
+        self.assertEqual(recorder.count("init", level="dataset"), 1)
+
+    def test_no_overhead(self):
+        # the wrappers are only in place while a Recorder is active
+        originals = (vars(Predicate)["__new__"].__func__, Predicate.child, DataFile.__init__,
+                     vars(DataFile)["from_parent"].__func__, datafile.parse_spec_from_name)
+        self.assertFalse(any(hasattr(fun, "__wrapped__") for fun in originals))
+        with recording() as recorder:
+            self.assertIs(Predicate.child.__wrapped__, originals[1])
+            self.assertIs(datafile.parse_spec_from_name.__wrapped__, originals[4])
+            with recording(): # nested
+                pass
+            self.assertTrue(hasattr(Predicate.child, "__wrapped__"))
+            tuple(scanning.walk(self._root))
+        self.assertEqual((vars(Predicate)["__new__"].__func__, Predicate.child, DataFile.__init__,
+                          vars(DataFile)["from_parent"].__func__, datafile.parse_spec_from_name),
+                         originals)
+        self.assertEqual(recorder.count("parse"), 6) # incl. notes.txt
+
+    def tearDown(self):
+        if self._root.exists():
+            shutil.rmtree(self._root)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,390 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+"""a compact, read-only binary snapshot (manifest) of a data-root.
+
+a manifest is written once by scanning the data-root, and can be loaded
+within milliseconds afterwards. it answers the same questions as a
+Catalog does (listing the children of containers, checking their existence,
+and querying the entries), so that it can be used as the `catalog` of
+the containers, e.g.:
+
+    DataRoot("path/to/root").save_manifest("root.manifest")
+    root = DataRoot.from_manifest("root.manifest") # does not scan the data-root
+
+the file consists of a header, a table of the strings (the names and the values
+of the fields) separated by NUL, and the packed arrays of the entries
+(one element per entry, as listed in `ARRAYS`). the entries are stored
+in the breadth-first order sorted by names, so that the children of
+each entry, as well as the entries at each level, are contiguous.
+"""
+
+import os as _os
+import sys as _sys
+import struct as _struct
+import array as _array
+import bisect as _bisect
+import pathlib as _pathlib
+import datetime as _datetime
+
+from .. import modes as _modes
+from .. import parsing as _parsing
+from ..core import DataLevels as _DataLevels
+from ..sessionspec import SessionSpec as _SessionSpec
+from ..filespec import FileSpec as _FileSpec
+from ..predicate import Predicate as _Predicate
+from ..backends import LOCAL as _LOCAL
+from .. import scanning as _scanning
+from .. import catalog as _catalog
+
+MAGIC   = b"DOPEMANI"
+VERSION = 1
+
+# magic, version, byte order (0: little, 1: big), the number of entries,
+# and the size of the string table in bytes
+HEADER = _struct.Struct("<8sBBxxII")
+
+LEVELS = (_DataLevels.ROOT,) + _scanning.LEVELS
+
+# the packed arrays and their typecodes. the missing values are -1,
+# and the strings are stored as their indices in the string table
+ARRAYS = (
+    ("level",         "b"), # the index in `LEVELS`
+    ("parent",        "i"), # the index of the parent entry
+    ("first",         "i"), # the index of the first child
+    ("count",         "i"), # the number of the children
+    ("name",          "i"),
+    ("dataset",       "i"),
+    ("subject",       "i"),
+    ("session_type",  "i"),
+    ("session_date",  "i"), # the proleptic Gregorian ordinal
+    ("session_index", "i"),
+    ("domain",        "i"),
+    ("trial",         "i"),
+    ("run",           "i"),
+    ("channel",       "i"), # formatted as in the catalog
+    ("suffix",        "i"),
+    ("size",          "q"),
+    ("mtime",         "d"),
+)
+
+STRING_FIELDS = ("name", "dataset", "subject", "session_type", "domain", "channel", "suffix")
+
+def date_ordinal(date):
+    return -1 if date is None else date.toordinal()
+
+def entry_key(level, dataset, subject, session, domain, file):
+    """returns the key that identifies an entry among its siblings."""
+    if level == _DataLevels.SESSION:
+        return (session.type, date_ordinal(session.date), session.index)
+    elif level == _DataLevels.FILE:
+        return (file.trial, file.run, _catalog.format_channel(file.channel), file.suffix)
+    else:
+        return {_DataLevels.DATASET: dataset,
+                _DataLevels.SUBJECT: subject,
+                _DataLevels.DOMAIN:  domain}[level]
+
+def write(root, path, backend=None):
+    """scans the data-root `root` and writes its manifest to `path`."""
+    backend = _LOCAL if backend is None else backend
+    root    = str(root)
+    strings = {root: 0}
+    def string_id(value):
+        if value is None:
+            return -1
+        return strings.setdefault(value, len(strings))
+    arrays = dict((name, _array.array(code)) for name, code in ARRAYS)
+    append = tuple(arrays[name].append for name, _ in ARRAYS)
+
+    def add(entry, parent, st):
+        session, file = entry.session, entry.file
+        name = root if entry.direntry is None else entry.direntry.name
+        for put, value in zip(append, (
+                LEVELS.index(entry.level), parent, -1, 0, string_id(name),
+                string_id(entry.dataset), string_id(entry.subject),
+                string_id(session.type), date_ordinal(session.date),
+                -1 if session.index is None else session.index,
+                string_id(entry.domain),
+                -1 if file.trial is None else file.trial,
+                -1 if file.run is None else file.run,
+                string_id(_catalog.format_channel(file.channel)), string_id(file.suffix),
+                st.st_size if entry.level == _DataLevels.FILE else -1, st.st_mtime)):
+            put(value)
+
+    # breadth-first, so that the children of an entry (and the entries
+    # at each level) are stored contiguously
+    add(_scanning.ROOT_ENTRY, -1, backend.stat(root))
+    queue = [(_scanning.ROOT_ENTRY, root, 0)]
+    for entry, dirpath, index in queue:
+        children = _scanning.list_children(entry, dirpath, backend=backend)
+        arrays["first"][index] = len(arrays["level"])
+        arrays["count"][index] = len(children)
+        for child in children:
+            if child.level != _DataLevels.FILE:
+                queue.append((child, child.direntry.path, len(arrays["level"])))
+            add(child, index, child.direntry.stat())
+
+    table  = "\0".join(strings.keys()).encode("utf-8")
+    header = HEADER.pack(MAGIC, VERSION, 0 if _sys.byteorder == "little" else 1,
+                         len(arrays["level"]), len(table))
+    path    = _pathlib.Path(path)
+    tmppath = path.with_name(path.name + ".tmp")
+    with open(tmppath, "wb") as out:
+        out.write(header)
+        out.write(table)
+        for name, _ in ARRAYS:
+            arrays[name].tofile(out)
+    _os.replace(tmppath, path)
+
+class Manifest(_DataLevels):
+    """a read-only binary snapshot of a data-root, which can be used
+    as the catalog of the containers.
+
+    use `Manifest.build()` (or `DataRoot.save_manifest()`) to create one,
+    and `Manifest(path)` to load an existing one.
+    """
+
+    @classmethod
+    def build(cls, root, path, backend=None):
+        """scans `root` and writes its manifest to `path`.
+        any existing file at `path` is replaced."""
+        backend = _LOCAL if backend is None else backend
+        root    = backend.resolve(root)
+        if not backend.is_dir(root):
+            raise FileNotFoundError(f"data-root does not exist: {root}")
+        write(root, path, backend=backend)
+        return cls(path)
+
+    def __init__(self, path):
+        path = _pathlib.Path(path)
+        with open(path, "rb") as src:
+            data = src.read()
+        if (len(data) < HEADER.size) or (data[:len(MAGIC)] != MAGIC):
+            raise ValueError(f"not a manifest file: {path}")
+        _, version, order, size, nbytes = HEADER.unpack_from(data)
+        if version != VERSION:
+            raise ValueError(f"unsupported manifest version: {version}")
+        offset = HEADER.size
+        self._strings = data[offset:offset+nbytes].decode("utf-8").split("\0")
+        offset += nbytes
+        swap = (order == 0) != (_sys.byteorder == "little")
+        for name, code in ARRAYS:
+            values = _array.array(code)
+            length = size * values.itemsize
+            values.frombytes(data[offset:offset+length])
+            if swap:
+                values.byteswap()
+            setattr(self, "_" + name, values)
+            offset += length
+        if offset != len(data):
+            raise ValueError(f"truncated or corrupt manifest: {path}")
+        self._path    = path
+        self._root    = _pathlib.Path(self._strings[0])
+        self._lookups = {} # {parent index: {key: child index}}, made on demand
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({str(self._path)!r})"
+
+    def __len__(self):
+        """the number of the entries (including the data-root)."""
+        return len(self._level)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """does nothing: the manifest is held in memory once loaded."""
+        pass
+
+    @property
+    def path(self):
+        """the path to the manifest file."""
+        return self._path
+
+    @property
+    def root(self):
+        """the (resolved) path to the data-root that was scanned."""
+        return self._root
+
+    def refresh(self):
+        raise ValueError("a manifest is read-only: save a new one with DataRoot.save_manifest()")
+
+    def children(self, spec):
+        """returns the sorted names of the entries directly under
+        the container specified by the Predicate `spec`."""
+        level = spec.level
+        if level not in _catalog.CHILD_LEVELS.keys():
+            raise ValueError(f"cannot list children at the predicate level: '{level}'")
+        index = self._find(spec)
+        if index is None:
+            return []
+        first = self._first[index]
+        return [self._strings[name] for name in self._name[first:first+self._count[index]]]
+
+    def contains(self, spec):
+        """returns if the manifest has an entry corresponding to the Predicate `spec`."""
+        return self._find(spec) is not None
+
+    def count(self, level=_DataLevels.FILE, **conditions):
+        """returns the number of entries at `level` that match `conditions`
+        (see `Catalog.query()` for the format)."""
+        return sum(1 for _ in self._select(level, conditions))
+
+    def query(self, level=_DataLevels.FILE, mode=_modes.READ, paths=False, **conditions):
+        """generates Predicates (or (Predicate, path) with `paths=True`) for the entries
+        at `level` that match `conditions` (see `Catalog.query()` for the format),
+        in the order of their paths."""
+        for index in self._select(level, conditions):
+            if paths:
+                parent = self._value(index, "parent")
+                name   = self._strings[self._name[index]]
+                yield self._predicate(index, mode), \
+                      self._root.joinpath(*parent.split("/"), name) if parent else self._root / name
+            else:
+                yield self._predicate(index, mode)
+
+    def rows(self, columns=_catalog.COLUMNS, level=_DataLevels.FILE, **conditions):
+        """returns the list of the rows (tuples of `columns`) for the entries at
+        `level` that match `conditions`, in the same form as `Catalog.rows()`."""
+        for col in columns:
+            if col not in _catalog.COLUMNS:
+                raise ValueError(f"unknown catalog column: '{col}'")
+        return [tuple(self._value(index, col) for col in columns) \
+                for index in self._select(level, conditions)]
+
+    def records(self):
+        """generates (parts, level, size, mtime) for every entry below the data-root,
+        in the depth-first order sorted by names (i.e. in the order of `parts`,
+        the tuple of the names from the dataset down to the entry).
+        `size` is None for the directories."""
+        strings, names, first, count = self._strings, self._name, self._first, self._count
+        stack = [(index, ()) for index in reversed(range(first[0], first[0] + count[0]))]
+        while len(stack) > 0:
+            index, parents = stack.pop()
+            parts = parents + (strings[names[index]],)
+            level = LEVELS[self._level[index]]
+            size  = self._size[index]
+            yield parts, level, (None if size < 0 else size), self._mtime[index]
+            if count[index] > 0:
+                stack.extend((child, parts) for child in \
+                             reversed(range(first[index], first[index] + count[index])))
+
+    def _range(self, level):
+        """returns the range of the indices of the entries at `level`."""
+        code = LEVELS.index(level)
+        return range(_bisect.bisect_left(self._level, code), _bisect.bisect_right(self._level, code))
+
+    def _key(self, index):
+        level = LEVELS[self._level[index]]
+        if level == _DataLevels.SESSION:
+            return (self._strings[self._session_type[index]],
+                    self._session_date[index], self._session_index[index])
+        elif level == _DataLevels.FILE:
+            return tuple(self._value(index, col) for col in ("trial", "run", "channel", "suffix"))
+        return self._strings[self._name[index]]
+
+    def _child(self, index, key):
+        lookup = self._lookups.get(index)
+        if lookup is None:
+            first  = self._first[index]
+            lookup = dict((self._key(child), child) \
+                          for child in range(first, first + self._count[index]))
+            self._lookups[index] = lookup
+        return lookup.get(key)
+
+    def _find(self, spec):
+        """returns the index of the entry corresponding to `spec`, or None."""
+        level = spec.level
+        if level == self.NA:
+            return None
+        index = 0
+        if level == self.ROOT:
+            return index
+        for lev in _scanning.LEVELS[:_scanning.depth_of(level)]:
+            try:
+                index = self._child(index, entry_key(lev, spec.dataset, spec.subject,
+                                                     spec.session, spec.domain, spec.file))
+            except TypeError: # unhashable, i.e. not a single entry
+                return None
+            if index is None:
+                return None
+        return index
+
+    def _value(self, index, col):
+        """returns the value of `col` of the entry, in the form stored in the catalog."""
+        if col == "level":
+            return LEVELS[self._level[index]]
+        elif col == "parent":
+            names  = []
+            parent = self._parent[index]
+            while parent > 0:
+                names.append(self._strings[self._name[parent]])
+                parent = self._parent[parent]
+            return "/".join(reversed(names))
+        value = getattr(self, "_" + col)[index]
+        if col in STRING_FIELDS:
+            return None if value < 0 else self._strings[value]
+        elif col == "session_date":
+            return None if value < 0 else \
+                   _datetime.date.fromordinal(value).strftime(_parsing.session.DATE_FORMAT)
+        elif col in ("size", "session_index", "trial", "run"):
+            return None if value < 0 else value
+        return value
+
+    def _select(self, level, conditions):
+        """generates the indices of the entries at `level` that match `conditions`."""
+        allowed = []
+        for col, value in conditions.items():
+            if col not in _catalog.COLUMNS[3:]:
+                raise ValueError(f"unknown catalog column: '{col}'")
+            if not isinstance(value, (list, tuple, set)):
+                value = (value,)
+            if col == "session_date":
+                value = [_catalog.format_date(v) for v in value]
+            elif col == "channel":
+                value = [_catalog.format_channel(v) for v in value]
+            allowed.append((col, frozenset(value)))
+        for index in self._range(level):
+            if all(self._value(index, col) in values for col, values in allowed):
+                yield index
+
+    def _predicate(self, index, mode):
+        value = self._value
+        stype = value(index, "session_type")
+        if stype is None:
+            session = _SessionSpec()
+        else:
+            date    = _datetime.date.fromordinal(self._session_date[index])
+            session = _SessionSpec(type=stype, date=_datetime.datetime(date.year, date.month, date.day),
+                                   index=self._session_index[index])
+        channel = value(index, "channel")
+        if channel is not None:
+            channel = tuple(channel.split("-"))
+        return _Predicate(mode=mode, root=self._root,
+                          dataset=value(index, "dataset"), subject=value(index, "subject"),
+                          session=session, domain=value(index, "domain"),
+                          file=_FileSpec(suffix=value(index, "suffix"), trial=value(index, "trial"),
+                                         run=value(index, "run"), channel=channel))
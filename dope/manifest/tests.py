@@ -0,0 +1,118 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""usage: python -m dope.manifest.tests"""
+
+import unittest
+import shutil
+from . import *
+from .. import testing
+from ..catalog import Catalog
+from ..backends import MemoryBackend
+from ..dataroot import DataRoot
+
+class ManifestTests(unittest.TestCase):
+    def setUp(self):
+        self._root     = testing.populate(testing.test_dataroot_path()).resolve()
+        self._manifest = self._root.with_name(self._root.name + ".manifest")
+        self._dbpath   = self._root.with_name(self._root.name + ".sqlite3")
+
+    def test_selectors(self):
+        DataRoot(self._root).save_manifest(self._manifest)
+        shutil.rmtree(self._root) # should not be referred to any more
+        root = DataRoot.from_manifest(self._manifest)
+        self.assertEqual([ds.path.name for ds in root.datasets], ["ds1", "ds2"])
+        self.assertEqual([sub.path.name for sub in root["ds1"].subjects], ["K1", "K2"])
+        sub = root["ds1"]["K1"]
+        self.assertEqual([sess.path.name for sess in sub.sessions],
+                         ["session2019-01-01-001", "training2019-01-02-001"])
+        self.assertEqual([sess.path.name for sess in sub.sessions.on("2019-01-02")],
+                         ["training2019-01-02-001"])
+        sess = sub["session2019-01-01-001"]
+        self.assertEqual([dom.path.name for dom in sess.domains], ["img", "video"])
+        self.assertEqual([file.path.name for file in sess["img"].files],
+                         ["K1_session2019-01-01-001_img_run00001_Green.tif",
+                          "K1_session2019-01-01-001_img_run00002_Green.tif"])
+        self.assertEqual(len(root["ds2"].subjects), 0)
+        with self.assertRaises(FileNotFoundError):
+            root["ds1"]["K3"]
+        with self.assertRaises(FileNotFoundError):
+            sub["session2019-01-01-002"]
+        with self.assertRaises(FileNotFoundError):
+            sess["img"]["K1_session2019-01-01-001_img_run00003_Green.tif"]
+        with self.assertRaises(ValueError):
+            root.refresh_index()
+
+    def test_catalog(self):
+        manifest = Manifest.build(self._root, self._manifest)
+        self.assertEqual(len(manifest), 17) # the data-root and 16 entries below
+        with Catalog.build(self._root, self._dbpath) as catalog:
+            for level in (Catalog.DATASET, Catalog.SESSION, Catalog.DOMAIN, Catalog.FILE):
+                self.assertEqual(list(manifest.query(level)), list(catalog.query(level)))
+                self.assertEqual(manifest.rows(level=level), catalog.rows(level=level))
+            for conditions in (dict(session_type="training", domain="video"),
+                               dict(subject=["K1", "K2"], run=2),
+                               dict(session_date="2019-01-01", channel="Green")):
+                self.assertEqual(list(manifest.query(**conditions)), list(catalog.query(**conditions)))
+                self.assertEqual(manifest.count(**conditions), catalog.count(**conditions))
+            with self.assertRaises(ValueError):
+                manifest.count(unknown=1)
+
+    def test_select(self):
+        root    = DataRoot(self._root)
+        loaded  = DataRoot.from_manifest(root.save_manifest(self._manifest).path)
+        for specs in (dict(subject="K1", domain="img"), dict(session_type="training")):
+            self.assertEqual([item.path for item in loaded.select(**specs)],
+                             [item.path for item in root.select(**specs)])
+        self.assertEqual(list(loaded.walk()), list(root.walk()))
+        self.assertEqual(list(loaded.walk(paths=True)), list(root.walk(paths=True)))
+        self.assertEqual(loaded.to_table(format="dict"), root.to_table(format="dict"))
+
+    def test_memory(self):
+        backend = MemoryBackend()
+        testing.build_tree("/data", backend=backend, size=16, subjects=3, trials=4)
+        root    = DataRoot("/data", backend=backend)
+        Manifest.build("/data", self._manifest, backend=backend)
+        loaded  = DataRoot.from_manifest(self._manifest)
+        self.assertEqual(list(loaded.walk()), list(root.walk()))
+        self.assertEqual(loaded.summarize(), root.summarize())
+
+    def test_invalid(self):
+        self._manifest.write_bytes(b"not a manifest")
+        with self.assertRaises(ValueError):
+            Manifest(self._manifest)
+        data = Manifest.build(self._root, self._manifest).path.read_bytes()
+        self._manifest.write_bytes(data[:-4])
+        with self.assertRaises(ValueError):
+            Manifest(self._manifest)
+
+    def tearDown(self):
+        if self._root.exists():
+            shutil.rmtree(self._root)
+        for path in (self._manifest, self._dbpath):
+            if path.exists():
+                path.unlink()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -23,7 +23,9 @@
 #
 """parsing file/directory names."""
 import re as _re
+import sys as _sys
 import datetime as _datetime
+import functools as _functools
 from collections import namedtuple as _namedtuple
 
 SEP          = "_"
@@ -34,6 +36,8 @@ class ParseError(ValueError):
         super().__init__(msg)
 
 class Parse(ParseResult):
+    __slots__ = ()
+
     def __new__(cls, line=None, result=None, remaining=None):
         if line is not None:
             return super().__new__(cls, {}, line)
@@ -94,21 +98,28 @@ class session(element):
     NAME_PATTERN = _re.compile(r"([a-zA-Z0-9-]*[a-zA-Z])(\d{4})-(\d{2})-(\d{2})-(\d+)")
     TYPE_PATTERN = _re.compile(r"[a-zA-Z0-9-]*[a-zA-Z]$")
     DATE_FORMAT  = "%Y-%m-%d"
+    CACHE_SIZE   = 4096 # the number of session names to memoize
 
     @classmethod
     def parse(cls, fmt):
         if not isinstance(fmt, str):
             raise ValueError(f"session name expected to be a string, but got {fmt.__class__}")
-        matched = cls.NAME_PATTERN.match(fmt)
-        if not matched:
-            raise ParseError(f"does not match to session-name pattern: {fmt}")
-        result = dict(type=matched.group(1),
-                      date=_datetime.datetime.strptime(f"{matched.group(2)}-{matched.group(3)}-{matched.group(4)}",
-                                                       cls.DATE_FORMAT),
-                      index=int(matched.group(5)))
-        remaining = cls.format_remaining(fmt[len(matched.group(0)):])
+        stype, date, index, length = decode_session_name(fmt)
+        result    = dict(type=stype, date=date, index=index)
+        remaining = cls.format_remaining(fmt[length:])
         return ParseResult(result, remaining)
 
+    @classmethod
+    def decode_date(cls, datefmt):
+        """decodes a date string in DATE_FORMAT (i.e. 'YYYY-MM-DD')
+        from its fixed-width fields, falling back to strptime()
+        for strings of other layouts."""
+        if (len(datefmt) == 10) and (datefmt[4] == "-") and (datefmt[7] == "-") \
+            and datefmt[:4].isdigit() and datefmt[5:7].isdigit() and datefmt[8:].isdigit() \
+            and datefmt.isascii():
+            return _datetime.datetime(int(datefmt[:4]), int(datefmt[5:7]), int(datefmt[8:]))
+        return _datetime.datetime.strptime(datefmt, cls.DATE_FORMAT)
+
     @classmethod
     def name(cls, namefmt):
         return session.parse(namefmt).result
@@ -130,8 +141,8 @@ class session(element):
         elif isinstance(datefmt, _datetime.datetime):
             return datefmt
         try:
-            return _datetime.datetime.strptime(datefmt, session.DATE_FORMAT)
-        except ValueError as e:
+            return session.decode_date(datefmt)
+        except (TypeError, ValueError) as e:
             raise ParseError(f"failed to parse session date: '{datefmt}' ({e})")
 
     @classmethod
@@ -146,6 +157,21 @@ class session(element):
             raise ValueError(f"session index cannot be negative, but got '{index}'")
         return index
 
+@_functools.lru_cache(maxsize=session.CACHE_SIZE)
+def decode_session_name(fmt):
+    """returns (type, date, index, length) from the session name at the start of `fmt`,
+    where `length` is the number of characters consumed.
+    the results are memoized for the recently used strings."""
+    matched = session.NAME_PATTERN.match(fmt)
+    if not matched:
+        raise ParseError(f"does not match to session-name pattern: {fmt}")
+    stype, year, month, day, index = matched.groups()
+    try:
+        date = _datetime.datetime(int(year), int(month), int(day))
+    except ValueError as e:
+        raise ParseError(f"failed to parse session date in: '{fmt}' ({e})")
+    return stype, date, int(index), matched.end()
+
 class domain(element):
     pass
 
@@ -205,3 +231,120 @@ class filespec(element):
         res["channel"] = tuple(channels) if len(channels) > 0 else None
         res["suffix"]  = chan.remaining
         return ParseResult(res, "")
+
+class filename(element):
+    """parses a whole file name (i.e. `subject_session_domain_(runN|trialN)_channels.suffix`)
+    with a single, precompiled regular expression.
+
+    only the names that specify a single file are accepted: either a run or
+    a trial, the channels and the suffix must be present (as in the names
+    formatted by FileSpec.format_name()), so that the resulting FileSpec
+    always points back to the same name."""
+    NAME_PATTERN = _re.compile(r"(?P<subject>[a-zA-Z0-9-]+)_"
+                               r"(?P<type>[a-zA-Z0-9-]*[a-zA-Z])"
+                               r"(?P<year>\d{4})-(?P<month>\d{2})-(?P<day>\d{2})-(?P<index>\d+)_"
+                               r"(?P<domain>[a-zA-Z0-9-]+)"
+                               r"_(?:run(?P<run>\d+)|trial(?P<trial>\d+))"
+                               r"_(?P<channel>[a-zA-Z0-9]+(?:-[a-zA-Z0-9]+)*)"
+                               r"(?P<suffix>\..*)$")
+
+    @classmethod
+    def parse(cls, fmt):
+        if not isinstance(fmt, str):
+            raise ValueError(f"file name expected to be a string, but got {fmt.__class__}")
+        matched = cls.NAME_PATTERN.match(fmt)
+        if not matched:
+            raise ParseError(f"does not match to file-name pattern: {fmt}")
+        subject, stype, year, month, day, sindex, domain, run, trial, channel, suffix = matched.groups()
+        try:
+            date = _datetime.datetime(int(year), int(month), int(day))
+        except ValueError as e:
+            raise ParseError(f"failed to parse session date in: '{fmt}' ({e})")
+        result = dict(subject=subject,
+                      session=dict(type=stype, date=date, index=int(sindex)),
+                      domain=domain,
+                      filespec=dict(suffix=_sys.intern(suffix),
+                                    trial=int(trial) if trial is not None else None,
+                                    run=int(run) if run is not None else None,
+                                    channel=split_channels(channel)))
+        return ParseResult(result, None)
+
+@_functools.lru_cache(maxsize=1024)
+def split_channels(fmt):
+    """returns the tuple of channel names in `fmt` (e.g. 'Green-Red').
+    the tuples are memoized, so that files of the same channels share one."""
+    return tuple(_sys.intern(chan) for chan in fmt.split(filespec.CHAN_SEP))
+
+BatchResult = _namedtuple("BatchResult", ("columns", "categories", "valid"))
+
+BATCH_LAYOUTS = {
+    # kind: (pattern, column for each group of the pattern)
+    "session": (session.NAME_PATTERN,
+                ("session_type", "year", "month", "day", "session_index")),
+    "file":    (filename.NAME_PATTERN,
+                ("subject", "session_type", "year", "month", "day", "session_index",
+                 "domain", "run", "trial", "channel", "suffix")),
+}
+
+CATEGORICAL_COLUMNS = ("subject", "session_type", "domain", "channel", "suffix")
+
+def parse_many(names, kind="file"):
+    """parses a sequence of session names (`kind="session"`) or
+    file names (`kind="file"`) into columnar NumPy arrays.
+
+    returns BatchResult(columns, categories, valid), where:
+
+    - `columns` maps each field to an array: `session_date` is datetime64[D]
+      (NaT if invalid), integer fields are int64 (-1 if missing or invalid),
+      and the other (string) fields are int32 codes (-1 if missing or invalid).
+    - `categories` maps each coded field to the tuple of its labels,
+      i.e. code `i` stands for `categories[field][i]`.
+      multiple channels are labeled as they appear in the name, e.g. "Green-Red".
+    - `valid` is a boolean mask of the names that were parsed successfully.
+
+    requires NumPy.
+    """
+    try:
+        import numpy as _np
+    except ImportError:
+        raise ImportError("dope.parsing.parse_many() requires NumPy")
+    if kind not in BATCH_LAYOUTS.keys():
+        raise ValueError(f"unknown kind of names: '{kind}'")
+    pattern, fields = BATCH_LAYOUTS[kind]
+    empty = (None,) * len(fields)
+    rows  = []
+    for name in names:
+        matched = pattern.fullmatch(name) if isinstance(name, str) else None
+        rows.append(empty if matched is None else matched.groups())
+    size   = len(rows)
+    values = dict(zip(fields, zip(*rows))) if size > 0 else dict((fld, ()) for fld in fields)
+    valid  = _np.fromiter((row is not empty for row in rows), dtype=bool, count=size)
+
+    columns    = dict()
+    categories = dict()
+    for fld in fields:
+        if fld in ("year", "month", "day"):
+            continue
+        elif fld in CATEGORICAL_COLUMNS:
+            labels = dict()
+            codes  = [-1 if value is None else labels.setdefault(value, len(labels)) \
+                      for value in values[fld]]
+            columns[fld]    = _np.array(codes, dtype=_np.int32)
+            categories[fld] = tuple(labels.keys())
+        else:
+            columns[fld] = _np.array([-1 if value is None else int(value) for value in values[fld]],
+                                     dtype=_np.int64)
+
+    # decode the dates in a vectorized manner, and invalidate the impossible ones
+    years, months, days = (_np.array([0 if value is None else int(value) for value in values[fld]],
+                                     dtype=_np.int64) for fld in ("year", "month", "day"))
+    monthly = ((years - 1970) * 12 + (months - 1)).astype("datetime64[M]")
+    dates   = monthly.astype("datetime64[D]") + (days - 1).astype("timedelta64[D]")
+    valid  &= (months >= 1) & (months <= 12) & (days >= 1) & \
+              (dates.astype("datetime64[M]") == monthly)
+    dates[~valid] = _np.datetime64("NaT")
+    columns["session_date"] = dates
+    for fld, column in columns.items():
+        if fld != "session_date":
+            column[~valid] = -1
+    return BatchResult(columns, categories, valid)
@@ -25,8 +25,14 @@
 """usage: python -m dope.parsing.tests"""
 
 import unittest
+import datetime
 from . import *
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 class ParsingTests(unittest.TestCase):
     def assert_function_with_values(self, fun,
                             passes=[],
@@ -49,6 +55,24 @@ class ParsingTests(unittest.TestCase):
             passes=("2019-02-26", datetime.datetime.now(), None),
             fails=("2019.02.26", "26-02-2019", "2019-26-02"))
 
+    def test_decode_date(self):
+        self.assertEqual(session.decode_date("2019-02-26"), datetime.datetime(2019, 2, 26))
+        self.assertEqual(session.decode_date("2019-2-6"), datetime.datetime(2019, 2, 6))
+        for fails in ("2019-02-30", "2019-0a-26", "2019/02/26"):
+            with self.assertRaises(ValueError):
+                session.decode_date(fails)
+
+    def test_name_cache(self):
+        decode_session_name.cache_clear()
+        for _ in range(3):
+            session.name("session2016-01-25-001")
+        info = decode_session_name.cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 1))
+        self.assertLessEqual(info.maxsize, session.CACHE_SIZE)
+        result = session.name("session2016-01-25-001")
+        result["index"] = 2 # must not affect the cache
+        self.assertEqual(session.name("session2016-01-25-001")["index"], 1)
+
     def test_parse_index(self):
         self.assert_function_with_values(session.index,
             passes=(1, "1", "001", None),
@@ -90,5 +114,52 @@ class ParsingTests(unittest.TestCase):
         self.assertEqual(ps.result["filespec"]["run"],    run)
         self.assertEqual(set(ps.result["filespec"]["channel"]), set(chans))
 
+    def test_filename(self):
+        name = "K1_ane2019-11-12-001_img_run001_Green-Red.tif"
+        res  = filename.parse(name).result
+        self.assertEqual(res["subject"], "K1")
+        self.assertEqual(res["session"]["type"], "ane")
+        self.assertEqual(res["session"]["date"].strftime(session.DATE_FORMAT), "2019-11-12")
+        self.assertEqual(res["session"]["index"], 1)
+        self.assertEqual(res["domain"], "img")
+        self.assertEqual(res["filespec"], dict(suffix=".tif", trial=None, run=1,
+                                               channel=("Green", "Red")))
+        res  = filename.parse("K1_ane2019-11-12-001_img_trial00002_Left.npy").result
+        self.assertEqual(res["filespec"], dict(suffix=".npy", trial=2, run=None,
+                                               channel=("Left",)))
+        self.assert_function_with_values(filename.parse,
+            passes=("K1_ane2019-11-12-1_img_run1_Green.tif",),
+            fails=(None, "K1_ane2019-13-12-001_img_run001_Green.tif", "K1_img_run001_Green.tif",
+                   "K1_ane2019-11-12-001_img_run001_Green Red.tif",
+                   # names that do not specify a single file
+                   "K1_ane2019-11-12-001_img.npy", "K1_ane2019-11-12-001_img_run001.tif",
+                   "K1_ane2019-11-12-001_img_Green.tif", "K1_ane2019-11-12-001_img_trial001_Left",
+                   "K1_ane2019-11-12-001_img_run001_trial002_Left.npy"))
+
+    @unittest.skipIf(numpy is None, "requires NumPy")
+    def test_parse_many(self):
+        res = parse_many(["session2016-01-25-001", "no-task2015-12-31-003",
+                          "session2016-02-30-001", "session2016-01-25", None],
+                         kind="session")
+        self.assertEqual(res.valid.tolist(), [True, True, False, False, False])
+        self.assertEqual(res.categories["session_type"], ("session", "no-task"))
+        self.assertEqual(res.columns["session_type"].tolist(), [0, 1, -1, -1, -1])
+        self.assertEqual(res.columns["session_index"].tolist(), [1, 3, -1, -1, -1])
+        self.assertEqual(res.columns["session_date"][:2].tolist(),
+                         [datetime.date(2016, 1, 25), datetime.date(2015, 12, 31)])
+        self.assertTrue(numpy.isnat(res.columns["session_date"][2:]).all())
+
+        res = parse_many(["K1_ane2019-11-12-001_img_run001_Green-Red.tif",
+                          "K2_ane2019-11-13-002_img_trial00002_Green.tif",
+                          "notes.txt"])
+        self.assertEqual(res.valid.tolist(), [True, True, False])
+        self.assertEqual(res.columns["run"].tolist(), [1, -1, -1])
+        self.assertEqual(res.columns["trial"].tolist(), [-1, 2, -1])
+        self.assertEqual(res.categories["channel"], ("Green-Red", "Green"))
+        self.assertEqual(res.columns["suffix"].tolist(), [0, 0, -1])
+        self.assertEqual(len(parse_many([]).valid), 0)
+        with self.assertRaises(ValueError):
+            parse_many([], kind="domain")
+
 if __name__ == "__main__":
     unittest.main()
@@ -22,14 +22,18 @@
 # SOFTWARE.
 #
 
+import sys as _sys
+import functools as _functools
 import collections as _collections
 import pathlib as _pathlib
 
 from .. import modes as _modes
 from ..core import SelectionStatus as _SelectionStatus
 from ..core import DataLevels as _DataLevels
+from ..core import iterable as _iterable
 from ..sessionspec import SessionSpec as _SessionSpec
 from ..filespec import FileSpec as _FileSpec
+from .. import instrumentation as _instrumentation
 
 def compute_selection_status(spec):
     """returns the status of root/dataset/subject/domain selection."""
@@ -39,7 +43,7 @@ def compute_selection_status(spec):
         return _SelectionStatus.UNSPECIFIED
     elif callable(spec):
         return _SelectionStatus.DYNAMIC
-    elif iterable(spec):
+    elif _iterable(spec):
         size = len(spec)
         if size == 1:
             return _SelectionStatus.SINGLE
@@ -50,38 +54,55 @@ def compute_selection_status(spec):
     else:
         raise ValueError(f"unexpected specification: {spec}")
 
+# SessionSpec/FileSpec instances are immutable, and are therefore
+# shared (instead of being copied) between Predicates wherever possible
+
+NO_SESSION = _SessionSpec()
+NO_FILE    = _FileSpec()
+
 def compute_session(specs, default=None):
     if "session" in specs.keys():
-        if isinstance(specs["session"], str):
+        if isinstance(specs["session"], _SessionSpec):
+            return specs["session"]
+        elif isinstance(specs["session"], str):
             return _SessionSpec(specs["session"])
         else:
             return _SessionSpec(*specs["session"])
     else:
         if default is None:
-            default = _SessionSpec()
+            default = NO_SESSION
         sspec = dict((k.replace("session_",""), v) for k, v in specs.items() \
                      if k.startswith("session_"))
-        return default.with_values(**sspec)
+        return default.with_values(**sspec) if len(sspec) > 0 else default
 
 def compute_file(specs, default=None):
     if "file" in specs.keys():
-        if isinstance(specs["file"], str):
+        if isinstance(specs["file"], _FileSpec):
+            return specs["file"]
+        elif isinstance(specs["file"], str):
             return _FileSpec(specs["file"])
         else:
             return _FileSpec(*specs["file"])
     else:
         if default is None:
-            default = _FileSpec()
+            default = NO_FILE
         fspec = dict((k,v) for k, v in specs.items() \
                      if k in _FileSpec._fields)
-        return default.with_values(**fspec)
+        return default.with_values(**fspec) if len(fspec) > 0 else default
+
+def intern_value(value):
+    """interns `value` if it is a string, so that
+    the Predicates that refer to the same name share it."""
+    return _sys.intern(value) if type(value) is str else value
 
 class Predicate(_collections.namedtuple("_Predicate",
                 ("mode", "root", "dataset", "subject", "session",
                  "domain", "file")),
                 _SelectionStatus, _DataLevels):
     """a predicate specification to search the datasets."""
+    __slots__ = ()
 
+    @_instrumentation.timed("predicate")
     def __new__(cls, *args, **specs):
         values = dict()
         offset = 0
@@ -98,18 +119,20 @@ class Predicate(_collections.namedtuple("_Predicate",
             else:
                 values[fld] = None
         values["mode"] = _modes.verify(values["mode"])
-        if values["root"] is not None:
+        if (values["root"] is not None) and (not isinstance(values["root"], _pathlib.Path)):
             values["root"] = _pathlib.Path(values["root"])
+        for fld in ("dataset", "subject", "domain"):
+            values[fld] = intern_value(values[fld])
         return super(cls, Predicate).__new__(cls, **values)
 
     @property
     def level(self):
         """returns a string representation for the 'level' of specification."""
-        if self.file.status != _FileSpec.UNSPECIFIED:
+        if not self.file.is_empty():
             return self.FILE
         elif self.domain is not None:
             return self.DOMAIN
-        elif self.session.status != _SessionSpec.UNSPECIFIED:
+        elif not self.session.is_empty():
             return self.SESSION
         elif self.subject is not None:
             return self.SUBJECT
@@ -122,7 +145,12 @@ class Predicate(_collections.namedtuple("_Predicate",
 
     @property
     def status(self):
-        return self.compute_status()
+        """the status of specification. it is memoized
+        (see `memoized_status()`), as Predicates are immutable."""
+        try:
+            return memoized_status(self)
+        except TypeError: # unhashable, e.g. with a list of alternatives
+            return self.compute_status()
 
     @property
     def session_name(self):
@@ -158,7 +186,12 @@ class Predicate(_collections.namedtuple("_Predicate",
 
     @property
     def path(self):
-        return self.compute_path()
+        """the path that this Predicate specifies. it is memoized
+        (see `memoized_path()`), as Predicates are immutable."""
+        try:
+            return memoized_path(self)
+        except TypeError: # unhashable, e.g. with a list of alternatives
+            return self.compute_path()
 
     @property
     def dataset_path(self):
@@ -195,6 +228,31 @@ class Predicate(_collections.namedtuple("_Predicate",
                 spec[fld] = newvalues.get(fld, default)
         return self.__class__(**spec)
 
+    @_instrumentation.timed("predicate")
+    def child(self, level, value):
+        """returns the Predicate one level below, with `value` being
+        specified at `level` (one of DATASET, SUBJECT, SESSION, DOMAIN and FILE).
+
+        this is the fast path to derive the children of a container:
+        unlike with_values(), the other fields are taken over as they are,
+        without being validated again. it is the responsibility of the caller
+        that this Predicate is at the level right above `level`.
+
+        `value` must be a SessionSpec (or a session name) for SESSION,
+        a FileSpec for FILE, and a name for the other levels."""
+        if level == self.SESSION:
+            if not isinstance(value, _SessionSpec):
+                value = _SessionSpec.from_name(value)
+        elif level == self.FILE:
+            if not isinstance(value, _FileSpec):
+                raise ValueError(f"FileSpec expected for a file, got {value.__class__}")
+        elif level in (self.DATASET, self.SUBJECT, self.DOMAIN):
+            value = intern_value(value)
+        else:
+            raise ValueError(f"cannot derive a child at the level: '{level}'")
+        index = self._fields.index(level)
+        return self._make(self[:index] + (value,) + self[index+1:])
+
     def cleared(self):
         """returns another Predicate where everything (except for
         `mode` and `root`) is cleared."""
@@ -223,15 +281,16 @@ class Predicate(_collections.namedtuple("_Predicate",
                               root=self.root,
                               dataset=self.dataset,
                               subject=self.subject,
-                              session=session,
-                              domain=domain)
+                              session=self.session,
+                              domain=self.domain)
 
-    def compute_status(self):
-        """returns a string representation for the status of specification."""
-        if any(callable(item) for item in self):
+    def compute_status(self, level=None):
+        """returns a string representation for the status of specification.
+        `level` may be given in case it is already known."""
+        if any(map(callable, self)):
             return self.DYNAMIC
 
-        lev = self.level
+        lev = self.level if level is None else level
         if lev == self.NA:
             return self.UNSPECIFIED
 
@@ -276,32 +335,86 @@ class Predicate(_collections.namedtuple("_Predicate",
         it does not necessarily mean that the returned value points to an
         existing file.
 
+        the path is derived from the (memoized) path of the parent Predicate,
+        so that the siblings share the path of their parent, and each of them
+        only takes a single join.
+
         raises ValueError in case a path cannot be computed.
         """
-        level  = self.level
-        status = self.status
-        if status != self.SINGLE:
+        level = self.level
+        if level in (self.NA, self.ROOT):
+            status = self.compute_status(level)
+            if status != self.SINGLE:
+                raise ValueError(f"cannot compute a path: not specifying a single condition (status: '{status}')")
+            return self.root
+
+        parent = self.parent()
+        value  = getattr(self, level)
+        if level in (self.SESSION, self.FILE):
+            status = value.compute_status(self)
+        else:
+            status = compute_selection_status(value)
+        if (status != self.SINGLE) or (parent.level != PARENT_LEVELS[level]):
+            status = self.compute_status(level) # the first condition that is not single
             raise ValueError(f"cannot compute a path: not specifying a single condition (status: '{status}')")
 
-        if level == self.ROOT:
-            return self.root
-        elif level == self.DATASET:
-            return self.compute_dataset_path()
-        elif level == self.SUBJECT:
-            return self.compute_subject_path()
-        elif level == self.SESSION:
-            return self.session.compute_path(self)
-        elif level == self.DOMAIN:
-            return self.compute_domain_path()
+        if level == self.SESSION:
+            name = value.name
+        elif level == self.FILE:
+            name = value.format_name(self)
         else:
-            # status == FILE
-            return self.file.compute_path(self)
+            name = value
+        return parent.path / name
+
+    def parent(self):
+        """returns the Predicate one level above, i.e. with the field of
+        its level being cleared (or None at the root level)."""
+        level = self.level
+        if level not in PARENT_LEVELS.keys():
+            return None
+        index = self._fields.index(level)
+        return self._make(self[:index] + (CLEARED_VALUES[level],) + self[index+1:])
+
+    # the paths below are joined at once, instead of level by level,
+    # so that only a single Path object is created per call
 
     def compute_dataset_path(self):
-        return self.root / self.dataset
+        return self.root.joinpath(self.dataset)
 
     def compute_subject_path(self):
-        return self.compute_dataset_path() / self.subject
+        return self.root.joinpath(self.dataset, self.subject)
 
     def compute_domain_path(self):
-        return self.session.compute_path(self) / self.domain
+        return self.root.joinpath(self.dataset, self.subject,
+                                  self.session.name, self.domain)
+
+PARENT_LEVELS = {
+    Predicate.DATASET: Predicate.ROOT,
+    Predicate.SUBJECT: Predicate.DATASET,
+    Predicate.SESSION: Predicate.SUBJECT,
+    Predicate.DOMAIN:  Predicate.SESSION,
+    Predicate.FILE:    Predicate.DOMAIN,
+}
+
+CLEARED_VALUES = {
+    Predicate.DATASET: None,
+    Predicate.SUBJECT: None,
+    Predicate.SESSION: NO_SESSION,
+    Predicate.DOMAIN:  None,
+    Predicate.FILE:    NO_FILE,
+}
+
+# a Predicate cannot hold any other attributes than its fields
+# (being a tuple with `__slots__ = ()`), so its status and path
+# are memoized here, keyed by the Predicate itself
+
+@_functools.lru_cache(maxsize=4096)
+def memoized_status(spec):
+    """returns `spec.compute_status()`, memoized for the recent Predicates."""
+    return spec.compute_status()
+
+@_functools.lru_cache(maxsize=4096)
+def memoized_path(spec):
+    """returns `spec.compute_path()`, memoized for the recent Predicates.
+    the failures (ValueError) are not memoized."""
+    return spec.compute_path()
@@ -26,6 +26,7 @@
 
 import unittest
 from . import *
+from ..filespec import FileSpec
 
 class PredicateTests(unittest.TestCase):
     def test_sessionspec(self):
@@ -50,3 +51,48 @@ class PredicateTests(unittest.TestCase):
 
     def test_status(self):
         pass #TODO
+
+    def test_path(self):
+        pred = Predicate(root="testroot", dataset="testds", subject="testsub",
+                         session="session2019-03-11-001", domain="img",
+                         run=1, channel="Green", suffix=".tif")
+        self.assertEqual(pred.path.parts, ("testroot", "testds", "testsub", "session2019-03-11-001",
+                                           "img", "testsub_session2019-03-11-001_img_run00001_Green.tif"))
+        self.assertEqual(pred.domain_path, pred.path.parent)
+        self.assertEqual(pred.session_path, pred.path.parent.parent)
+        with self.assertRaises(ValueError):
+            pred.with_values(subject=["a", "b"]).path
+        # derived from the path of the parent
+        self.assertEqual(pred.parent(), pred.as_domain())
+        self.assertEqual(pred.as_domain().path, pred.path.parent)
+        self.assertIsNone(pred.as_dataset().parent().parent())
+        with self.assertRaises(ValueError): # no subject in between
+            pred.with_values(subject=None).path
+        # memoized for the equal Predicates
+        self.assertIs(pred.path, pred.with_values().path)
+        self.assertEqual(pred.status, pred.SINGLE)
+        self.assertEqual(pred.with_values(subject=["a", "b"]).status, pred.MULTIPLE)
+
+    def test_child(self):
+        pred  = Predicate(root="testroot", dataset="testds", subject="testsub")
+        child = pred.child(pred.SESSION, "session2019-03-11-001")
+        self.assertEqual(child, pred.with_values(session="session2019-03-11-001"))
+        self.assertIsInstance(child, Predicate)
+        self.assertEqual(child.level, child.SESSION)
+        child = child.child(child.DOMAIN, "img")
+        fspec = FileSpec(suffix=".tif", run=1, channel="Green")
+        self.assertEqual(child.child(child.FILE, fspec), child.with_values(file=fspec))
+        with self.assertRaises(ValueError):
+            child.child(child.FILE, "testsub_session2019-03-11-001_img_run00001_Green.tif")
+        with self.assertRaises(ValueError):
+            pred.child(pred.ROOT, "otherroot")
+
+    def test_sharing(self):
+        pred  = Predicate(root="testroot", dataset="testds", subject="testsub",
+                          session="session2019-03-11-001")
+        other = pred.with_values(domain="img")
+        self.assertFalse(hasattr(pred, "__dict__"))
+        self.assertIs(other.root, pred.root)
+        self.assertIs(other.session, pred.session)
+        self.assertIs(Predicate(session="session2019-03-11-001").session, pred.session)
+        self.assertIs(Predicate(subject="".join(("test", "sub"))).subject, pred.subject)
@@ -0,0 +1,130 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+"""reading many data files in order, while prefetching the next ones.
+
+    for file, data in prefetch(root.select(domain="img", level="file")):
+        process(data) # the next files are being read in the meantime
+"""
+
+import threading as _threading
+import collections as _collections
+import concurrent.futures as _futures
+
+from ..backends import LOCAL as _LOCAL
+
+AHEAD  = 4
+BUDGET = 256 * 1024 * 1024 # bytes
+
+def read_bytes(path, backend=None):
+    """reads the whole contents of the file at `path`
+    through `backend` (backends.LOCAL by default)."""
+    with (_LOCAL if backend is None else backend).open(path) as file:
+        return file.read()
+
+class Budget:
+    """grants the bytes of a budget to the files being read in advance,
+    in the order of the files (so that a later file never takes
+    the bytes that an earlier one is waiting for)."""
+
+    def __init__(self, budget):
+        self._budget    = budget
+        self._used      = 0
+        self._next      = 0 # the order of the file to be granted next
+        self._closed    = False
+        self._condition = _threading.Condition()
+
+    def acquire(self, order, size):
+        """waits until the file at `order` may take `size` bytes, i.e. the
+        previous files have been granted and either the bytes are left
+        or nothing is being used (for a file larger than the budget)."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._closed or \
+                ((order == self._next) and \
+                 ((self._used == 0) or (self._used + size <= self._budget))))
+            if self._closed:
+                raise _futures.CancelledError()
+            self._used += size
+            self._next += 1
+            self._condition.notify_all()
+
+    def release(self, size):
+        with self._condition:
+            self._used -= size
+            self._condition.notify_all()
+
+    def close(self):
+        """makes the waiting (and any later) acquire() calls fail."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+def prefetch(files, ahead=AHEAD, budget=BUDGET, workers=None, read=None):
+    """generates (file, data) for each DataFile in `files`, in the same order,
+    reading up to `ahead` files in advance in a pool of `workers` threads
+    (`ahead` threads by default).
+
+    budget: the maximum total size (in bytes) of the files being read in
+            advance; the next file is read only after enough of the
+            previous ones have been generated. a file that is larger than
+            `budget` is still read, but only after all the previous ones.
+    read:   the function that reads a file from its path. by default,
+            the file is read through its backend (see read_bytes()).
+
+    `files` may be any iterable, e.g. a Selection, and is consumed lazily.
+    each file is stat'ed (through its backend) and read in the worker threads.
+    """
+    if ahead < 1:
+        raise ValueError(f"'ahead' must be positive, got {ahead}")
+    granted = Budget(budget)
+
+    def _load(order, file):
+        size = file.backend.stat(file.path).st_size
+        granted.acquire(order, size)
+        try:
+            data = read_bytes(file.path, file.backend) if read is None else read(file.path)
+        except BaseException:
+            granted.release(size)
+            raise
+        return size, data
+
+    files    = iter(files)
+    queue    = _collections.deque() # (file, future) in the order of `files`
+    executor = _futures.ThreadPoolExecutor(max_workers=ahead if workers is None else workers)
+    try:
+        for order, file in enumerate(files):
+            queue.append((file, executor.submit(_load, order, file)))
+            if len(queue) < ahead:
+                continue
+            file, future = queue.popleft()
+            size, data   = future.result()
+            granted.release(size)
+            yield file, data
+        while queue:
+            file, future = queue.popleft()
+            size, data   = future.result()
+            granted.release(size)
+            yield file, data
+    finally:
+        granted.close()
+        executor.shutdown(wait=True, cancel_futures=True)
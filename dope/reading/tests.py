@@ -0,0 +1,93 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""usage: python -m dope.reading.tests"""
+
+import threading
+import unittest
+import shutil
+from . import *
+from .. import testing
+from ..backends import MemoryBackend
+from ..dataroot import DataRoot
+
+class ReadingTests(unittest.TestCase):
+    def setUp(self):
+        self._root = testing.populate(testing.test_dataroot_path())
+        for i, file in enumerate(testing.SAMPLE_FILES):
+            (self._root / file).write_bytes(bytes([i]) * (10 * (i + 1)))
+
+    def test_prefetch(self):
+        selection = DataRoot(self._root).select(level="file")
+        expected  = [(file.path, file.path.read_bytes()) for file in selection]
+        self.assertEqual([(file.path, data) for file, data in selection.read(ahead=2)], expected)
+        self.assertEqual([(file.path, data) for file, data in prefetch(selection, budget=1)],
+                         expected)
+        with self.assertRaises(ValueError):
+            DataRoot(self._root).select(level="domain").read()
+
+    def test_budget(self):
+        lock, active, peak = threading.Lock(), [0], [0]
+        def read(path):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            return path
+        def consume(**options):
+            active[0], peak[0] = 0, 0
+            for file, data in prefetch(DataRoot(self._root).select(level="file"), read=read, **options):
+                with lock:
+                    active[0] -= 1
+            return peak[0]
+        self.assertLessEqual(consume(ahead=3), 3)
+        self.assertEqual(consume(ahead=3, budget=1), 1) # one file at a time
+        # the workers waiting for the budget are released when stopped early
+        reader = prefetch(DataRoot(self._root).select(level="file"), ahead=3, budget=1)
+        next(reader)
+        reader.close()
+
+    def test_backend(self):
+        calls = []
+        class Backend(MemoryBackend):
+            def stat(self, path):
+                calls.append(("stat", threading.current_thread()))
+                return super().stat(path)
+            def open(self, path):
+                calls.append(("open", threading.current_thread()))
+                return super().open(path)
+        backend = Backend()
+        backend.add_files("/mem", testing.SAMPLE_FILES, size=3)
+        selection = DataRoot("/mem", backend=backend).select(level="file")
+        del calls[:] # the existence checks of the containers
+        found = [(str(file.path), data) for file, data in prefetch(selection, ahead=2)]
+        self.assertEqual(found, [(str(file.path), bytes(3)) for file in selection])
+        self.assertEqual(sorted(set(name for name, thread in calls)), ["open", "stat"])
+        self.assertNotIn(threading.current_thread(), [thread for name, thread in calls])
+
+    def tearDown(self):
+        if self._root.exists():
+            shutil.rmtree(self._root)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,234 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+"""walking through a data-root with os.scandir().
+
+the walkers here only rely on the type information that comes with
+directory entries, so that enumerating the data-root does not require
+any additional stat calls.
+
+the directories are listed through a file-system backend
+(backends.LOCAL, i.e. os.scandir(), by default).
+"""
+
+import os as _os
+import pathlib as _pathlib
+import collections as _collections
+import concurrent.futures as _futures
+
+from .. import modes as _modes
+from ..backends import LOCAL as _LOCAL
+from ..core import DataLevels as _DataLevels
+from ..sessionspec import SessionSpec as _SessionSpec
+from .. import predicate as _predicate
+from ..predicate import Predicate as _Predicate
+from .. import datafile as _datafile
+
+LEVELS = (_DataLevels.DATASET,
+          _DataLevels.SUBJECT,
+          _DataLevels.SESSION,
+          _DataLevels.DOMAIN,
+          _DataLevels.FILE)
+
+NO_SESSION = _predicate.NO_SESSION
+NO_FILE    = _predicate.NO_FILE
+
+class Entry(_collections.namedtuple("_Entry",
+            ("level", "dataset", "subject", "session", "domain", "file", "direntry"))):
+    """a valid entry found in a data-root.
+    `session` and `file` are SessionSpec and FileSpec, respectively,
+    and `direntry` is the os.DirEntry that was found."""
+    __slots__ = ()
+
+    @property
+    def path(self):
+        """the path of the entry as it was found on the file system."""
+        return None if self.direntry is None else _pathlib.Path(self.direntry.path)
+
+    def as_predicate(self, root, mode=_modes.READ):
+        """returns the Predicate of the entry. note that the `path` of the
+        Predicate is formatted from its fields (e.g. with the zero-padded session
+        index), and may differ from the `path` of the entry on the file system."""
+        return _Predicate(mode=mode, root=root,
+                          dataset=self.dataset, subject=self.subject,
+                          session=self.session, domain=self.domain,
+                          file=self.file)
+
+ROOT_ENTRY = Entry(_DataLevels.ROOT, None, None, NO_SESSION, None, NO_FILE, None)
+
+def depth_of(level):
+    """returns the depth of `level` below the data-root (DATASET being 1)."""
+    try:
+        return LEVELS.index(level) + 1
+    except ValueError:
+        raise ValueError(f"not a level below the data-root: '{level}'")
+
+def parse_file_name(name):
+    """returns the FileSpec corresponding to a file name,
+    or None if it is not a valid name for a data file."""
+    try:
+        return _datafile.parse_spec_from_name(name)["file"]
+    except ValueError:
+        return None
+
+def list_entries(path, backend=None):
+    """returns the name-sorted, non-hidden entries of the directory."""
+    entries = (_LOCAL if backend is None else backend).scandir(path)
+    return sorted((entry for entry in entries if not entry.name.startswith(".")),
+                  key=lambda entry: entry.name)
+
+def child_level(level):
+    """returns the level right below `level`, or None for FILE."""
+    if level == _DataLevels.ROOT:
+        return LEVELS[0]
+    depth = depth_of(level)
+    return LEVELS[depth] if depth < len(LEVELS) else None
+
+def make_child(entry, name, direntry=None):
+    """returns the Entry named `name` right below `entry`,
+    or None if `name` is not valid at that level.
+
+    the type of the entry (directory or file) is not checked here."""
+    level = child_level(entry.level)
+    if (level is None) or name.startswith("."):
+        return None
+    elif level == _DataLevels.DATASET:
+        return Entry(level, name, None, NO_SESSION, None, NO_FILE, direntry)
+    elif level == _DataLevels.SUBJECT:
+        return Entry(level, entry.dataset, name, NO_SESSION, None, NO_FILE, direntry)
+    elif level == _DataLevels.SESSION:
+        try:
+            session = _SessionSpec.from_name(name)
+        except ValueError:
+            return None
+        return Entry(level, entry.dataset, entry.subject, session, None, NO_FILE, direntry)
+    elif level == _DataLevels.DOMAIN:
+        return Entry(level, entry.dataset, entry.subject, entry.session, name, NO_FILE, direntry)
+    else:
+        fspec = parse_file_name(name)
+        if fspec is None:
+            return None
+        return Entry(level, entry.dataset, entry.subject, entry.session, entry.domain, fspec, direntry)
+
+def list_children(entry, path, backend=None):
+    """returns the valid Entries directly under `path`,
+    which is the directory corresponding to `entry`."""
+    level = child_level(entry.level)
+    if level is None:
+        return []
+    children = []
+    for direntry in list_entries(path, backend=backend):
+        if direntry.is_dir() == (level == _DataLevels.FILE):
+            continue
+        child = make_child(entry, direntry.name, direntry)
+        if child is not None:
+            children.append(child)
+    return children
+
+def iter_entries(root, level=_DataLevels.FILE, entry=None, backend=None):
+    """generates an Entry for every valid entry from the dataset level
+    down to `level`, in the depth-first order sorted by names.
+
+    `entry` may be given to walk only below a directory `root`
+    that corresponds to the Entry (ROOT_ENTRY by default)."""
+    depth = depth_of(level)
+    def _walk(entry, path):
+        for child in list_children(entry, path, backend=backend):
+            yield child
+            if depth_of(child.level) < depth:
+                yield from _walk(child, child.direntry.path)
+    return _walk(ROOT_ENTRY if entry is None else entry, root)
+
+def iter_entries_parallel(root, level=_DataLevels.FILE, workers=8, queue_size=None,
+                          backend=None):
+    """generates an Entry for every valid entry from the dataset level
+    down to `level`, listing the directories concurrently in a thread pool.
+
+    the entries are generated as soon as their parent directories are listed,
+    i.e. in no particular order. at most `queue_size` listings
+    (4 x `workers` by default) are submitted to the pool at a time.
+
+    note that `queue_size` only bounds the listings in flight: the directories
+    that are found but not listed yet are kept in a stack without a limit.
+    as the deepest directories are listed first, the stack holds about the
+    children of the directories along the branches being listed (i.e. it grows
+    with the fan-out of the tree, rather than with the number of directories).
+    """
+    depth = depth_of(level)
+    if workers < 1:
+        raise ValueError(f"'workers' must be positive, got {workers}")
+    if queue_size is None:
+        queue_size = 4 * workers
+    pending  = [(ROOT_ENTRY, root)] # a stack, so that the deepest directories are listed first
+    running  = set()
+    executor = _futures.ThreadPoolExecutor(max_workers=workers)
+    try:
+        while pending or running:
+            while pending and (len(running) < queue_size):
+                running.add(executor.submit(list_children, *pending.pop(), backend=backend))
+            done, running = _futures.wait(running, return_when=_futures.FIRST_COMPLETED)
+            for future in done:
+                for child in future.result():
+                    yield child
+                    if depth_of(child.level) < depth:
+                        pending.append((child, child.direntry.path))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def result_of(entry, root, mode, paths):
+    """returns the Predicate of `entry`, or (Predicate, path) if `paths` is True."""
+    if paths:
+        return entry.as_predicate(root, mode=mode), entry.path
+    return entry.as_predicate(root, mode=mode)
+
+def walk(root, level=_DataLevels.FILE, mode=_modes.READ, backend=None, paths=False):
+    """generates a Predicate for every valid entry at `level`
+    (one per data file by default) under the data-root.
+
+    with `paths=True`, (Predicate, path) is generated instead, where `path`
+    is the path of the entry on the file system (see Entry.as_predicate())."""
+    for entry in iter_entries(root, level=level, backend=backend):
+        if entry.level == level:
+            yield result_of(entry, root, mode, paths)
+
+def scan(root, level=_DataLevels.FILE, mode=_modes.READ,
+         workers=8, queue_size=None, ordered=False, backend=None, paths=False):
+    """generates a Predicate for every valid entry at `level`
+    (one per data file by default) under the data-root, listing the directories
+    concurrently (see `iter_entries_parallel()`).
+
+    the Predicates are generated as they are found, unless `ordered` is True:
+    in the latter case, they are generated in the same order as `walk()`
+    after the whole scan completes. `paths` works as in `walk()`.
+    """
+    entries = (entry for entry in iter_entries_parallel(root, level=level,
+                                                        workers=workers,
+                                                        queue_size=queue_size,
+                                                        backend=backend) \
+               if entry.level == level)
+    if ordered:
+        prefix  = len(_os.path.join(str(root), ""))
+        entries = sorted(entries,
+                         key=lambda entry: entry.direntry.path[prefix:].split(_os.sep))
+    for entry in entries:
+        yield result_of(entry, root, mode, paths)
@@ -0,0 +1,89 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""usage: python -m dope.scanning.tests"""
+
+import unittest
+import shutil
+from unittest import mock
+from . import *
+from .. import testing
+from ..dataroot import DataRoot
+
+class ScanningTests(unittest.TestCase):
+    def setUp(self):
+        self._root = testing.populate(testing.test_dataroot_path())
+
+    def test_walk(self):
+        found = tuple(DataRoot(self._root).walk())
+        self.assertEqual(len(found), 5)
+        self.assertTrue(all(spec.level == spec.FILE for spec in found))
+        self.assertEqual(found[0].path,
+            self._root / "ds1/K1/session2019-01-01-001/img/K1_session2019-01-01-001_img_run00001_Green.tif")
+        self.assertEqual([spec.session_name for spec in walk(self._root, level=LEVELS[2])],
+                         ["session2019-01-01-001", "training2019-01-02-001", "training2019-01-03-001"])
+        self.assertEqual([spec.dataset for spec in walk(self._root, level=LEVELS[0])],
+                         ["ds1", "ds2"])
+        with self.assertRaises(ValueError):
+            tuple(walk(self._root, level="root"))
+
+    def test_no_stat(self):
+        with mock.patch("os.stat", side_effect=AssertionError("os.stat() called")):
+            self.assertEqual(len(tuple(walk(self._root))), 5)
+
+    def test_scan(self):
+        root = DataRoot(self._root)
+        for level in LEVELS:
+            expected = tuple(root.walk(level=level))
+            self.assertEqual(tuple(root.scan(level=level, workers=3, ordered=True)), expected)
+            self.assertEqual(set(root.scan(level=level, workers=2)), set(expected))
+        with self.assertRaises(ValueError):
+            tuple(scan(self._root, workers=0))
+
+    def test_paths(self):
+        name = "ds1/K1/session2019-01-05-1/img/K1_session2019-01-05-1_img_run1_Green.tif"
+        testing.populate(self._root, files=(name,), directories=())
+        root = DataRoot(self._root)
+        for found in (root.walk(paths=True), root.scan(workers=2, ordered=True, paths=True)):
+            specs, paths = zip(*found)
+            self.assertEqual(specs, tuple(root.walk()))
+            self.assertIn(self._root / name, paths)
+            self.assertTrue(all(path.exists() for path in paths))
+        session = root["ds1"]["K1"]["session2019-01-05-1"]
+        self.assertEqual([path for spec, path in root.walk(level=LEVELS[2], paths=True)
+                          if spec.session == session._spec.session], [session.path])
+        root    = DataRoot(self._root.resolve()) # as the catalog stores it
+        indexed = root.build_index(self._root.with_suffix(".sqlite3"))
+        try:
+            self.assertEqual(list(indexed.walk(paths=True)), list(root.walk(paths=True)))
+        finally:
+            indexed.catalog.close()
+            indexed.catalog.path.unlink()
+
+    def tearDown(self):
+        if self._root.exists():
+            shutil.rmtree(self._root)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,325 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+"""evaluating Predicates against a data-root.
+
+each field of a Predicate may be:
+
+- None, which matches anything,
+- a single value, which matches the equal value,
+- a collection (list, tuple or set) of values, which matches any of them
+  (for `channel`, only lists and sets are taken as alternatives), or
+- a callable, which is called with the value and matches if it returns True.
+
+the fields are evaluated level by level, so that a subtree is never
+visited once its directory fails to match.
+"""
+
+import os as _os
+import pathlib as _pathlib
+
+from .. import modes as _modes
+from ..core import DataLevels as _DataLevels
+from ..backends import LOCAL as _LOCAL
+from .. import scanning as _scanning
+from .. import aio as _aio
+from .. import reading as _reading
+from .. import checksums as _checksums
+
+CHOICE_TYPES = (list, tuple, set, frozenset)
+
+def matches(condition, value, choices=CHOICE_TYPES):
+    """returns if `value` satisfies a single field `condition`."""
+    if condition is None:
+        return True
+    elif callable(condition):
+        return bool(condition(value))
+    elif isinstance(condition, choices):
+        return value in condition
+    else:
+        return value == condition
+
+def channel_key(channel):
+    """returns the tuple of channel names of a single (possibly multi-channel) file."""
+    if (channel is None) or isinstance(channel, tuple):
+        return channel
+    elif isinstance(channel, str):
+        return (channel,)
+    else:
+        return tuple(channel)
+
+def matches_channel(condition, value):
+    """returns if the `channel` of a file satisfies `condition`."""
+    if (condition is None) or callable(condition):
+        return matches(condition, value)
+    key = channel_key(value)
+    if isinstance(condition, (list, set, frozenset)):
+        return any(channel_key(item) == key for item in condition)
+    return channel_key(condition) == key
+
+def matches_at(predicate, level, item):
+    """returns if `item` (a Predicate or a scanning.Entry) satisfies
+    the condition of `predicate` at `level`."""
+    if level == _DataLevels.DATASET:
+        return matches(predicate.dataset, item.dataset)
+    elif level == _DataLevels.SUBJECT:
+        return matches(predicate.subject, item.subject)
+    elif level == _DataLevels.SESSION:
+        cond, value = predicate.session, item.session
+        return matches(cond.type, value.type) and \
+               matches(cond.date, value.date) and \
+               matches(cond.index, value.index)
+    elif level == _DataLevels.DOMAIN:
+        return matches(predicate.domain, item.domain)
+    elif level == _DataLevels.FILE:
+        cond, value = predicate.file, item.file
+        return matches(cond.trial, value.trial) and \
+               matches(cond.run, value.run) and \
+               matches_channel(cond.channel, value.channel) and \
+               matches(cond.suffix, value.suffix)
+    else:
+        return True
+
+def finite_values(condition):
+    """returns the tuple of values that `condition` can match,
+    or None if they cannot be enumerated."""
+    if (condition is None) or callable(condition):
+        return None
+    elif isinstance(condition, CHOICE_TYPES):
+        return tuple(condition)
+    else:
+        return (condition,)
+
+def explicit_names(predicate, level):
+    """returns the sorted directory names that can match `predicate` at `level`,
+    or None if the directory must be listed to find them."""
+    if level == _DataLevels.DATASET:
+        names = finite_values(predicate.dataset)
+    elif level == _DataLevels.SUBJECT:
+        names = finite_values(predicate.subject)
+    elif level == _DataLevels.DOMAIN:
+        names = finite_values(predicate.domain)
+    else:
+        # the session (and file) names are not probed, as the same session
+        # may be named in more than one way (e.g. 'session2019-01-05-1' and
+        # 'session2019-01-05-001'): the directory is listed instead
+        return None
+    if names is None:
+        return None
+    return sorted(set(str(name) for name in names))
+
+def select_children(predicate, entry, path, backend=None):
+    """returns the list of (child Entry, child path) that match `predicate`
+    directly under the directory `path` corresponding to `entry`, in the order of names.
+
+    the directory is listed only when the names at the child level cannot
+    be enumerated from `predicate`; otherwise they are probed directly."""
+    backend     = _LOCAL if backend is None else backend
+    child_level = _scanning.child_level(entry.level)
+    names       = explicit_names(predicate, child_level)
+    if names is None:
+        children = ((child, child.direntry.path) \
+                    for child in _scanning.list_children(entry, path, backend=backend))
+    else:
+        children = ((_scanning.make_child(entry, name), _os.path.join(path, name)) \
+                    for name in names)
+    selected = []
+    for child, childpath in children:
+        if (child is None) or (not matches_at(predicate, child_level, child)):
+            continue
+        if (names is not None) and (not backend.is_dir(childpath)):
+            continue
+        selected.append((child, childpath))
+    return selected
+
+def iter_entries(root, predicate, level, backend=None, paths=False):
+    """generates the scanning.Entry objects at `level` under `root`
+    that match `predicate`, in the order of names (see `select_children()`).
+    with `paths=True`, (Entry, path) is generated instead, where `path`
+    is the path of the entry on the file system."""
+    depth = _scanning.depth_of(level)
+    def _select(entry, path):
+        for child, childpath in select_children(predicate, entry, path, backend=backend):
+            if _scanning.depth_of(child.level) == depth:
+                yield (child, _pathlib.Path(childpath)) if paths else child
+            else:
+                yield from _select(child, childpath)
+    return _select(_scanning.ROOT_ENTRY, str(root))
+
+class Selection:
+    """a lazily evaluated selection of the containers
+    that match a Predicate in a data-root.
+
+    nothing is read until the selection is iterated over,
+    and it is read again every time it is iterated over."""
+
+    def __init__(self, root, predicate, level=None, mode=_modes.READ, catalog=None, backend=None):
+        """root:      the path to the data-root.
+        predicate: the Predicate to match.
+        level:     the level of the containers to select.
+                   defaults to the level of `predicate` (or DATASET, if it is less specific).
+        catalog:   the Catalog to query instead of the file system, if any.
+        backend:   the file-system backend (backends.LOCAL by default)."""
+        if level is None:
+            level = predicate.level
+            if level in (_DataLevels.NA, _DataLevels.ROOT):
+                level = _DataLevels.DATASET
+        _scanning.depth_of(level) # validates the level
+        self._root      = _pathlib.Path(root)
+        self._predicate = predicate
+        self._level     = level
+        self._mode      = mode
+        self._catalog   = catalog
+        self._backend   = backend
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(level={self._level!r}, predicate={self._predicate!r})"
+
+    @property
+    def level(self):
+        return self._level
+
+    @property
+    def predicate(self):
+        return self._predicate
+
+    def specs(self, paths=False):
+        """generates the Predicates of the matching entries. with `paths=True`,
+        (Predicate, path) is generated instead, where `path` is the path
+        of the entry as it was found (see scanning.Entry.as_predicate())."""
+        if self._catalog is not None:
+            yield from self._query_catalog(paths)
+            return
+        for entry in iter_entries(self._root, self._predicate, self._level,
+                                  backend=self._backend, paths=paths):
+            if paths:
+                entry, path = entry
+                yield entry.as_predicate(self._root, mode=self._mode), path
+            else:
+                yield entry.as_predicate(self._root, mode=self._mode)
+
+    def _query_catalog(self, paths=False):
+        # let SQL evaluate the enumerable conditions, and filter the rest here
+        pred   = self._predicate
+        depth  = _scanning.depth_of(self._level)
+        fields = (("dataset", pred.dataset, _DataLevels.DATASET),
+                  ("subject", pred.subject, _DataLevels.SUBJECT),
+                  ("session_type",  pred.session.type,  _DataLevels.SESSION),
+                  ("session_date",  pred.session.date,  _DataLevels.SESSION),
+                  ("session_index", pred.session.index, _DataLevels.SESSION),
+                  ("domain", pred.domain, _DataLevels.DOMAIN),
+                  ("trial",  pred.file.trial,  _DataLevels.FILE),
+                  ("run",    pred.file.run,    _DataLevels.FILE),
+                  ("suffix", pred.file.suffix, _DataLevels.FILE))
+        conditions = dict((col, list(values)) for col, values, lev in \
+                          ((col, finite_values(cond), lev) for col, cond, lev in fields) \
+                          if (values is not None) and (_scanning.depth_of(lev) <= depth))
+        levels = _scanning.LEVELS[:depth]
+        root   = self._catalog.root
+        for spec, path in self._catalog.query(self._level, mode=self._mode, paths=True, **conditions):
+            if all(matches_at(pred, lev, spec) for lev in levels):
+                spec = spec.with_values(root=self._root)
+                if not paths:
+                    yield spec
+                    continue
+                if root != self._root:
+                    path = self._root.joinpath(path.relative_to(root))
+                yield spec, path
+
+    def __iter__(self):
+        cls = container_class(self._level)
+        for spec, path in self.specs(paths=True):
+            yield cls(spec, catalog=self._catalog, path=path, backend=self._backend)
+
+    def count(self):
+        """counts the matching entries without creating containers."""
+        return sum(1 for _ in self.specs())
+
+    def read(self, ahead=_reading.AHEAD, budget=_reading.BUDGET, workers=None):
+        """generates (DataFile, bytes) for the selected data files in order,
+        prefetching the next ones in the background (see reading.prefetch())."""
+        self._require_files("read from")
+        return _reading.prefetch(self, ahead=ahead, budget=budget, workers=workers)
+
+    def checksum(self, workers=None, processes=False, algorithm=_checksums.ALGORITHM, force=False):
+        """computes the checksums of the selected data files in parallel, reusing
+        the stored digests of the files whose size and mtime are unchanged,
+        and returns the ChecksumReport (see checksums.update())."""
+        self._require_files("checksum")
+        return _checksums.update(self, workers=workers, processes=processes,
+                                 algorithm=algorithm, force=force)
+
+    def verify(self, workers=None, processes=False, algorithm=_checksums.ALGORITHM):
+        """hashes the selected data files again, and returns the list of the paths
+        whose digests differ from the stored ones (see checksums.verify())."""
+        self._require_files("verify")
+        return _checksums.verify(self, workers=workers, processes=processes, algorithm=algorithm)
+
+    def _require_files(self, action):
+        if self._level != _DataLevels.FILE:
+            raise ValueError(f"can only {action} a selection of files, not at the level: '{self._level}'")
+
+    def aiter(self, executor=None, limit=16):
+        """asynchronously generates the matching containers, listing up to
+        `limit` directories concurrently in `executor` (see aio.atraverse()).
+
+        the containers are generated as soon as their parent directories
+        are listed, i.e. in no particular order."""
+        if self._catalog is not None:
+            return _aio.aiterate(self, executor=executor)
+        return _aio.atraverse((_scanning.ROOT_ENTRY, str(self._root)), self._expand,
+                              executor=executor, limit=limit)
+
+    def __aiter__(self):
+        return self.aiter()
+
+    def _expand(self, node):
+        # called in the executor: lists a directory, and creates the containers
+        # (which check their existence) if it is at the selected level
+        entry, path = node
+        depth       = _scanning.depth_of(self._level)
+        cls         = container_class(self._level)
+        containers, subdirs = [], []
+        for child, childpath in select_children(self._predicate, entry, path, backend=self._backend):
+            if _scanning.depth_of(child.level) == depth:
+                spec = child.as_predicate(self._root, mode=self._mode)
+                containers.append(cls(spec, catalog=self._catalog, path=_pathlib.Path(childpath),
+                                      backend=self._backend))
+            else:
+                subdirs.append((child, childpath))
+        return containers, subdirs
+
+def container_class(level):
+    """returns the container class corresponding to `level`."""
+    from ..dataset import Dataset
+    from ..subject import Subject
+    from ..session import Session
+    from ..domain import Domain
+    from ..datafile import DataFile
+    return {
+        _DataLevels.DATASET: Dataset,
+        _DataLevels.SUBJECT: Subject,
+        _DataLevels.SESSION: Session,
+        _DataLevels.DOMAIN:  Domain,
+        _DataLevels.FILE:    DataFile,
+    }[level]
@@ -0,0 +1,99 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""usage: python -m dope.selection.tests"""
+
+import unittest
+import shutil
+import asyncio
+from . import *
+from .. import testing
+from ..predicate import Predicate
+from ..dataroot import DataRoot
+
+class SelectionTests(unittest.TestCase):
+    def setUp(self):
+        self._root = testing.populate(testing.test_dataroot_path())
+
+    def assert_selects(self, root, expected, **specs):
+        selection = root.select(**specs)
+        self.assertEqual([str(item.path.relative_to(self._root)) for item in selection],
+                         list(expected))
+        self.assertEqual(selection.count(), len(expected))
+
+    def test_matches(self):
+        self.assertTrue(matches(None, "K1"))
+        self.assertTrue(matches("K1", "K1"))
+        self.assertTrue(matches(["K1", "K2"], "K2"))
+        self.assertFalse(matches(("K1", "K2"), "K3"))
+        self.assertTrue(matches(lambda name: name.startswith("K"), "K3"))
+        self.assertTrue(matches_channel("Green", ("Green",)))
+        self.assertTrue(matches_channel(["Red", ("Green", "Red")], ("Green", "Red")))
+        self.assertFalse(matches_channel(("Green", "Red"), ("Green",)))
+
+    def test_select(self):
+        for root in (DataRoot(self._root), DataRoot(self._root).build_index()):
+            self.assert_selects(root, ["ds1/K1/training2019-01-02-001/video",
+                                       "ds1/K2/training2019-01-03-001/video"],
+                                subject=["K1", "K2", "K3"], session_type="training", domain="video")
+            self.assert_selects(root, ["ds1/K1/session2019-01-01-001",
+                                       "ds1/K1/training2019-01-02-001"],
+                                subject=lambda name: name != "K2",
+                                session_date=["2019-01-01", "2019-01-02"])
+            self.assert_selects(root, ["ds1/K1/session2019-01-01-001/img/K1_session2019-01-01-001_img_run00002_Green.tif"],
+                                dataset="ds1", run=lambda run: (run or 0) > 1, channel="Green", suffix=".tif")
+            self.assert_selects(root, ["ds1", "ds2"])
+            self.assert_selects(root, [], dataset="ds3", subject="K1")
+            selection = root.select(Predicate(subject="K2"), level=Predicate.FILE)
+            self.assertEqual(selection.level, Predicate.FILE)
+            self.assertEqual([spec.domain for spec in selection.specs()], ["video"])
+
+    def test_unpadded(self):
+        name = "ds1/K1/session2019-01-05-1/img/K1_session2019-01-05-1_img_run1_Green.tif"
+        testing.populate(self._root, files=(name,), directories=())
+        for root in (DataRoot(self._root), DataRoot(self._root).build_index()):
+            sessions = [str(item.path.relative_to(self._root)) for item in root.select(level="session")]
+            self.assertIn("ds1/K1/session2019-01-05-1", sessions)
+            files = [item.path for item in root.select(level="file")]
+            self.assertIn(self._root / name, files)
+            self.assert_selects(root, [name], session_index=1, session_date="2019-01-05", run=1)
+            self.assert_selects(root, ["ds1/K1/session2019-01-05-1"],
+                                subject="K1", session_type="session", session_date="2019-01-05",
+                                session_index=[1, 2])
+            found = asyncio.run(root.aselect(level="file"))
+            self.assertEqual([item.path for item in found], sorted(files))
+
+    def test_pruning(self):
+        root     = DataRoot(self._root)
+        selected = root.select(subject="K2", session_type="training", domain="video")
+        shutil.rmtree(self._root / "ds1" / "K1") # not to be visited
+        (self._root / "ds1" / "K1").touch()
+        self.assertEqual(selected.count(), 1)
+
+    def tearDown(self):
+        if self._root.exists():
+            shutil.rmtree(self._root)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -22,18 +22,25 @@
 # SOFTWARE.
 #
 
-import pathlib as _pathlib
+import bisect as _bisect
+import datetime as _datetime
 
 from .. import modes as _modes
 from ..predicate import Predicate as _Predicate
 from ..core import Container as _Container
 from ..core import Selector as _Selector
+from ..core import iterable as _iterable
+from ..backends import LOCAL as _LOCAL
+from .. import instrumentation as _instrumentation
 from ..sessionspec import SessionSpec as _SessionSpec
 from .. import parsing as _parsing
 from ..domain import Domain as _Domain
 
 class Session(_Container):
     """a container class representing a session directory."""
+    __slots__ = ()
+    LEVEL     = _Predicate.SESSION
+
     @classmethod
     def is_valid_path(cls, path):
         """returns if the specified file path
@@ -47,23 +54,37 @@ class Session(_Container):
             return False
 
     @classmethod
-    def from_parent(cls, parentspec, key):
+    @_instrumentation.timed("derive", level=_Predicate.SESSION)
+    def from_parent(cls, parentspec, key, catalog=None, parentpath=None, backend=None):
         if isinstance(key, str):
-            return cls(parentspec.with_values(sessionspec=_SessionSpec(key)))
+            sspec, name = _SessionSpec.from_name(key), key
         elif isinstance(key, _SessionSpec):
-            return cls(parentspec.with_values(sessionspec=key))
-        elif iterable(key):
-            return cls(parentspec.with_values(sessionspec=_SessionSpec(*key)))
+            sspec, name = key, None
+        elif _iterable(key):
+            sspec, name = _SessionSpec(*key), None
         else:
             raise ValueError(f"unexpected key type: {key.__class__}")
+        status = sspec.status
+        if status != sspec.SINGLE:
+            raise ValueError(f"cannot specify a session: not specifying a single condition (status: '{status}')")
+        elif name is None:
+            name = sspec.name
+        path = None if parentpath is None else parentpath / name
+        return cls(parentspec.child(parentspec.SESSION, sspec),
+                   catalog=catalog, path=path, backend=backend)
 
-    def __init__(self, spec, mode=None):
+    @_instrumentation.timed("init", level=_Predicate.SESSION)
+    def __init__(self, spec, mode=None, catalog=None, path=None, backend=None):
         """`spec` may be a path-like object or a Predicate.
-        by default, dope.modes.READ is selected for `mode`."""
+        by default, dope.modes.READ is selected for `mode`.
+        `path` may be given if the path of `spec` is already known
+        (e.g. when derived from the path of the parent).
+        `backend` is the file-system backend (backends.LOCAL by default)."""
+        backend = _LOCAL if backend is None else backend
         if not isinstance(spec, _Predicate):
             # assumes path-like object
             try:
-                path = _pathlib.Path(spec).resolve()
+                path = backend.resolve(spec)
             except TypeError:
                 raise ValueError(f"Subject can only be initialized by a path-like object or a Predicate, not {spec.__class__}")
             subdir  = path.parent
@@ -73,7 +94,7 @@ class Session(_Container):
                               root=rootdir,
                               dataset=dsdir.name,
                               subject=subdir.name,
-                              sessionspec=_SessionSpec(path.name))
+                              session=_SessionSpec(path.name))
         else:
             # validate and (if needed) modify the Predicate
             level = spec.level
@@ -81,18 +102,21 @@ class Session(_Container):
             if level in (spec.NA, spec.ROOT, spec.DATASET, spec.SUBJECT):
                 raise ValueError(f"cannot specify a session from the predicate level: '{level}'")
             elif level != spec.SESSION:
+                path = None
                 spec = spec.with_values(mode=mode,
                                         root=spec.root,
                                         dataset=spec.dataset,
                                         subject=spec.subject,
-                                        sessionspec=spec.sessionspec,
+                                        session=spec.session,
                                         clear=True)
             elif spec.mode != mode:
                 spec = spec.with_values(mode=mode)
 
         self._spec = spec
-        self._path = spec.path
-        if (self._spec.mode == _modes.READ) and (not self._path.exists()):
+        self._path = spec.path if path is None else path
+        self._catalog = catalog
+        self._backend = backend
+        if (self._spec.mode == _modes.READ) and (not self._exists()):
             raise FileNotFoundError(f"session directory does not exist: {self._path}")
 
     @property
@@ -102,17 +126,112 @@ class Session(_Container):
     @property
     def dataset(self):
         from ..dataset import Dataset
-        return Dataset(self._spec.as_dataset())
+        return Dataset(self._spec.as_dataset(), catalog=self._catalog, backend=self._backend)
 
     @property
-    def subject(path):
+    def subject(self):
         from ..subject import Subject
-        return Subject(self._spec.as_subject())
+        return Subject(self._spec.as_subject(), catalog=self._catalog, backend=self._backend)
 
     @property
     def domains(self):
-        return _Selector(self._spec, _Domain)
+        return _Selector(self._spec, _Domain, catalog=self._catalog, path=self._path,
+                         backend=self._backend)
 
     def __getitem__(self, key):
         """`key` may be either a string or a tuple of string (incl. SessionSpec)."""
         return self.domains[key]
+
+def as_session_date(value):
+    """converts `value` (a date, a datetime or a 'YYYY-MM-DD' string)
+    into the form of the session dates (i.e. a datetime at midnight)."""
+    if isinstance(value, _datetime.date): # incl. datetime
+        return _datetime.datetime(value.year, value.month, value.day)
+    return _parsing.session.date(value)
+
+class SessionIndex:
+    """the names of the sessions of a subject, sorted by their (date, index).
+
+    the index is built from the listed names on the first query,
+    and is reused afterwards until clear() is called."""
+    __slots__ = ("_dates", "_names")
+
+    def __init__(self):
+        self._dates = None
+        self._names = None
+
+    @property
+    def built(self):
+        return self._dates is not None
+
+    def clear(self):
+        self._dates = None
+        self._names = None
+
+    def build(self, names):
+        """sorts the session `names` by their (date, index) (and type, for the ties)."""
+        keyed = []
+        for name in names:
+            spec = _SessionSpec.from_name(name)
+            keyed.append((spec.date, spec.index, spec.type, name))
+        keyed.sort()
+        self._dates = [key[0] for key in keyed]
+        self._names = [key[-1] for key in keyed]
+
+    def between(self, start=None, end=None):
+        """returns the names of the sessions with `start <= date <= end`."""
+        lo = 0 if start is None else _bisect.bisect_left(self._dates, as_session_date(start))
+        hi = len(self._dates) if end is None else _bisect.bisect_right(self._dates, as_session_date(end))
+        return self._names[lo:hi]
+
+    def latest(self, n=1):
+        """returns the names of the `n` latest sessions."""
+        return self._names[max(len(self._names) - n, 0):]
+
+    def __len__(self):
+        return 0 if self._names is None else len(self._names)
+
+class SessionSelector(_Selector):
+    """a Selector of the sessions of a subject, which can select
+    the sessions by their dates through a SessionIndex, e.g.:
+
+        subject.sessions.between("2019-01-01", "2019-01-31")
+        subject.sessions.on("2019-01-02")
+        subject.sessions.latest(3)
+
+    the sessions are returned as lists, in the order of (date, index)."""
+    __slots__ = ("_index",)
+
+    def __init__(self, spec, delegate=Session, catalog=None, path=None, backend=None, index=None):
+        """`index` may be a SessionIndex to be shared, e.g. by the selectors of a subject."""
+        super().__init__(spec, delegate, catalog=catalog, path=path, backend=backend)
+        self._index = SessionIndex() if index is None else index
+
+    def refresh(self):
+        """discards the names listed so far, as well as the index."""
+        super().refresh()
+        self._index.clear()
+
+    def index(self):
+        """returns the SessionIndex, building it if it has not been built yet."""
+        if not self._index.built:
+            self._index.build(self.names())
+        return self._index
+
+    def between(self, start=None, end=None):
+        """returns the sessions with `start <= date <= end`.
+        either end of the range may be omitted."""
+        return self._sessions(self.index().between(start, end))
+
+    def on(self, date):
+        """returns the sessions on `date`."""
+        return self._sessions(self.index().between(date, date))
+
+    def latest(self, n=1):
+        """returns the `n` latest sessions."""
+        return self._sessions(self.index().latest(n))
+
+    def _sessions(self, names):
+        return [self._delegate.from_parent(self._spec, name, catalog=self._catalog,
+                                           parentpath=self._path, backend=self._backend) \
+                for name in names]
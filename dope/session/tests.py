@@ -0,0 +1,87 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""usage: python -m dope.session.tests"""
+
+import unittest
+import shutil
+import datetime
+from .. import testing
+from ..dataroot import DataRoot
+
+SESSIONS = ("session2019-01-01-001", "session2019-01-01-002", "training2019-01-02-001",
+            "session2019-01-05-1", "training2019-01-05-001", "session2019-02-01-001")
+
+class SessionIndexTests(unittest.TestCase):
+    def setUp(self):
+        self._root = testing.populate(testing.test_dataroot_path(), files=(),
+                                      directories=tuple(f"ds1/K1/{name}" for name in SESSIONS))
+
+    def names(self, sessions):
+        return [sess.path.name for sess in sessions]
+
+    def test_between(self):
+        sessions = DataRoot(self._root)["ds1"]["K1"].sessions
+        self.assertEqual(self.names(sessions.between("2019-01-01", "2019-01-05")),
+                         ["session2019-01-01-001", "session2019-01-01-002", "training2019-01-02-001",
+                          "session2019-01-05-1", "training2019-01-05-001"])
+        self.assertEqual(self.names(sessions.between(datetime.date(2019, 1, 3))),
+                         ["session2019-01-05-1", "training2019-01-05-001", "session2019-02-01-001"])
+        self.assertEqual(self.names(sessions.between(end="2019-01-01")),
+                         ["session2019-01-01-001", "session2019-01-01-002"])
+        self.assertEqual(sessions.between("2019-01-06", "2019-01-31"), [])
+        self.assertEqual(sessions.on(datetime.datetime(2019, 1, 5, 12))[0].path,
+                         self._root / "ds1/K1/session2019-01-05-1")
+        self.assertEqual(self.names(sessions.latest(2)),
+                         ["training2019-01-05-001", "session2019-02-01-001"])
+        self.assertEqual(len(sessions.latest(10)), len(SESSIONS))
+        with self.assertRaises(ValueError):
+            sessions.on("January 1st")
+
+    def test_reuse(self):
+        subject = DataRoot(self._root)["ds1"]["K1"]
+        self.assertEqual(len(subject.sessions.latest()), 1)
+        (self._root / "ds1/K1/session2019-03-01-001").mkdir()
+        self.assertEqual(self.names(subject.sessions.latest()), ["session2019-02-01-001"])
+        sessions = subject.sessions
+        sessions.refresh()
+        self.assertEqual(self.names(sessions.latest()), ["session2019-03-01-001"])
+        self.assertEqual(self.names(subject.sessions.on("2019-03-01")), ["session2019-03-01-001"])
+
+    def test_catalog(self):
+        root    = DataRoot(self._root)
+        indexed = root.build_index(self._root.with_suffix(".sqlite3"))
+        try:
+            self.assertEqual(self.names(indexed["ds1"]["K1"].sessions.between("2019-01-02", "2019-01-05")),
+                             self.names(root["ds1"]["K1"].sessions.between("2019-01-02", "2019-01-05")))
+        finally:
+            indexed.catalog.close()
+            indexed.catalog.path.unlink()
+
+    def tearDown(self):
+        if self._root.exists():
+            shutil.rmtree(self._root)
+
+if __name__ == "__main__":
+    unittest.main()
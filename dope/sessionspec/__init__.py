@@ -25,27 +25,43 @@
 import re as _re
 import collections as _collections
 import datetime as _datetime
+import functools as _functools
 
 from .. import defaults
 from ..core import SelectionStatus as _SelectionStatus
 from .. import parsing as _parsing
 
+def parse_field(parse, value):
+    """parses a field value of a SessionSpec using `parse`.
+
+    callables are kept as they are, and non-string collections are
+    parsed element-wise into a tuple (or into a single value, if they
+    have only one element)."""
+    if callable(value):
+        return value
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        values = tuple(parse(item) for item in value)
+        return values[0] if len(values) == 1 else values
+    else:
+        return parse(value)
+
 class SessionSpec(_collections.namedtuple("_SessionSpec",
                   ("type", "date", "index")), _SelectionStatus):
+    __slots__ = ()
 
     def __new__(cls, type=None, date=None, index=None):
         if (date is None) and (index is None):
             if type is None:
                 return super(cls, SessionSpec).__new__(cls, type=None, date=None, index=None)
-            else:
+            elif isinstance(type, str):
                 # attempt name-based initialization
                 try:
-                    return cls(**_parsing.session.name(type))
+                    return cls.from_name(type)
                 except ValueError:
                     pass # fallthrough
-        return super(cls, SessionSpec).__new__(cls, type=_parsing.session.type(type),
-                                  date=_parsing.session.date(date),
-                                  index=_parsing.session.index(index))
+        return super(cls, SessionSpec).__new__(cls, type=parse_field(_parsing.session.type, type),
+                                  date=parse_field(_parsing.session.date, date),
+                                  index=parse_field(_parsing.session.index, index))
 
     @classmethod
     def empty(cls):
@@ -53,8 +69,14 @@ class SessionSpec(_collections.namedtuple("_SessionSpec",
 
     @classmethod
     def from_name(cls, name):
-        """initializes the specification from a property formatted session name."""
-        return cls(**_parsing.session.name(name))
+        """initializes the specification from a property formatted session name.
+
+        the specifications are memoized in a bounded cache (of the size
+        `parsing.session.CACHE_SIZE`), so that the sessions of the same
+        name share a single instance."""
+        if not isinstance(name, str):
+            raise ValueError(f"session name expected to be a string, but got {name.__class__}")
+        return spec_from_name(cls, name)
 
     def __str__(self):
         return self.name
@@ -79,21 +101,27 @@ class SessionSpec(_collections.namedtuple("_SessionSpec",
         return self.__class__(None,None,None)
 
     def compute_status(self, context=None):
-        # TODO
-        if context is None:
-            stat = tuple(fld is None for fld in self)
-            if all(stat):
-                return self.UNSPECIFIED
-            elif any(stat):
-                return self.MULTIPLE
-            else:
-                return self.SINGLE
+        # TODO: take `context` (Predicate) into account
+        if any(map(callable, self)):
+            return self.DYNAMIC
+        stat = tuple(fld is None for fld in self)
+        if all(stat):
+            return self.UNSPECIFIED
+        elif any(isinstance(fld, tuple) and (len(fld) == 0) for fld in self):
+            return self.NONE
+        elif any(stat) or any(isinstance(fld, tuple) for fld in self):
+            return self.MULTIPLE
         else:
-            raise NotImplementedError("SessionSpec.compute_status()")
+            return self.SINGLE
+
+    def is_empty(self):
+        """returns if no field is specified
+        (i.e. a cheaper equivalent of `status == UNSPECIFIED`)."""
+        return (self.type is None) and (self.date is None) and (self.index is None)
 
     def compute_path(self, context):
         """context: Predicate"""
-        return context.compute_subject_path() / self.name
+        return context.root.joinpath(context.dataset, context.subject, self.name)
 
     def format(self,
                digits=None,
@@ -135,3 +163,10 @@ class SessionSpec(_collections.namedtuple("_SessionSpec",
            if len(base) > digits:
                raise ValueError(f"cannot represent session index '{self.index}' in a {digits}-digit number")
            return base.zfill(digits)
+
+@_functools.lru_cache(maxsize=_parsing.session.CACHE_SIZE)
+def spec_from_name(cls, name):
+    """the memoized implementation of SessionSpec.from_name().
+    the decoded fields are used without being validated again."""
+    stype, date, index, _ = _parsing.decode_session_name(name)
+    return super(SessionSpec, cls).__new__(cls, type=stype, date=date, index=index)
@@ -22,16 +22,22 @@
 # SOFTWARE.
 #
 
-import pathlib as _pathlib
-
 from .. import modes as _modes
 from ..predicate import Predicate as _Predicate
 from ..core import Container as _Container
-from ..core import Selector as _Selector
+from ..backends import LOCAL as _LOCAL
+from .. import instrumentation as _instrumentation
 from ..session import Session as _Session
+from ..session import SessionIndex as _SessionIndex
+from ..session import SessionSelector as _SessionSelector
+from .. import tables as _tables
+from .. import summary as _summary
 
 class Subject(_Container):
     """a container class representing a subject directory."""
+    __slots__ = ("_sessionindex",)
+    LEVEL     = _Predicate.SUBJECT
+
     @classmethod
     def is_valid_path(cls, path):
         """returns if the specified file path
@@ -43,16 +49,26 @@ class Subject(_Container):
         return parentpath / key
 
     @classmethod
-    def from_parent(cls, parentspec, name):
-        return cls(parentspec.with_values(subject=name))
+    @_instrumentation.timed("derive", level=_Predicate.SUBJECT)
+    def from_parent(cls, parentspec, name, catalog=None, parentpath=None, backend=None):
+        if not isinstance(name, str):
+            raise ValueError(f"unexpected key type: {name.__class__}")
+        path = None if parentpath is None else parentpath / name
+        return cls(parentspec.child(parentspec.SUBJECT, name),
+                   catalog=catalog, path=path, backend=backend)
 
-    def __init__(self, spec, mode=None):
+    @_instrumentation.timed("init", level=_Predicate.SUBJECT)
+    def __init__(self, spec, mode=None, catalog=None, path=None, backend=None):
         """`spec` may be a path-like object or a Predicate.
-        by default, dope.modes.READ is selected for `mode`."""
+        by default, dope.modes.READ is selected for `mode`.
+        `path` may be given if the path of `spec` is already known
+        (e.g. when derived from the path of the parent).
+        `backend` is the file-system backend (backends.LOCAL by default)."""
+        backend = _LOCAL if backend is None else backend
         if not isinstance(spec, _Predicate):
             # assumes path-like object
             try:
-                path = _pathlib.Path(spec).resolve()
+                path = backend.resolve(spec)
             except TypeError:
                 raise ValueError(f"Subject can only be initialized by a path-like object or a Predicate, not {spec.__class__}")
             spec = _Predicate(mode=mode if mode is not None else _modes.READ,
@@ -66,6 +82,7 @@ class Subject(_Container):
             if level in (spec.NA, spec.ROOT, spec.DATASET):
                 raise ValueError(f"cannot specify a subject from the predicate level: '{level}'")
             elif level != spec.SUBJECT:
+                path = None
                 spec = spec.with_values(mode=mode,
                                         root=spec.root,
                                         dataset=spec.dataset,
@@ -75,8 +92,11 @@ class Subject(_Container):
                 spec = spec.with_values(mode=mode)
 
         self._spec = spec
-        self._path = spec.path
-        if (self._spec.mode == _modes.READ) and (not self._path.exists()):
+        self._path = spec.path if path is None else path
+        self._catalog = catalog
+        self._backend = backend
+        self._sessionindex = None
+        if (self._spec.mode == _modes.READ) and (not self._exists()):
             raise FileNotFoundError(f"subject directory does not exist: {self._path}")
 
     @property
@@ -86,11 +106,25 @@ class Subject(_Container):
     @property
     def dataset(self):
         from ..dataset import Dataset
-        return Dataset(self._spec.as_dataset())
+        return Dataset(self._spec.as_dataset(), catalog=self._catalog, backend=self._backend)
 
     @property
     def sessions(self):
-        return _Selector(self._spec, _Session)
+        """the SessionSelector of the sessions in this subject.
+        the index of the session dates is shared between the selectors
+        of this subject, so that it is only built once."""
+        if self._sessionindex is None:
+            self._sessionindex = _SessionIndex()
+        return _SessionSelector(self._spec, _Session, catalog=self._catalog, path=self._path,
+                                backend=self._backend, index=self._sessionindex)
 
     def __getitem__(self, key):
         return self.sessions[key]
+
+    def to_table(self, format="numpy"):
+        """returns the table of the data files in this subject (see dope.tables.table_of())."""
+        return _tables.table_of(self, format=format)
+
+    def summarize(self, by=("subject", "session_type"), path=None):
+        """returns the Summary of this subject (see dope.summary.summarize())."""
+        return _summary.summarize(self, by, path=path)
@@ -0,0 +1,217 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+"""aggregate views of the sessions and the data files.
+
+    summary = dataset.summarize(by=("subject", "session_type"), path="weekly.json")
+    summary.rows() # [{"subject": "K1", "session_type": "session",
+                   #   "sessions": 12, "files": 3400, "bytes": 1234567}, ...]
+    Summary.load("weekly.json") # reuses the result without walking again
+
+the aggregates are computed in a single pass through the directories
+(or the catalog), without creating containers.
+"""
+
+import json as _json
+import time as _time
+import collections as _collections
+
+from ..core import DataLevels as _DataLevels
+from .. import scanning as _scanning
+from .. import catalog as _catalog
+from .. import tables as _tables
+
+# the fields that the data can be grouped by, and the levels they belong to
+FIELDS = {
+    "dataset":       _DataLevels.DATASET,
+    "subject":       _DataLevels.SUBJECT,
+    "session":       _DataLevels.SESSION,
+    "session_type":  _DataLevels.SESSION,
+    "session_date":  _DataLevels.SESSION,
+    "session_index": _DataLevels.SESSION,
+    "domain":        _DataLevels.DOMAIN,
+    "trial":         _DataLevels.FILE,
+    "run":           _DataLevels.FILE,
+    "channel":       _DataLevels.FILE,
+    "suffix":        _DataLevels.FILE,
+}
+
+MEASURES = ("sessions", "files", "bytes")
+
+def field_values(record):
+    """returns the dict of the values of `FIELDS` from a catalog-like `record`
+    (a dict with the catalog columns)."""
+    values = dict((field, record.get(field)) for field in FIELDS.keys())
+    if record.get("session_type") is not None:
+        values["session"] = f"{record['session_type']}{record['session_date']}-" \
+                            f"{record['session_index']:03d}"
+    return values
+
+def scan_records(path, entry=None, backend=None):
+    """generates catalog-like records of the sessions and the data files below
+    the directory `path` that corresponds to the scanning.Entry `entry`."""
+    for found in _scanning.iter_entries(str(path), entry=entry, backend=backend):
+        if found.level not in (_DataLevels.SESSION, _DataLevels.FILE):
+            continue
+        session, file = found.session, found.file
+        record = dict(level=found.level, dataset=found.dataset, subject=found.subject,
+                      session_type=session.type, session_date=_catalog.format_date(session.date),
+                      session_index=session.index, domain=found.domain,
+                      trial=file.trial, run=file.run,
+                      channel=_catalog.format_channel(file.channel), suffix=file.suffix)
+        if found.level == _DataLevels.FILE:
+            record["size"] = found.direntry.stat().st_size
+        yield record
+
+def catalog_records(catalog, **conditions):
+    """generates catalog-like records of the sessions and the data files in `catalog`."""
+    columns = _catalog.COLUMNS
+    for level in (_DataLevels.SESSION, _DataLevels.FILE):
+        for row in catalog.rows(columns, level=level, **conditions):
+            yield dict(zip(columns, row))
+
+def aggregate(records, by):
+    """computes the Summary of `records` grouped by the fields in `by`."""
+    by = tuple(by)
+    for field in by:
+        if field not in FIELDS.keys():
+            raise ValueError(f"cannot group by: '{field}' (expected one of {tuple(FIELDS.keys())})")
+    # the sessions are only counted from the session directories if the
+    # groups do not depend on what is inside them
+    from_sessions = all(_scanning.depth_of(FIELDS[field]) <= _scanning.depth_of(_DataLevels.SESSION) \
+                        for field in by)
+    sessions = _collections.defaultdict(set)
+    files    = _collections.Counter()
+    sizes    = _collections.Counter()
+    counted  = set() # the sessions over all the groups
+    for record in records:
+        values  = field_values(record)
+        key     = tuple(values[field] for field in by)
+        session = (values["dataset"], values["subject"], values["session"])
+        if record["level"] == _DataLevels.FILE:
+            files[key] += 1
+            sizes[key] += record["size"] or 0
+            if not from_sessions:
+                sessions[key].add(session)
+                counted.add(session)
+        elif from_sessions:
+            sessions[key].add(session)
+            counted.add(session)
+    groups = dict((key, (len(sessions.get(key, ())), files[key], sizes[key])) \
+                  for key in set(sessions.keys()).union(files.keys()))
+    return Summary(by, groups, sessions=len(counted))
+
+def summarize(container, by, path=None):
+    """returns the Summary of the number of sessions and data files, and the
+    total bytes of the latter, below a (directory-level) container,
+    grouped by the fields in `by` (see FIELDS).
+
+    the summary is computed in a single pass (or from the catalog, if any),
+    and is stored at `path` if it is given, so that it can be reused
+    through `Summary.load(path)`."""
+    spec = container._spec
+    if container.catalog is not None:
+        records = catalog_records(container.catalog, **_tables.conditions_of(spec))
+    else:
+        records = scan_records(container.path, entry=_tables.entry_of(spec),
+                               backend=container.backend)
+    summary = aggregate(records, by)
+    if path is not None:
+        summary.save(path)
+    return summary
+
+def sort_key(key):
+    return tuple((value is None, value) for value in key)
+
+class Summary:
+    """the number of sessions and data files, and the total bytes of the latter,
+    for each group of values of the fields in `by`."""
+
+    def __init__(self, by, groups, created=None, sessions=None):
+        """groups:   {(value, ...): (sessions, files, bytes)}
+        sessions: the number of the distinct sessions over all the groups
+                  (a session may belong to more than one group, e.g. by domains)."""
+        self._by       = tuple(by)
+        self._groups   = dict((tuple(key), tuple(measures)) for key, measures in groups.items())
+        self._created  = _time.time() if created is None else created
+        self._sessions = sessions
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(by={self._by!r}, groups={len(self._groups)})"
+
+    def __len__(self):
+        return len(self._groups)
+
+    def __getitem__(self, key):
+        """returns the dict of the measures for the group `key`
+        (a value, or a tuple of values in the order of `by`)."""
+        if not isinstance(key, tuple):
+            key = (key,)
+        return dict(zip(MEASURES, self._groups[key]))
+
+    def __eq__(self, other):
+        return isinstance(other, Summary) and (self._by == other._by) and \
+               (self._groups == other._groups) and (self._sessions == other._sessions)
+
+    @property
+    def by(self):
+        return self._by
+
+    @property
+    def created(self):
+        """the time (in seconds since the epoch) when the summary was computed."""
+        return self._created
+
+    def rows(self):
+        """returns a list of dicts, one per group, sorted by the group values."""
+        return [dict(zip(self._by + MEASURES, key + self._groups[key])) \
+                for key in sorted(self._groups.keys(), key=sort_key)]
+
+    def total(self):
+        """returns the dict of the measures over all the groups. the files and
+        the bytes are summed, whereas each session is counted only once.
+        "sessions" is left out if the number is unknown."""
+        total = dict(zip(MEASURES, (sum(measures[i] for measures in self._groups.values()) \
+                                    for i in range(len(MEASURES)))))
+        if self._sessions is None:
+            del total["sessions"]
+        else:
+            total["sessions"] = self._sessions
+        return total
+
+    def save(self, path):
+        """stores the summary as a JSON file at `path`."""
+        with open(path, "w") as file:
+            _json.dump(dict(by=self._by, created=self._created, sessions=self._sessions,
+                            rows=self.rows()), file, indent=1)
+            file.write("\n")
+
+    @classmethod
+    def load(cls, path):
+        """reads a summary stored by save()."""
+        with open(path, "r") as file:
+            stored = _json.load(file)
+        by     = tuple(stored["by"])
+        groups = dict((tuple(row[field] for field in by), tuple(row[m] for m in MEASURES)) \
+                      for row in stored["rows"])
+        return cls(by, groups, created=stored["created"], sessions=stored.get("sessions"))
@@ -0,0 +1,99 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""usage: python -m dope.summary.tests"""
+
+import unittest
+import shutil
+from . import *
+from .. import testing
+from ..dataroot import DataRoot
+
+class SummaryTests(unittest.TestCase):
+    def setUp(self):
+        self._root = testing.populate(testing.test_dataroot_path()).resolve()
+        (self._root / testing.SAMPLE_FILES[0]).write_bytes(b"0123")
+        (self._root / testing.SAMPLE_FILES[3]).write_bytes(b"45")
+
+    def test_summarize(self):
+        summary = DataRoot(self._root)["ds1"].summarize()
+        self.assertEqual(summary.rows(), [
+            dict(subject="K1", session_type="session",  sessions=1, files=3, bytes=6),
+            dict(subject="K1", session_type="training", sessions=1, files=1, bytes=0),
+            dict(subject="K2", session_type="training", sessions=1, files=1, bytes=0),
+        ])
+        self.assertEqual(summary.total(), dict(sessions=3, files=5, bytes=6))
+        by_domain = DataRoot(self._root).summarize(by=("domain",))
+        self.assertEqual(by_domain["img"], dict(sessions=1, files=2, bytes=4))
+        self.assertEqual(by_domain["video"], dict(sessions=3, files=3, bytes=2))
+        # session2019-01-01-001 has both the domains, but is counted once
+        self.assertEqual(by_domain.total(), dict(sessions=3, files=5, bytes=6))
+        subject = DataRoot(self._root)["ds1"]["K1"].summarize(by=("session",))
+        self.assertEqual(subject["training2019-01-02-001"], dict(sessions=1, files=1, bytes=0))
+        with self.assertRaises(ValueError):
+            DataRoot(self._root).summarize(by=("size",))
+
+    def test_empty_sessions(self):
+        testing.populate(self._root, files=(), directories=("ds1/K2/session2019-01-04-001",))
+        summary = DataRoot(self._root).summarize(by=("subject",))
+        self.assertEqual(summary["K2"], dict(sessions=2, files=1, bytes=0))
+        summary = DataRoot(self._root).summarize(by=("subject", "domain"))
+        self.assertEqual(summary["K2", "video"], dict(sessions=1, files=1, bytes=0))
+
+    def test_catalog(self):
+        root    = DataRoot(self._root)
+        indexed = root.build_index(self._root.with_suffix(".sqlite3"))
+        try:
+            for by in (("subject", "session_type"), ("session_date", "domain", "channel")):
+                self.assertEqual(indexed.summarize(by=by), root.summarize(by=by))
+            self.assertEqual(indexed["ds1"]["K1"].summarize(), root["ds1"]["K1"].summarize())
+            # the containers below the subject level
+            session = [container["ds1"]["K1"]["session2019-01-01-001"] for container in (indexed, root)]
+            summary = [summarize(container, ("domain",)) for container in session]
+            self.assertEqual(summary[0], summary[1])
+            self.assertEqual(summary[0]["video"], dict(sessions=1, files=1, bytes=2))
+            summary = [summarize(container["video"], ("domain",)) for container in session]
+            self.assertEqual(summary[0], summary[1])
+            self.assertEqual(summary[0].total(), dict(sessions=1, files=1, bytes=2))
+        finally:
+            indexed.catalog.close()
+            indexed.catalog.path.unlink()
+
+    def test_persist(self):
+        path    = self._root.with_suffix(".json")
+        summary = DataRoot(self._root).summarize(by=("dataset", "session_index"), path=path)
+        try:
+            loaded = Summary.load(path)
+            self.assertEqual(loaded, summary)
+            self.assertEqual(loaded.created, summary.created)
+            self.assertEqual(loaded.rows(), summary.rows())
+        finally:
+            path.unlink()
+
+    def tearDown(self):
+        if self._root.exists():
+            shutil.rmtree(self._root)
+
+if __name__ == "__main__":
+    unittest.main()
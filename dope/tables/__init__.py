@@ -0,0 +1,186 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+"""columnar tables of the data files.
+
+a table has one row per data file, and the columns in `COLUMNS`: the path
+to the file, the fields of its Predicate (with its SessionSpec and FileSpec
+being flattened), and its size and mtime. it is built directly from
+a scan of the directories (or from a catalog), without creating containers.
+
+the table can be made in the following formats:
+
+- "numpy":  a NumPy structured array (the default). the missing integers
+            are -1, the missing strings are "", and the missing dates are NaT.
+- "pandas": a pandas.DataFrame with the same columns as "numpy".
+- "arrow":  a pyarrow.Table, where the missing values are nulls.
+- "dict":   a dict of lists, where the missing values are None.
+
+the formats except for "dict" require the corresponding libraries.
+"""
+
+import os as _os
+
+from ..core import DataLevels as _DataLevels
+from .. import scanning as _scanning
+from .. import catalog as _catalog
+
+COLUMNS = ("path", "dataset", "subject",
+           "session_type", "session_date", "session_index",
+           "domain", "trial", "run", "channel", "suffix",
+           "size", "mtime")
+
+STRING_COLUMNS  = ("path", "dataset", "subject", "session_type", "domain", "channel", "suffix")
+INTEGER_COLUMNS = {"session_index": "int32", "trial": "int32", "run": "int32", "size": "int64"}
+
+FORMATS = ("numpy", "pandas", "arrow", "dict")
+
+def entry_of(spec):
+    """returns the scanning.Entry corresponding to a directory-level Predicate."""
+    level = spec.level
+    if level == _DataLevels.ROOT:
+        return _scanning.ROOT_ENTRY
+    elif level in (_DataLevels.NA, _DataLevels.FILE):
+        raise ValueError(f"cannot make a table from the predicate level: '{level}'")
+    return _scanning.Entry(level, spec.dataset, spec.subject, spec.session,
+                           spec.domain, _scanning.NO_FILE, None)
+
+# the catalog columns that identify a directory, and the level of each
+DIRECTORY_COLUMNS = (("dataset",       _DataLevels.DATASET),
+                     ("subject",       _DataLevels.SUBJECT),
+                     ("session_type",  _DataLevels.SESSION),
+                     ("session_date",  _DataLevels.SESSION),
+                     ("session_index", _DataLevels.SESSION),
+                     ("domain",        _DataLevels.DOMAIN))
+
+def conditions_of(spec):
+    """returns the query conditions (see Catalog.query()) that select
+    the entries below a directory-level Predicate."""
+    entry = entry_of(spec)
+    depth = 0 if entry.level == _DataLevels.ROOT else _scanning.depth_of(entry.level)
+    return dict((col, getattr(spec, col)) for col, level in DIRECTORY_COLUMNS \
+                if _scanning.depth_of(level) <= depth)
+
+def scan_columns(path, entry=None, backend=None):
+    """scans the data files below the directory `path` corresponding to
+    the scanning.Entry `entry` (i.e. the data-root by default), and returns
+    the table in the "dict" format. each file is stat'ed once."""
+    columns = dict((col, []) for col in COLUMNS)
+    append  = tuple(columns[col].append for col in COLUMNS)
+    for found in _scanning.iter_entries(str(path), entry=entry, backend=backend):
+        if found.level != _DataLevels.FILE:
+            continue
+        st = found.direntry.stat()
+        session, file = found.session, found.file
+        for add, value in zip(append, (found.direntry.path, found.dataset, found.subject,
+                                       session.type, _catalog.format_date(session.date), session.index,
+                                       found.domain, file.trial, file.run,
+                                       _catalog.format_channel(file.channel), file.suffix,
+                                       st.st_size, st.st_mtime)):
+            add(value)
+    return columns
+
+def catalog_columns(catalog, **conditions):
+    """returns the table of the data files in `catalog` that match `conditions`
+    (see Catalog.query()) in the "dict" format, without reading the file system."""
+    stored  = ("parent", "name") + COLUMNS[1:]
+    columns = dict((col, []) for col in COLUMNS)
+    root    = str(catalog.root)
+    for row in catalog.rows(stored, **conditions):
+        parent, name = row[:2]
+        columns["path"].append(_os.path.join(root, *parent.split("/"), name) if parent \
+                               else _os.path.join(root, name))
+        for col, value in zip(COLUMNS[1:], row[2:]):
+            columns[col].append(value)
+    return columns
+
+def as_numpy(columns):
+    """converts a "dict" table into a NumPy structured array."""
+    try:
+        import numpy as _np
+    except ImportError:
+        raise ImportError("the 'numpy' and 'pandas' formats of a table require NumPy")
+    arrays = {}
+    for col in COLUMNS:
+        values = columns[col]
+        if col in STRING_COLUMNS:
+            arrays[col] = _np.array(["" if value is None else value for value in values], dtype=str)
+        elif col in INTEGER_COLUMNS.keys():
+            arrays[col] = _np.array([-1 if value is None else value for value in values],
+                                    dtype=INTEGER_COLUMNS[col])
+        elif col == "session_date":
+            arrays[col] = _np.array(values, dtype="datetime64[D]")
+        else:
+            arrays[col] = _np.array(values, dtype="float64")
+    table = _np.empty(len(columns["path"]), dtype=[(col, arrays[col].dtype) for col in COLUMNS])
+    for col in COLUMNS:
+        table[col] = arrays[col]
+    return table
+
+def as_pandas(columns):
+    """converts a "dict" table into a pandas.DataFrame."""
+    try:
+        import pandas as _pd
+    except ImportError:
+        raise ImportError("the 'pandas' format of a table requires pandas")
+    return _pd.DataFrame(as_numpy(columns))
+
+def as_arrow(columns):
+    """converts a "dict" table into a pyarrow.Table."""
+    try:
+        import pyarrow as _pa
+        import numpy as _np
+    except ImportError:
+        raise ImportError("the 'arrow' format of a table requires pyarrow and NumPy")
+    arrays = dict(columns)
+    arrays["session_date"] = _pa.array(_np.array(columns["session_date"], dtype="datetime64[D]"))
+    return _pa.table(arrays)
+
+def convert(columns, format="numpy"):
+    """converts a "dict" table into `format` (one of `FORMATS`)."""
+    if format == "numpy":
+        return as_numpy(columns)
+    elif format == "pandas":
+        return as_pandas(columns)
+    elif format == "arrow":
+        return as_arrow(columns)
+    elif format == "dict":
+        return columns
+    else:
+        raise ValueError(f"unknown table format: '{format}' (expected one of {FORMATS})")
+
+def table_of(container, format="numpy"):
+    """returns a columnar table of all the data files below a (directory-level)
+    container, with one row per file (see the module docstring for the columns
+    and the formats).
+
+    the table is made from a single scan (or from the catalog, if any),
+    without creating containers."""
+    if format not in FORMATS:
+        raise ValueError(f"unknown table format: '{format}' (expected one of {FORMATS})")
+    spec = container._spec
+    if container.catalog is not None:
+        columns = catalog_columns(container.catalog, **conditions_of(spec))
+    else:
+        columns = scan_columns(container.path, entry=entry_of(spec), backend=container.backend)
+    return convert(columns, format)
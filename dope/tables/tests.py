@@ -0,0 +1,91 @@
+#
+# MIT License
+#
+# Copyright (c) 2020 Keisuke Sehara
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""usage: python -m dope.tables.tests"""
+
+import unittest
+import shutil
+try:
+    import numpy
+except ImportError:
+    numpy = None
+from . import *
+from .. import testing
+from ..dataroot import DataRoot
+
+class TableTests(unittest.TestCase):
+    def setUp(self):
+        self._root = testing.populate(testing.test_dataroot_path()).resolve()
+        (self._root / testing.SAMPLE_FILES[0]).write_bytes(b"0123")
+
+    def test_dict(self):
+        root  = DataRoot(self._root)
+        table = root.to_table(format="dict")
+        self.assertEqual(table["path"], [str(spec.path) for spec in root.walk()])
+        self.assertEqual(table["size"][0], 4)
+        self.assertEqual(table["session_date"][0], "2019-01-01")
+        self.assertEqual(table["channel"][0], "Green")
+        self.assertEqual(table["run"][:2], [1, 2])
+        self.assertEqual(table["trial"][:2], [None, None])
+        subject = root["ds1"]["K2"].to_table(format="dict")
+        self.assertEqual(subject["subject"], ["K2"])
+        with self.assertRaises(ValueError):
+            root.to_table(format="csv")
+
+    def test_catalog(self):
+        root    = DataRoot(self._root)
+        indexed = root.build_index(self._root.with_suffix(".sqlite3"))
+        try:
+            self.assertEqual(indexed.to_table(format="dict"), root.to_table(format="dict"))
+            self.assertEqual(indexed["ds1"]["K1"].to_table(format="dict"),
+                             root["ds1"]["K1"].to_table(format="dict"))
+            # the containers below the subject level
+            for keys in (("ds1", "K1", "session2019-01-01-001"),
+                         ("ds1", "K1", "session2019-01-01-001", "video")):
+                found = [indexed, root]
+                for key in keys:
+                    found = [container[key] for container in found]
+                tables = [table_of(container, format="dict") for container in found]
+                self.assertEqual(tables[0], tables[1])
+                self.assertEqual(len(tables[0]["path"]), 3 if len(keys) == 3 else 1)
+        finally:
+            indexed.catalog.close()
+            indexed.catalog.path.unlink()
+
+    @unittest.skipIf(numpy is None, "requires NumPy")
+    def test_numpy(self):
+        table = DataRoot(self._root)["ds1"].to_table()
+        self.assertEqual(table.dtype.names, COLUMNS)
+        self.assertEqual(len(table), 5)
+        self.assertEqual(table["session_date"][0], numpy.datetime64("2019-01-01"))
+        self.assertEqual(list(table["run"]), [1, 2, -1, -1, -1])
+        self.assertEqual(list(table["trial"]), [-1, -1, 1, 1, 1])
+        self.assertEqual(table["size"][0], 4)
+
+    def tearDown(self):
+        if self._root.exists():
+            shutil.rmtree(self._root)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -22,7 +22,7 @@
 # SOFTWARE.
 #
 """common procedures in testing."""
-from datetime import datetime
+from datetime import datetime, date, timedelta
 from pathlib import Path
 
 def test_dataroot_path():
@@ -31,3 +31,65 @@ def test_dataroot_path():
     if root.exists():
         raise FileExistsError("cannot prepare a test data-root")
     return root
+
+SAMPLE_FILES = (
+    "ds1/K1/session2019-01-01-001/img/K1_session2019-01-01-001_img_run00001_Green.tif",
+    "ds1/K1/session2019-01-01-001/img/K1_session2019-01-01-001_img_run00002_Green.tif",
+    "ds1/K1/session2019-01-01-001/img/notes.txt",
+    "ds1/K1/session2019-01-01-001/video/K1_session2019-01-01-001_video_trial00001_Left.avi",
+    "ds1/K1/training2019-01-02-001/video/K1_training2019-01-02-001_video_trial00001_Left.avi",
+    "ds1/K2/training2019-01-03-001/video/K2_training2019-01-03-001_video_trial00001_Left.avi",
+)
+
+SAMPLE_DIRECTORIES = (
+    "ds1/K1/not-a-session",
+    "ds2",
+)
+
+def populate(root, files=SAMPLE_FILES, directories=SAMPLE_DIRECTORIES):
+    """creates empty `files` and `directories` (given relative to `root`)."""
+    for file in files:
+        path = root / file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+    for directory in directories:
+        (root / directory).mkdir(parents=True, exist_ok=True)
+    return root
+
+SYNTHETIC_START = date(2019, 1, 1)
+
+def synthetic_paths(datasets=1, subjects=2, sessions=2, domains=("img", "video"),
+                    trials=10, channels=("Green",), session_type="session", suffix=".tif"):
+    """generates the relative paths of the data files in a synthetic data-root,
+    i.e. `datasets` x `subjects` x `sessions` x `domains` x `trials` x `channels` files.
+
+    the sessions of a subject are held on consecutive days from SYNTHETIC_START."""
+    for d in range(datasets):
+        dataset = f"dataset{d + 1:02d}"
+        for s in range(subjects):
+            subject = f"K{s + 1:04d}"
+            for n in range(sessions):
+                session = f"{session_type}{SYNTHETIC_START + timedelta(days=n):%Y-%m-%d}-001"
+                for domain in domains:
+                    prefix = f"{dataset}/{subject}/{session}/{domain}/{subject}_{session}_{domain}"
+                    for t in range(trials):
+                        for channel in channels:
+                            yield f"{prefix}_trial{t + 1:05d}_{channel}{suffix}"
+
+def build_tree(root, backend=None, size=0, **shape):
+    """builds a synthetic data-root (see synthetic_paths() for `shape`),
+    and returns the number of the data files.
+
+    the files are created under `root` on disk (filled with `size` zero bytes),
+    or in `backend` (e.g. a backends.MemoryBackend) if it is given."""
+    count = 0
+    for path in synthetic_paths(**shape):
+        if backend is not None:
+            backend.add_file(Path(root) / path, size=size)
+        else:
+            path = Path(root) / path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "wb") as file:
+                file.truncate(size)
+        count += 1
+    return count